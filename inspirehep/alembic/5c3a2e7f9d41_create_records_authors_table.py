@@ -0,0 +1,48 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2016-2018 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create the records_authors table"""
+
+from __future__ import absolute_import, division, print_function
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy_utils.types import UUIDType
+
+
+# revision identifiers, used by Alembic.
+revision = '5c3a2e7f9d41'
+down_revision = '7be4c8b5c5e8'
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        'records_authors',
+        sa.Column(
+            'record_id',
+            UUIDType,
+            sa.ForeignKey('records_metadata.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('author_recid', sa.Integer, nullable=False),
+        sa.Column('full_name', sa.Text, nullable=False),
+        sa.PrimaryKeyConstraint('record_id', 'author_recid'),
+    )
+    op.create_index(
+        'ix_records_authors_author_recid',
+        'records_authors',
+        ['author_recid'],
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index('ix_records_authors_author_recid', table_name='records_authors')
+    op.drop_table('records_authors')
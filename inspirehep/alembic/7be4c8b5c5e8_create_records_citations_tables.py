@@ -0,0 +1,57 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2016-2018 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create the records_citations and records_citations_count tables"""
+
+from __future__ import absolute_import, division, print_function
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy_utils.types import UUIDType
+
+
+# revision identifiers, used by Alembic.
+revision = '7be4c8b5c5e8'
+down_revision = '2dd443feeb63'
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        'records_citations',
+        sa.Column(
+            'citer_id',
+            UUIDType,
+            sa.ForeignKey('records_metadata.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('cited_pid_type', sa.String(6), nullable=False),
+        sa.Column('cited_pid_value', sa.String(255), nullable=False),
+        sa.PrimaryKeyConstraint('citer_id', 'cited_pid_type', 'cited_pid_value'),
+    )
+    op.create_index(
+        'ix_records_citations_cited',
+        'records_citations',
+        ['cited_pid_type', 'cited_pid_value'],
+    )
+
+    op.create_table(
+        'records_citations_count',
+        sa.Column('pid_type', sa.String(6), nullable=False),
+        sa.Column('pid_value', sa.String(255), nullable=False),
+        sa.Column('citation_count', sa.Integer, default=0, nullable=False),
+        sa.PrimaryKeyConstraint('pid_type', 'pid_value'),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table('records_citations_count')
+    op.drop_index('ix_records_citations_cited', table_name='records_citations')
+    op.drop_table('records_citations')
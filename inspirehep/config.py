@@ -216,6 +216,9 @@ RECORD_EDITOR_FILE_UPLOAD_FOLDER = 'inspirehep/modules/editor/temp'
 REFEXTRACT_JOURNAL_KB_PATH = pkg_resources.resource_filename(
     'refextract', 'references/kbs/journal-titles.kb')
 
+REFEXTRACT_KB_CHECK_INTERVAL = 300
+"""Number of seconds between two checks of the refextract KBs for changes."""
+
 # Search
 # ======
 
@@ -251,6 +254,64 @@ INSPIRE_ENDPOINT_TO_INDEX = {
 # =======
 INSPIRE_SERIALIZERS = 'inspirehep.modules.records.serializers'
 
+INSPIRE_JSON_REF_CACHE_SIZE = 1000
+"""Number of records resolved from a ``$ref`` kept per request or task."""
+
+INSPIRE_PID_CACHE_SIZE = 100000
+"""Number of pids and uuids kept in the cache local to each process."""
+
+INSPIRE_PID_CACHE_TTL = 60
+"""Number of seconds after which a pid is reloaded in the local cache."""
+
+INSPIRE_PID_CACHE_REDIS_TTL = 3600
+"""Number of seconds after which a pid is reloaded in the cache shared between
+processes."""
+
+INSPIRE_CITATION_GRAPH_PATH = None
+"""Directory of the citation graph, see ``inspirehep citations build-graph``.
+
+The graph is used by the services which support it only once it is built.
+"""
+
+INSPIRE_CITATION_GRAPH_SYNC_INTERVAL = 5
+"""Number of seconds between two syncs of the citation graph of a process
+with the citations committed since it was built."""
+
+INSPIRE_CITATION_GRAPH_MAX_CHANGES = 1000000
+"""Number of citation changes committed since the citation graph was built
+after which it is not used anymore, as every process keeps them in memory.
+
+Note:
+
+  The graph has to be rebuilt more often than that, e.g. every night with
+  ``inspirehep citations build-graph``.
+"""
+
+INSPIRE_REFERENCE_MATCH_CACHE_TTL = 86400
+"""Number of seconds the records matched by a query of the reference matcher
+are cached for."""
+
+INSPIRE_REFERENCE_MATCH_INVALIDATION_DELAY = 10
+"""Seconds after the commit of a record at which the cached reference matches
+it could change are invalidated, once it was indexed and the index refreshed."""
+
+INSPIRE_EXPORT_CHUNK_SIZE = 500
+"""Number of records fetched from ES and serialized at once by the streaming
+export of the literature search, see ``LiteratureExportResource``."""
+
+INSPIRE_EXPORT_SCROLL_TIMEOUT = '5m'
+"""Time ES keeps the scroll of a streaming export alive between two chunks."""
+
+INSPIRE_SERIALIZER_CACHE_TTL = 86400
+"""Number of seconds the serializations of a record are cached for, see
+``SerializedRecordCache``."""
+
+INSPIRE_AUTHOR_STATS_CACHE_TIMEOUT = 600
+"""Number of seconds after which the cached statistics of an author expire.
+
+They are also invalidated when a record of the author is reindexed.
+"""
+
 LITERATURE_REST_ENDPOINT = {
     'default_endpoint_prefix': True,
     'pid_type': 'lit',
@@ -1127,6 +1188,9 @@ INDEXER_DEFAULT_INDEX = "records-hep"
 INDEXER_DEFAULT_DOC_TYPE = "hep"
 INDEXER_REPLACE_REFS = False
 INDEXER_BULK_REQUEST_TIMEOUT = float(900)
+INDEXER_CITATIONS_REINDEX_WINDOW = 10
+"""Seconds during which the records whose citations changed are collected
+before being reindexed together, see ``flush_citations_reindex_queue``."""
 
 # OAuthclient
 # ===========
@@ -1151,6 +1215,13 @@ OAUTHCLIENT_ORCID_CREDENTIALS = {
 }
 ORCID_ALLOW_PUSH_DEFAULT = False
 
+ORCID_PUSH_BATCH_WINDOW = 60
+"""Number of seconds during which the works to push to an ORCID are
+collected before being pushed together, see ``schedule_orcid_push``."""
+
+ORCID_PUSH_BATCH_SIZE = 100
+"""Number of works pushed to an ORCID while holding its lock."""
+
 OAUTHCLIENT_SETTINGS_TEMPLATE = 'inspirehep_theme/page.html'
 
 # Inspire service client for ORCID.
@@ -1387,6 +1458,20 @@ CRAWLER_SETTINGS = {
 # ===================
 LEGACY_PID_PROVIDER = None  # e.g. "http://example.org/batchuploader/allocaterecord"
 
+INSPIRE_RECID_POOL_SIZE = 0
+"""Number of record identifiers reserved in advance, see ``RecidPool``.
+
+When set, minting a record takes its identifier from the pool instead of
+reserving it on legacy or in the DB sequence. ``0`` disables the pool.
+"""
+
+INSPIRE_RECID_POOL_BLOCK_SIZE = 100
+"""Number of record identifiers reserved at once when refilling the pool."""
+
+INSPIRE_RECID_POOL_REFILL_TIMEOUT = 300
+"""Number of seconds after which a refill of the pool which did not finish
+can be started again."""
+
 # Inspire subject translation
 # ===========================
 ARXIV_TO_INSPIRE_CATEGORY_MAPPING = {
@@ -28,10 +28,15 @@ import json
 
 from invenio_records_rest.serializers.response import search_responsify
 
+from inspirehep.modules.records.serializers.response import stream_responsify
+
 
 class APIRecidsSerializer(object):
     """Recids serializer."""
 
+    source_includes = ['control_number']
+    """Fields of the records read by ``serialize_stream``."""
+
     def serialize_search(self, pid_fetcher, search_result, item_links_factory=None, links=None):
         return json.dumps(dict(
             hits=dict(
@@ -41,9 +46,28 @@ class APIRecidsSerializer(object):
             links=links or {},
         ))
 
+    def serialize_stream(self, hits_pages):
+        """Serialize pages of search hits as a stream of JSON.
+
+        The total is the number of recids streamed, as it is only known once
+        all the pages were read.
+        """
+        total = 0
+        yield '{"hits": {"recids": ['
+        for hits in hits_pages:
+            if hits:
+                recids = ', '.join(str(hit['_source']['control_number']) for hit in hits)
+                yield (', ' if total else '') + recids
+                total += len(hits)
+        yield '], "total": {}}}, "links": {{}}}}'.format(total)
+
 
 json_recids = APIRecidsSerializer()
 json_recids_response = search_responsify(
     json_recids,
     'application/vnd+inspire.ids+json'
 )
+json_recids_stream = stream_responsify(
+    json_recids,
+    'application/vnd+inspire.ids+json'
+)
@@ -23,11 +23,22 @@
 from __future__ import absolute_import, division, print_function
 
 import json
+import logging
+from collections import defaultdict
+from itertools import chain, islice
 
 from elasticsearch_dsl import Q
+from flask import request, stream_with_context
 
+from inspire_utils.record import get_value
+from inspirehep.modules.records.citation_graph import get_citation_graph
 from inspirehep.modules.search import LiteratureSearch
 
+LOGGER = logging.getLogger(__name__)
+
+CITEES_BATCH_SIZE = 100
+"""Number of papers whose citers are fetched with a single search."""
+
 
 class AuthorAPICitations(object):
     """API endpoint for author collection returning citations."""
@@ -35,6 +46,12 @@ class AuthorAPICitations(object):
     def serialize(self, pid, record, links_factory=None):
         """Return a list of citations for a given author recid.
 
+        The citers of the papers of the author are fetched with one search
+        per batch of papers, and the response is streamed as the batches are
+        fetched. When the ``page`` query argument is passed, only the
+        citations of that page of ``size`` papers, ordered by recid, are
+        returned.
+
         :param pid:
             Persistent identifier instance.
 
@@ -46,7 +63,8 @@ class AuthorAPICitations(object):
             the response.
         """
         author_pid = pid.pid_value
-        citations = {}
+        page = request.args.get('page', type=int)
+        size = request.args.get('size', 25, type=int)
 
         query = Q('match', authors__recid=author_pid)
         search = LiteratureSearch().query('nested', path='authors', query=query)\
@@ -55,73 +73,133 @@ class AuthorAPICitations(object):
                                        'control_number',
                                        'self',
                                    ])
+        if page:
+            search = search.sort('control_number')[(page - 1) * size:page * size]
+            citees = (result.to_dict() for result in search.execute())
+        else:
+            citees = (result.to_dict() for result in search.scan())
+
+        return stream_with_context(self._serialize_citations(citees))
+
+    def _serialize_citations(self, citees):
+        yield '['
+        separator = ''
+        for citation in self._get_citations(citees):
+            yield separator + json.dumps(citation)
+            separator = ', '
+        yield ']'
+
+    def _get_citations(self, citees):
+        """Yield the citations of each paper, fetched by batches of papers."""
+        while True:
+            batch = list(islice(citees, CITEES_BATCH_SIZE))
+            if not batch:
+                return
+
+            citers = self._get_citers([citee['control_number'] for citee in batch])
+            for citee in batch:
+                recid = citee['control_number']
+                # Not every signature has a recid (at least for demo records).
+                authors = set(get_value(citee, 'authors.recid', []))
 
-        # For each publication co-authored by a given author...
-        for result in search.scan():
-            result_source = result.to_dict()
+                yield {
+                    # The source record that is being cited.
+                    'citee': dict(
+                        id=recid,
+                        record=citee['self'],
+                    ),
+                    'citers': [
+                        self._build_citation(citer, authors)
+                        for citer in citers.get(recid, [])
+                    ],
+                }
 
-            recid = result_source['control_number']
-            authors = set([i['recid'] for i in result_source['authors']])
-            citations[recid] = {}
+    @staticmethod
+    def _get_citers(recids):
+        """Return the publications citing each of the given recids.
 
-            nested_search = LiteratureSearch().query({
-                "match": {
-                    "references.recid": recid
+        When the citation graph was built, the citers are looked up in it and
+        only their metadata is fetched from ES. If the graph cannot be used,
+        e.g. because it has to be rebuilt, they are looked up in ES.
+        """
+        citer_recids = None
+        graph = get_citation_graph()
+        if graph:
+            try:
+                citer_recids = {
+                    recid: graph.citers_of(recid).tolist() for recid in recids
                 }
-            }).params(
-                _source=[
-                    "authors.recid",
-                    "collections",
-                    "control_number",
-                    "earliest_date",
-                    "self",
+            except RuntimeError:
+                LOGGER.exception('Cannot use the citation graph')
+
+        if citer_recids is not None:
+            if not any(citer_recids.values()):
+                return defaultdict(list)
+            query = Q('terms', control_number=sorted(
+                set(chain.from_iterable(citer_recids.values()))
+            ))
+        else:
+            query = Q('terms', references__recid=recids)
+
+        search = LiteratureSearch().query(query).params(
+            _source=[
+                "authors.recid",
+                "collections",
+                "control_number",
+                "earliest_date",
+                "references.recid",
+                "self",
+            ]
+        )
+        sources = [result.to_dict() for result in search.scan()]
+
+        citers = defaultdict(list)
+        if citer_recids is not None:
+            sources_by_recid = {
+                source['control_number']: source for source in sources
+            }
+            for recid in recids:
+                citers[recid] = [
+                    sources_by_recid[citer] for citer in citer_recids[recid]
+                    if citer in sources_by_recid
                 ]
-            )
-
-            # The source record that is being cited.
-            citations[recid]['citee'] = dict(
-                id=recid,
-                record=result_source['self'],
-            )
-            citations[recid]['citers'] = []
-
-            # Check all publications, which cite the parent record.
-            for nested_result in nested_search.scan():
-                nested_result_source = nested_result.to_dict()
-
-                # Not every signature has a recid (at least for demo records).
-                try:
-                    nested_authors = set(
-                        [i['recid'] for i in nested_result_source['authors']]
-                    )
-                except KeyError:
-                    nested_authors = set()
-
-                citation = dict(
-                    citer=dict(
-                        id=int(nested_result_source['control_number']),
-                        record=nested_result_source['self']
-                    ),
-                    # If at least one author is shared, it's a self-citation.
-                    self_citation=len(authors & nested_authors) > 0,
-                )
-
-                # Get the earliest date of a citer.
-                try:
-                    citation['date'] = nested_result_source['earliest_date']
-                except KeyError:
-                    pass
-
-                # Get status if a citer is published.
-                # FIXME: As discussed with Sam, we should have a boolean flag
-                #        for this type of information.
-                try:
-                    citation['published_paper'] = "Published" in [
-                        i['primary'] for i in nested_result_source[
-                            'collections']]
-                except KeyError:
-                    citation['published_paper'] = False
-
-                citations[recid]['citers'].append(citation)
-
-        return json.dumps(citations.values())
+            return citers
+
+        recids = set(recids)
+        for result_source in sources:
+            cited = set(get_value(result_source, 'references.recid', [])) & recids
+            for recid in cited:
+                citers[recid].append(result_source)
+
+        return citers
+
+    @staticmethod
+    def _build_citation(citer, authors):
+        # Not every signature has a recid (at least for demo records).
+        citer_authors = set(get_value(citer, 'authors.recid', []))
+
+        citation = dict(
+            citer=dict(
+                id=int(citer['control_number']),
+                record=citer['self']
+            ),
+            # If at least one author is shared, it's a self-citation.
+            self_citation=len(authors & citer_authors) > 0,
+        )
+
+        # Get the earliest date of a citer.
+        try:
+            citation['date'] = citer['earliest_date']
+        except KeyError:
+            pass
+
+        # Get status if a citer is published.
+        # FIXME: As discussed with Sam, we should have a boolean flag
+        #        for this type of information.
+        try:
+            citation['published_paper'] = "Published" in [
+                i['primary'] for i in citer['collections']]
+        except KeyError:
+            citation['published_paper'] = False
+
+        return citation
@@ -24,9 +24,10 @@ from __future__ import absolute_import, division, print_function
 
 import json
 
-from elasticsearch_dsl import Q
+from flask import request
 
-from inspirehep.modules.search import LiteratureSearch
+from inspire_dojson.utils import get_record_ref
+from inspirehep.modules.authors.utils import get_coauthors
 
 
 class AuthorAPICoauthors(object):
@@ -35,6 +36,9 @@ class AuthorAPICoauthors(object):
     def serialize(self, pid, record, links_factory=None):
         """Return a list of co-authors for a given author recid.
 
+        The ``size`` query argument limits the response to the co-authors
+        with the most shared papers.
+
         :param pid:
             Persistent identifier instance.
 
@@ -45,34 +49,14 @@ class AuthorAPICoauthors(object):
             Factory function for the link generation, which are added to
             the response.
         """
-        author_pid = pid.pid_value
-        coauthors = {}
-
-        query = Q('match', authors__recid=author_pid)
-        search = LiteratureSearch().query('nested', path='authors', query=query)\
-                                   .params(_source=[
-                                       'authors.full_name',
-                                       'authors.recid',
-                                       'authors.record',
-                                   ])
-
-        for result in search.scan():
-            result_source = result.to_dict()['authors']
-
-            for author in result_source:
-                try:
-                    # Don't add the reference author.
-                    if author['recid'] != author_pid:
-                        if author['recid'] in coauthors:
-                            coauthors[author['recid']]['count'] += 1
-                        else:
-                            coauthors[author['recid']] = dict(
-                                count=1,
-                                full_name=author['full_name'],
-                                id=author['recid'],
-                                record=author['record'],
-                            )
-                except KeyError:
-                    pass
-
-        return json.dumps(coauthors.values())
+        size = request.args.get('size', type=int)
+        coauthors = get_coauthors(int(pid.pid_value), size=size)
+
+        return json.dumps([
+            dict(
+                count=count,
+                full_name=full_name,
+                id=recid,
+                record=get_record_ref(recid, 'authors'),
+            ) for recid, full_name, count in coauthors
+        ])
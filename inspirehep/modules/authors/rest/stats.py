@@ -23,14 +23,18 @@
 from __future__ import absolute_import, division, print_function
 
 import json
-from collections import Counter
 
 from elasticsearch_dsl import Q
+from flask import current_app
 
-from inspire_utils.helpers import force_list
-from inspire_utils.record import get_value
+from invenio_cache import current_cache
+
+from inspirehep.modules.authors.utils import get_author_stats_cache_key
 from inspirehep.modules.search import LiteratureSearch
-from inspirehep.utils.stats import calculate_h_index, calculate_i10_index
+from inspirehep.utils.stats import (
+    calculate_h_index_from_histogram,
+    calculate_i10_index_from_histogram,
+)
 
 
 class AuthorAPIStats(object):
@@ -39,6 +43,9 @@ class AuthorAPIStats(object):
     def serialize(self, pid, record, links_factory=None):
         """Return a different metrics for a given author recid.
 
+        The statistics are cached until a record of the author is reindexed,
+        see ``invalidate_author_stats_before_index``.
+
         :param pid:
             Persistent identifier instance.
 
@@ -49,77 +56,81 @@ class AuthorAPIStats(object):
             Factory function for the link generation, which are added to
             the response.
         """
-        author_pid = pid.pid_value
-
-        fields = set()
-        keywords = []
-
-        statistics = {}
-        statistics['citations'] = 0
-        statistics['publications'] = 0
-        statistics['types'] = {}
-
-        statistics_citations = {}
-
+        cache_key = get_author_stats_cache_key(pid.pid_value)
+        statistics = current_cache.get(cache_key)
+        if statistics is None:
+            statistics = json.dumps(self._get_statistics(pid.pid_value))
+            current_cache.set(
+                cache_key,
+                statistics,
+                timeout=current_app.config['INSPIRE_AUTHOR_STATS_CACHE_TIMEOUT'],
+            )
+
+        return statistics
+
+    @staticmethod
+    def _get_statistics(author_pid):
+        """Compute the statistics of an author with a single aggregation."""
         query = Q('match', authors__recid=author_pid)
         search = LiteratureSearch().query('nested', path='authors', query=query)\
-                                   .params(_source=[
-                                       'citation_count',
-                                       'control_number',
-                                       'facet_inspire_doc_type',
-                                       'facet_inspire_categories',
-                                       'keywords',
-                                   ])
-
-        for result in search.scan():
-            result_source = result.to_dict()
-
-            # Increment the count of the total number of publications.
-            statistics['publications'] += 1
-
-            # Increment the count of citations.
-            citation_count = result_source.get('citation_count', 0)
-
-            statistics['citations'] += citation_count
-            statistics_citations[result_source['control_number']] = \
-                citation_count
-
-            # Count how many times certain type of publication was published.
-            try:
-                publication_type = result_source.get(
-                    'facet_inspire_doc_type', [])[0]
-            except IndexError:
-                pass
-
-            if publication_type:
-                if publication_type in statistics['types']:
-                    statistics['types'][publication_type] += 1
-                else:
-                    statistics['types'][publication_type] = 1
-
-            # Get fields.
-            for field in result_source.get('facet_inspire_categories', []):
-                fields.add(field)
-
-            # Get keywords.
-            keywords.extend([
-                k for k in force_list(
-                    get_value(result_source, 'keywords.value'))
-                if k != '* Automatic Keywords *'])
+                                   .extra(size=0)
+        search.aggs.metric('citations', 'sum', field='citation_count')
+        search.aggs.bucket(
+            'citations_histogram',
+            'histogram',
+            field='citation_count',
+            interval=1,
+            min_doc_count=1,
+        )
+        search.aggs.bucket(
+            'types',
+            'terms',
+            field='facet_inspire_doc_type',
+            size=100,
+        )
+        search.aggs.bucket(
+            'fields',
+            'terms',
+            field='facet_inspire_categories',
+            size=100,
+        )
+        search.aggs.bucket(
+            'keywords',
+            'terms',
+            field='keywords.value.raw',
+            size=25,
+            exclude=['* Automatic Keywords *'],
+        )
+        response = search.execute()
+        aggregations = response.aggregations
+
+        histogram = [
+            (int(bucket.key), bucket.doc_count)
+            for bucket in aggregations.citations_histogram.buckets
+        ]
+
+        statistics = {}
+        statistics['citations'] = int(aggregations.citations.value or 0)
+        statistics['publications'] = response.hits.total
+        statistics['types'] = {
+            bucket.key: bucket.doc_count
+            for bucket in aggregations.types.buckets
+        }
 
         # Calculate h-index together with i10-index.
-        statistics['hindex'] = calculate_h_index(statistics_citations)
-        statistics['i10index'] = calculate_i10_index(statistics_citations)
+        statistics['hindex'] = calculate_h_index_from_histogram(histogram)
+        statistics['i10index'] = calculate_i10_index_from_histogram(histogram)
 
+        fields = [bucket.key for bucket in aggregations.fields.buckets]
         if fields:
-            statistics['fields'] = list(fields)
+            statistics['fields'] = fields
 
         # Return the top 25 keywords.
+        keywords = [{
+            'count': bucket.doc_count,
+            'keyword': bucket.key,
+        } for bucket in aggregations.keywords.buckets]
         if keywords:
-            counter = Counter(keywords)
-            statistics['keywords'] = [{
-                'count': i[1],
-                'keyword': i[0]
-            } for i in counter.most_common(25)]
+            statistics['keywords'] = keywords
 
-        return json.dumps(statistics)
+        return statistics
@@ -30,6 +30,12 @@ import re
 import numpy as np
 from beard.utils.strings import asciify
 from beard.clustering import block_phonetic
+from invenio_cache import current_cache
+from invenio_db import db
+from sqlalchemy import desc, func
+from sqlalchemy.orm import aliased
+
+from inspirehep.modules.records.models import RecordAuthors
 
 
 _bai_parentheses_cleaner = \
@@ -126,3 +132,52 @@ def phonetic_blocks(full_names, phonetic_algorithm='nysiis'):
     )
 
     return dict(zip(full_names, phonetic_blocks))
+
+
+def get_author_stats_cache_key(author_recid):
+    return 'author_stats:{}'.format(author_recid)
+
+
+def invalidate_author_stats(author_recids):
+    """Remove the cached statistics of several authors."""
+    keys = [get_author_stats_cache_key(recid) for recid in author_recids]
+    if keys:
+        current_cache.delete_many(*keys)
+
+
+def get_coauthors(author_recid, size=None):
+    """Return the authors who most often signed a paper with an author.
+
+    The co-authors are counted by the DB from the ``records_authors`` table,
+    which is kept up to date when Literature records are committed.
+
+    Args:
+        author_recid(int): recid of the author.
+        size(Optional[int]): maximum number of co-authors to return.
+
+    Returns:
+        List[Tuple[int, str, int]]: the recid, one of the full names and the
+        number of shared papers of each co-author, by decreasing number of
+        shared papers.
+    """
+    author = aliased(RecordAuthors)
+    coauthor = aliased(RecordAuthors)
+    count = func.count(coauthor.record_id).label('count')
+
+    query = db.session.query(
+        coauthor.author_recid,
+        func.min(coauthor.full_name),
+        count,
+    ).join(
+        author, author.record_id == coauthor.record_id,
+    ).filter(
+        author.author_recid == author_recid,
+        coauthor.author_recid != author_recid,
+    ).group_by(
+        coauthor.author_recid,
+    ).order_by(desc(count), coauthor.author_recid)
+
+    if size:
+        query = query.limit(size)
+
+    return query.all()
@@ -30,6 +30,13 @@ from collections import defaultdict
 import six
 from flask import current_app
 
+from inspirehep.modules.disambiguation.core.columns import (
+    PAIR_COLUMNS,
+    PUBLICATION_COLUMNS,
+    SIGNATURE_COLUMNS,
+    Columns,
+    ColumnsWriter,
+)
 from inspirehep.modules.disambiguation.core.db.readers import (
     get_all_curated_signatures,
     get_all_publications,
@@ -48,16 +55,20 @@ def save_curated_signatures_and_input_clusters():
     Saves two files to disk called (by default) ``input_clusters.jsonl`` and
     ``curated_signatures.jsonl``. The former contains one line per each cluster
     initially present in INSPIRE, while the latter contains one line per each
-    curated signature that will be used as ground truth by ``BEARD``.
+    curated signature that will be used as ground truth by ``BEARD``. The
+    curated signatures are also saved as a columnar dataset, whose clusters
+    are given by the ``author_id`` column.
     """
     signatures_with_author = defaultdict(list)
     signatures_without_author = []
 
-    with open_file_in_folder(current_app.config['DISAMBIGUATION_CURATED_SIGNATURES_PATH'], 'w') as fd:
+    with open_file_in_folder(current_app.config['DISAMBIGUATION_CURATED_SIGNATURES_PATH'], 'w') as fd, \
+            ColumnsWriter(current_app.config['DISAMBIGUATION_CURATED_SIGNATURES_COLUMNS_PATH'], SIGNATURE_COLUMNS) as writer:
         for signature in get_all_curated_signatures():
             if signature.get('author_id'):
                 signatures_with_author[signature['author_id']].append(signature['signature_uuid'])
                 fd.write(json.dumps(signature) + '\n')
+                writer.append(signature)
             else:
                 signatures_without_author.append(signature['signature_uuid'])
 
@@ -81,14 +92,30 @@ def save_sampled_pairs():
 
     Save a file to disk called (by default) ``sampled_pairs.jsonl``, which
     contains one line per each pair of signatures sampled from INSPIRE that
-    will be used by ``BEARD`` during training.
+    will be used by ``BEARD`` during training. The pairs are also saved as a
+    columnar dataset referencing the rows of the curated signatures.
     """
-    with open_file_in_folder(current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_PATH'], 'w') as fd:
-        signatures_path = current_app.config['DISAMBIGUATION_CURATED_SIGNATURES_PATH']
-        clusters_path = current_app.config['DISAMBIGUATION_INPUT_CLUSTERS_PATH']
-        pairs_size = current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_SIZE']
-        for pair in sample_signature_pairs(signatures_path, clusters_path, pairs_size):
-            fd.write(json.dumps(pair) + '\n')
+    signatures_path = current_app.config['DISAMBIGUATION_CURATED_SIGNATURES_COLUMNS_PATH']
+    pairs_size = current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_SIZE']
+
+    signatures = Columns(signatures_path)
+    signature_uuids = signatures['signature_uuid']
+
+    with open_file_in_folder(current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_PATH'], 'w') as fd, \
+            ColumnsWriter(current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_COLUMNS_PATH'], PAIR_COLUMNS) as writer:
+        for s1, s2, same_cluster in sample_signature_pairs(signatures_path, pairs_size):
+            fd.write(json.dumps({
+                'same_cluster': same_cluster,
+                'signature_uuids': [
+                    signatures.string(signature_uuids[s1]),
+                    signatures.string(signature_uuids[s2]),
+                ],
+            }) + '\n')
+            writer.append({
+                'first_signature': s1,
+                'same_cluster': int(same_cluster),
+                'second_signature': s2,
+            })
 
 
 def save_publications():
@@ -96,11 +123,14 @@ def save_publications():
 
     Saves a file to disk called (by default) ``publications.jsonl``, which
     contains one line per record in INSPIRE with information that will be
-    useful for ``BEARD`` during training and prediction.
+    useful for ``BEARD`` during training and prediction. The publications are
+    also saved as a columnar dataset.
     """
-    with open_file_in_folder(current_app.config['DISAMBIGUATION_PUBLICATIONS_PATH'], 'w') as fd:
+    with open_file_in_folder(current_app.config['DISAMBIGUATION_PUBLICATIONS_PATH'], 'w') as fd, \
+            ColumnsWriter(current_app.config['DISAMBIGUATION_PUBLICATIONS_COLUMNS_PATH'], PUBLICATION_COLUMNS) as writer:
         for publication in get_all_publications():
             fd.write(json.dumps(publication) + '\n')
+            writer.append(publication)
 
 
 def train_and_save_ethnicity_model():
@@ -118,10 +148,13 @@ def train_and_save_distance_model():
 
     distance_estimator = DistanceEstimator(ethnicity_estimator)
     distance_estimator.load_data(
-        current_app.config['DISAMBIGUATION_CURATED_SIGNATURES_PATH'],
-        current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_PATH'],
+        current_app.config['DISAMBIGUATION_CURATED_SIGNATURES_COLUMNS_PATH'],
+        current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_COLUMNS_PATH'],
         current_app.config['DISAMBIGUATION_SAMPLED_PAIRS_SIZE'],
-        current_app.config['DISAMBIGUATION_PUBLICATIONS_PATH'],
+        current_app.config['DISAMBIGUATION_PUBLICATIONS_COLUMNS_PATH'],
+    )
+    distance_estimator.fit(
+        current_app.config['DISAMBIGUATION_FEATURES_CACHE_PATH'],
+        current_app.config['DISAMBIGUATION_FEATURES_VERSION'],
     )
-    distance_estimator.fit()
     distance_estimator.save_model(current_app.config['DISAMBIGUATION_DISTANCE_MODEL_PATH'])
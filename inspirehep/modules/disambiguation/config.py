@@ -38,3 +38,11 @@ Note:
     :mod:`inspirehep.modules.disambiguation.core.ml.sampling`.
 
 """
+
+DISAMBIGUATION_FEATURES_VERSION = '1'
+"""The version of the features of the distance model.
+
+The signatures transformed by the features are cached between trainings, see
+:class:`inspirehep.modules.disambiguation.core.ml.models.FeaturesCache`, so
+it MUST be changed whenever the functions extracting the features change.
+"""
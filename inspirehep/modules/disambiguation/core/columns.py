@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Disambiguation core columnar storage.
+
+A dataset is stored as a directory with one NumPy array per column, which is
+memory-mapped when it is read. Integer columns are stored as they are, while
+string columns store the ids of their values in a table of the distinct
+strings of the dataset, and list columns store the ids of the values of all
+rows along with the offset of the first value of each row.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+from array import array
+
+import numpy as np
+import six
+
+INT = 'int'
+STRING = 'string'
+STRINGS = 'strings'
+
+
+class ColumnsWriter(object):
+    """Write rows to a columnar dataset.
+
+    Args:
+        path (str): the directory of the dataset.
+        kinds (dict): the kind of each column, one of ``INT``, ``STRING`` and
+            ``STRINGS``. ``None`` is stored as ``-1`` in both integer and
+            string columns.
+    """
+
+    def __init__(self, path, kinds):
+        self.path = path
+        self.kinds = kinds
+        self.size = 0
+        self._values = {name: array('q') for name in kinds}
+        self._indptrs = {
+            name: array('q', [0]) for name, kind in six.iteritems(kinds) if kind == STRINGS
+        }
+        self._string_ids = {}
+        self._string_offsets = array('q', [0])
+        self._string_data = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.save()
+
+    def _intern(self, string):
+        if string is None:
+            return -1
+
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = len(self._string_ids)
+            self._string_ids[string] = string_id
+            self._string_data.extend(string.encode('utf-8'))
+            self._string_offsets.append(len(self._string_data))
+
+        return string_id
+
+    def append(self, row):
+        """Append a row, given as a dict with a value for each column."""
+        for name, kind in six.iteritems(self.kinds):
+            value = row.get(name)
+            if kind == INT:
+                self._values[name].append(-1 if value is None else value)
+            elif kind == STRING:
+                self._values[name].append(self._intern(value))
+            else:
+                self._values[name].extend(self._intern(string) for string in value or [])
+                self._indptrs[name].append(len(self._values[name]))
+        self.size += 1
+
+    def save(self):
+        """Write the columns and the table of strings to the directory."""
+        try:
+            os.makedirs(self.path)
+        except OSError:
+            if not os.path.isdir(self.path):
+                raise
+
+        for name, values in six.iteritems(self._values):
+            dtype = np.int64 if self.kinds[name] == INT else np.int32
+            np.save(os.path.join(self.path, name + '.npy'), np.array(values, dtype=dtype))
+        for name, indptr in six.iteritems(self._indptrs):
+            np.save(os.path.join(self.path, name + '_indptr.npy'), np.array(indptr, dtype=np.int64))
+
+        np.save(os.path.join(self.path, '_string_offsets.npy'), np.array(self._string_offsets, dtype=np.int64))
+        np.save(os.path.join(self.path, '_string_data.npy'), np.frombuffer(bytes(self._string_data), dtype=np.uint8))
+
+        with open(os.path.join(self.path, 'meta.json'), 'w') as meta_file:
+            json.dump({'kinds': self.kinds, 'size': self.size}, meta_file)
+
+
+class Columns(object):
+    """Read a columnar dataset written by ``ColumnsWriter``.
+
+    The arrays are memory-mapped, so that only the pages of the columns which
+    are used are loaded, and are shared by the processes reading them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as meta_file:
+            meta = json.load(meta_file)
+
+        self.kinds = meta['kinds']
+        self.size = meta['size']
+        self._arrays = {}
+        self._string_offsets = self._load('_string_offsets')
+        self._string_data = self._load('_string_data')
+
+    def __len__(self):
+        return self.size
+
+    def _load(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    def __getitem__(self, name):
+        """Return the array of a column.
+
+        For string and list columns, these are the ids of the strings.
+        """
+        return self._load(name)
+
+    def indptr(self, name):
+        """Return the offsets of the rows of a list column."""
+        return self._load(name + '_indptr')
+
+    def string(self, string_id):
+        """Return the string with a given id, or ``None`` for ``-1``."""
+        if string_id < 0:
+            return None
+
+        start, end = self._string_offsets[string_id:string_id + 2]
+        return self._string_data[start:end].tobytes().decode('utf-8')
+
+    def value(self, name, row):
+        """Return the value of a column in a row."""
+        column = self[name]
+        kind = self.kinds[name]
+        if kind == INT:
+            value = int(column[row])
+            return None if value == -1 else value
+        if kind == STRING:
+            return self.string(column[row])
+
+        indptr = self.indptr(name)
+        return [self.string(string_id) for string_id in column[indptr[row]:indptr[row + 1]]]
+
+    def row(self, row):
+        """Return a row as a dict."""
+        return {name: self.value(name, row) for name in self.kinds}
+
+
+class ColumnsRow(object):
+    """A row of a columnar dataset, read like the dict it was written from."""
+    __slots__ = ('columns', 'row')
+
+    def __init__(self, columns, row):
+        self.columns = columns
+        self.row = row
+
+    def __getitem__(self, key):
+        return self.columns.value(key, self.row)
+
+    def get(self, key, default=None):
+        if key in self.columns.kinds:
+            return self[key]
+        return default
+
+
+SIGNATURE_COLUMNS = {
+    'author_affiliation': STRING,
+    'author_id': INT,
+    'author_name': STRING,
+    'publication_id': INT,
+    'signature_block': STRING,
+    'signature_uuid': STRING,
+}
+"""Columns of the curated signatures."""
+
+PUBLICATION_COLUMNS = {
+    'abstract': STRING,
+    'authors': STRINGS,
+    'collaborations': STRINGS,
+    'keywords': STRINGS,
+    'publication_id': INT,
+    'title': STRING,
+    'topics': STRINGS,
+}
+"""Columns of the publications."""
+
+PAIR_COLUMNS = {
+    'first_signature': INT,
+    'same_cluster': INT,
+    'second_signature': INT,
+}
+"""Columns of the sampled pairs, whose signatures are rows of the curated
+signatures."""
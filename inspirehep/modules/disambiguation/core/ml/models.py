@@ -25,10 +25,14 @@
 from __future__ import absolute_import, division, print_function
 
 import csv
-import json
+import hashlib
+import multiprocessing
+import os
 import pickle
+from copy import deepcopy
 
 import numpy as np
+import scipy.sparse as sp
 from scipy.special import expit
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -49,10 +53,29 @@ from beard.utils import (
     given_name_initial,
     normalize_name,
 )
-from inspire_utils.record import get_value
+from inspirehep.modules.disambiguation.core.columns import Columns, ColumnsRow
 from inspirehep.modules.disambiguation.utils import open_file_in_folder
 
 
+class SignatureRow(ColumnsRow):
+    """A row of the curated signatures, with its publication under ``publication``."""
+    __slots__ = ('publication',)
+
+    def __init__(self, columns, row, publication):
+        super(SignatureRow, self).__init__(columns, row)
+        self.publication = publication
+
+    def __getitem__(self, key):
+        if key == 'publication':
+            return self.publication
+        return super(SignatureRow, self).__getitem__(key)
+
+    def get(self, key, default=None):
+        if key == 'publication':
+            return self.publication
+        return super(SignatureRow, self).get(key, default)
+
+
 class EthnicityEstimator(object):
     def __init__(self, C=4.0):
         self.C = C
@@ -102,28 +125,39 @@ class DistanceEstimator(object):
         self.ethnicity_estimator = ethnicity_estimator
 
     def load_data(self, signatures_path, pairs_path, pairs_size, publications_path):
-        publications_by_id = {}
-        with open(publications_path, 'r') as fd:
-            for line in fd:
-                publication = json.loads(line)
-                publications_by_id[publication['publication_id']] = publication
-
-        signatures_by_uuid = {}
-        with open(signatures_path, 'r') as fd:
-            for line in fd:
-                signature = json.loads(line)
-                signature['publication'] = publications_by_id[signature['publication_id']]
-                signatures_by_uuid[signature['signature_uuid']] = signature
+        """Load the sampled pairs from the columnar datasets.
+
+        The signatures of the pairs are read on demand from the memory-mapped
+        columns, so that only the signatures and publications used by the
+        pairs are decoded, and only when the features are computed.
+        """
+        signatures = Columns(signatures_path)
+        publications = Columns(publications_path)
+        pairs = Columns(pairs_path)
+        pairs_size = min(pairs_size, len(pairs))
+
+        first_signatures = pairs['first_signature'][:pairs_size]
+        second_signatures = pairs['second_signature'][:pairs_size]
+        signature_rows = np.unique(np.concatenate([first_signatures, second_signatures]))
+
+        publication_ids = np.asarray(publications['publication_id'])
+        publication_order = np.argsort(publication_ids)
+        publication_rows = publication_order[np.searchsorted(
+            publication_ids,
+            signatures['publication_id'][signature_rows],
+            sorter=publication_order,
+        )]
+
+        signatures_by_row = {
+            signature_row: SignatureRow(signatures, signature_row, ColumnsRow(publications, publication_row))
+            for signature_row, publication_row in zip(signature_rows.tolist(), publication_rows.tolist())
+        }
 
         self.X = np.empty((pairs_size, 2), dtype=np.object)
-        self.y = np.empty(pairs_size, dtype=np.int)
-
-        with open(pairs_path, 'r') as fd:
-            for i, line in enumerate(fd):
-                pair = json.loads(line)
-                self.X[i, 0] = signatures_by_uuid[pair['signature_uuids'][0]]
-                self.X[i, 1] = signatures_by_uuid[pair['signature_uuids'][1]]
-                self.y[i] = 0 if pair['same_cluster'] else 1
+        for i, (s1, s2) in enumerate(zip(first_signatures.tolist(), second_signatures.tolist())):
+            self.X[i, 0] = signatures_by_row[s1]
+            self.X[i, 1] = signatures_by_row[s2]
+        self.y = np.where(pairs['same_cluster'][:pairs_size] == 1, 0, 1)
 
     def load_model(self, input_filename):
         with open(input_filename, 'r') as fd:
@@ -133,8 +167,8 @@ class DistanceEstimator(object):
         with open_file_in_folder(output_filename, 'w') as fd:
             pickle.dump(self.distance_estimator, fd, protocol=pickle.HIGHEST_PROTOCOL)
 
-    def fit(self):
-        transformer = FeatureUnion([
+    def _build_transformer(self):
+        return FeatureUnion([
             ('author_full_name_similarity', Pipeline([
                 ('pairs', PairTransformer(
                     element_transformer=Pipeline([
@@ -303,10 +337,166 @@ class DistanceEstimator(object):
                 ('combiner', ElementMultiplication()),
             ])),
         ])
-        classifier = RandomForestClassifier(n_estimators=500, n_jobs=8)
+
+    def _get_unique_signatures(self):
+        """Return the distinct signatures of the pairs, sorted by uuid.
+
+        Returns:
+            Tuple[List[str], numpy.ndarray, numpy.ndarray, numpy.ndarray]: the
+            uuids of the signatures, the signatures as a column, and the
+            positions in it of the first and second signature of each pair.
+        """
+        signatures = self.X.ravel()
+        uuids = np.array([group_by_signature([signature]) for signature in signatures])
+        unique_uuids, first_indices, inverse = np.unique(uuids, return_index=True, return_inverse=True)
+
+        return (
+            unique_uuids.tolist(),
+            signatures[first_indices].reshape(-1, 1),
+            inverse[0::2],
+            inverse[1::2],
+        )
+
+    def fit(self, features_cache_path=None, features_version=None, n_jobs=8):
+        """Fit the distance model on the loaded pairs.
+
+        The pipeline of each feature first transforms every signature with
+        an element transformer, e.g. a TF-IDF of the author names, and then
+        combines the transformed signatures of each pair, e.g. with their
+        cosine similarity. The element transformers are fitted and applied
+        once per distinct signature, in parallel across ``n_jobs`` processes,
+        and the pairs are then assembled by indexing the transformed
+        signatures, which is what ``PairTransformer`` does for every feature
+        in turn when the whole pipeline is fitted.
+
+        Args:
+            features_cache_path (Optional[str]): directory where the fitted
+                element transformers and the transformed signatures are
+                cached, so that they are reused by the next fits on the same
+                signatures.
+            features_version (Optional[str]): the version of the features,
+                to be changed when they change to invalidate the cache.
+            n_jobs (int): number of processes used to transform the
+                signatures and to fit the classifier.
+        """
+        transformer = self._build_transformer()
+        uuids, signatures, left, right = self._get_unique_signatures()
+        features_cache = FeaturesCache(features_cache_path, features_version, uuids)
+
+        names = [name for name, _ in transformer.transformer_list]
+        pipelines = [pipeline for _, pipeline in transformer.transformer_list]
+        element_transformers = [pipeline.steps[0][1].element_transformer for pipeline in pipelines]
+        transformed = [
+            features_cache.get(name, element_transformer)
+            for name, element_transformer in zip(names, element_transformers)
+        ]
+        missing = [i for i, cached in enumerate(transformed) if cached is None]
+
+        _transform_signatures_state.update(
+            element_transformers=[element_transformers[i] for i in missing],
+            signatures=signatures,
+        )
+        try:
+            if n_jobs > 1 and len(missing) > 1:
+                pool = multiprocessing.Pool(min(n_jobs, len(missing)))
+                try:
+                    results = pool.map(_transform_signatures, range(len(missing)))
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                results = [_transform_signatures(i) for i in range(len(missing))]
+        finally:
+            _transform_signatures_state.clear()
+
+        for i, (fitted_element_transformer, transformed_signatures) in zip(missing, results):
+            features_cache.set(names[i], element_transformers[i], fitted_element_transformer, transformed_signatures)
+            transformed[i] = (fitted_element_transformer, transformed_signatures)
+
+        features = []
+        for pipeline, (element_transformer, transformed_signatures) in zip(pipelines, transformed):
+            pipeline.steps[0][1].element_transformer = element_transformer
+            if sp.issparse(transformed_signatures):
+                Xt = sp.hstack((transformed_signatures[left], transformed_signatures[right]))
+            else:
+                Xt = np.hstack((transformed_signatures[left], transformed_signatures[right]))
+            for _, step in pipeline.steps[1:]:
+                Xt = step.fit_transform(Xt)
+            features.append(Xt)
+
+        if any(sp.issparse(feature) for feature in features):
+            features = sp.hstack(features).tocsr()
+        else:
+            features = np.hstack(features)
+
+        classifier = RandomForestClassifier(n_estimators=500, n_jobs=n_jobs)
+        classifier.fit(features, self.y)
 
         self.distance_estimator = Pipeline([('transformer', transformer), ('classifier', classifier)])
-        self.distance_estimator.fit(self.X, self.y)
+
+
+_transform_signatures_state = {}
+"""Inputs of ``_transform_signatures``, inherited by the forked processes."""
+
+
+def _transform_signatures(i):
+    """Fit an element transformer on the signatures and transform them."""
+    element_transformer = deepcopy(_transform_signatures_state['element_transformers'][i])
+    signatures = _transform_signatures_state['signatures']
+    element_transformer.fit(signatures)
+
+    return element_transformer, element_transformer.transform(signatures)
+
+
+class FeaturesCache(object):
+    """Disk cache of the signatures transformed by the element transformers.
+
+    An entry holds a fitted element transformer and the transformed
+    signatures, as a sparse matrix for the TF-IDF features. It is keyed by
+    the name and the version of the feature, by the parameters of the
+    element transformer before it is fitted, which include the ethnicity
+    model, and by the uuids of the signatures on which it was fitted.
+    """
+
+    def __init__(self, path, version, uuids):
+        self.path = path
+        self.version = version
+        self.uuids_hash = hashlib.sha1('\n'.join(uuids).encode('utf-8')).hexdigest()
+
+    def _get_path(self, name, element_transformer):
+        params_hash = hashlib.sha1(
+            pickle.dumps(element_transformer, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+        return os.path.join(self.path, '{}-{}-{}-{}.pkl'.format(
+            name, self.version, params_hash, self.uuids_hash))
+
+    def get(self, name, element_transformer):
+        """Return the fitted element transformer and the transformed signatures."""
+        if not self.path:
+            return None
+
+        path = self._get_path(name, element_transformer)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as fd:
+            return pickle.load(fd)
+
+    def set(self, name, element_transformer, fitted_element_transformer, transformed_signatures):
+        """Cache the signatures transformed by an element transformer.
+
+        Args:
+            name (str): the name of the feature.
+            element_transformer: the element transformer before it was fitted.
+            fitted_element_transformer: the element transformer once fitted.
+            transformed_signatures: the transformed signatures.
+        """
+        if self.path:
+            with open_file_in_folder(self._get_path(name, element_transformer), 'wb') as fd:
+                pickle.dump(
+                    (fitted_element_transformer, transformed_signatures),
+                    fd,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
 
 
 def get_author_full_name(signature):
@@ -347,7 +537,7 @@ def get_author_affiliation(signature):
 
 
 def get_coauthors_neighborhood(signature, radius=10):
-    authors = get_value(signature, 'publication.authors', default=[])
+    authors = signature.get('publication', {}).get('authors', [])
     try:
         center = authors.index(signature['author_name'])
         return ' '.join(authors[max(0, center - radius):min(len(authors), center + radius)])
@@ -356,23 +546,23 @@ def get_coauthors_neighborhood(signature, radius=10):
 
 
 def get_abstract(signature):
-    return get_value(signature, 'publication.abstract', default='')
+    return signature.get('publication', {}).get('abstract', '')
 
 
 def get_keywords(signature):
-    return ' '.join(get_value(signature, 'publication.keywords', default=[]))
+    return ' '.join(signature.get('publication', {}).get('keywords', []))
 
 
 def get_collaborations(signature):
-    return ' '.join(get_value(signature, 'publication.collaborations', default=[]))
+    return ' '.join(signature.get('publication', {}).get('collaborations', []))
 
 
 def get_topics(signature):
-    return ' '.join(get_value(signature, 'publication.topics', default=[]))
+    return ' '.join(signature.get('publication', {}).get('topics', []))
 
 
 def get_title(signature):
-    return get_value(signature, 'publication.title', default='')
+    return signature.get('publication', {}).get('title', '')
 
 
 def group_by_signature(signatures):
@@ -24,15 +24,105 @@
 
 from __future__ import absolute_import, division, print_function
 
-import itertools
-import json
-from collections import defaultdict
-
 import numpy as np
-import six
 
+from inspirehep.modules.disambiguation.core.columns import Columns
+
+
+MAX_ROUNDS = 10
+"""Maximum number of rounds of rejection while sampling a category, after
+which the partners of the remaining signatures are enumerated."""
+
+
+def _group_bounds(order, *keys):
+    """Return the group of each position of ``order``, grouping by all the keys.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: the position in ``order`` of the
+        first signature of the group of each position, and of the first
+        signature after it.
+    """
+    changes = np.zeros(len(order), dtype=bool)
+    if len(order):
+        changes[0] = True
+    for key in keys:
+        sorted_key = key[order]
+        changes[1:] |= sorted_key[1:] != sorted_key[:-1]
+
+    starts = np.flatnonzero(changes)
+    ends = np.append(starts[1:], len(order))
+    groups = np.cumsum(changes) - 1
+
+    return starts[groups], ends[groups]
+
+
+def _sizes_by_row(order, bounds):
+    """Return the size of the group of each signature, by row."""
+    sizes = np.empty(len(order), dtype=np.int64)
+    sizes[order] = bounds[1] - bounds[0]
+    return sizes
+
+
+def _sample_category(order, group, excluded, weights, size, reject=None):
+    """Sample pairs of a category without enumerating them.
+
+    The partners of a signature in the category are the signatures of its
+    group, sorted contiguously in ``order``, except the ones of a smaller
+    group containing it, also contiguous, and except the ones ``reject``
+    returns. The first signature of a pair is drawn with a probability
+    proportional to its number of partners, and the second one uniformly
+    among them, so that the pairs of the category are drawn uniformly, and
+    with replacement. When ``reject`` is given, the second signatures it
+    rejects are drawn again for at most ``MAX_ROUNDS`` rounds, and then among
+    the enumerated partners of their first signature.
+
+    Args:
+        order (numpy.ndarray): the rows of the signatures, sorted so that the
+            groups are contiguous.
+        group (tuple): the bounds of the group of each position of ``order``,
+            as returned by ``_group_bounds``.
+        excluded (tuple): the bounds of the excluded group of each position.
+        weights (numpy.ndarray): the number of partners of each position.
+        size (int): the number of pairs to sample.
+        reject (Optional[callable]): returns a mask of the drawn pairs which
+            are not in the category.
 
-def sample_signature_pairs(signatures_path, clusters_path, pairs_size):
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: the rows of the signatures of
+        the sampled pairs.
+    """
+    positions = np.random.choice(len(order), size=size, p=weights / weights.sum())
+    group_starts, group_ends = group[0][positions], group[1][positions]
+    excluded_starts, excluded_ends = excluded[0][positions], excluded[1][positions]
+    excluded_sizes = excluded_ends - excluded_starts
+    candidates = group_ends - group_starts - excluded_sizes
+
+    s1 = order[positions]
+    s2 = np.empty(size, dtype=order.dtype)
+    pending = np.arange(size)
+    for _ in range(MAX_ROUNDS):
+        offsets = (np.random.random(len(pending)) * candidates[pending]).astype(np.int64)
+        offsets += group_starts[pending]
+        offsets += (offsets >= excluded_starts[pending]) * excluded_sizes[pending]
+        s2[pending] = order[offsets]
+        if reject is None:
+            return s1, s2
+        pending = pending[reject(s1[pending], s2[pending])]
+        if not len(pending):
+            return s1, s2
+
+    for index in pending:
+        partners = np.concatenate([
+            order[group_starts[index]:excluded_starts[index]],
+            order[excluded_ends[index]:group_ends[index]],
+        ])
+        partners = partners[~reject(np.full(len(partners), s1[index]), partners)]
+        s2[index] = partners[np.random.randint(len(partners))]
+
+    return s1, s2
+
+
+def sample_signature_pairs(signatures_path, pairs_size):
     """Sample signature pairs to generate less training data.
 
     Since INSPIRE contains ~3M curated signatures it would take too much time
@@ -41,18 +131,19 @@ def sample_signature_pairs(signatures_path, clusters_path, pairs_size):
 
     This is accomplished in three steps:
 
-        1. First we read all the clusters and signatures and build in-memory
-           data structures to perform fast lookups of the id of the cluster
-           to which a signature belongs as well as lookups of the name of the
-           author associated with the signature.
+        1. First we read the columns of the curated signatures holding the
+           id of the author, which identifies the cluster to which a
+           signature belongs, and the ids of the author name and of the
+           phonetic encoding of the name, which are compared as integers.
 
-           At the same time we partition the signatures in blocks according
-           to the phonetic encoding of the name. Note that two signatures
-           pointing to two distinct authors might end up in the same block.
+           We then group the signatures by block, which are defined by the
+           phonetic encoding of the name, and within each block by cluster,
+           by name, and by both. Note that two signatures pointing to two
+           distinct authors might end up in the same block.
 
-        2. Then we classify signature pairs that belong to the same block
+        2. Then we count the signature pairs that belong to the same block
            according to whether they belong to same cluster and whether they
-           share the same author name.
+           share the same author name, using only the sizes of the groups.
 
            The former is because we want to have both examples of pairs of
            signatures in the same block pointing to the same author and
@@ -65,65 +156,109 @@ def sample_signature_pairs(signatures_path, clusters_path, pairs_size):
            number of non-empty categories, to make sure that we will sample
            the same number of pairs from each category.
 
+           A pair of a category is drawn uniformly, and with replacement, by
+           drawing its first signature with a probability proportional to
+           its number of partners in the category, which is computed from the
+           sizes of the groups, and its second one among these partners. The
+           pairs are never enumerated, so this scales linearly with the
+           number of signatures rather than with the square of the size of
+           the blocks.
+
+    Args:
+        signatures_path (str): the columnar dataset of the curated signatures,
+            see :mod:`inspirehep.modules.disambiguation.core.columns`.
+        pairs_size (int): the number of pairs to sample.
+
     Yields:
-        dict: a signature pair.
+        Tuple[int, int, bool]: the rows of the signatures of a pair and
+        whether they belong to the same cluster.
 
     """
 
     #
-    # 1. Read & Build
+    # 1. Read & Group
     #
 
-    blocks = defaultdict(list)
-    author_names_by_signature_uuid = {}
-    with open(signatures_path, 'r') as fd:
-        for line in fd:
-            signature = json.loads(line)
-            blocks[signature['signature_block']].append(signature['signature_uuid'])
-            author_names_by_signature_uuid[signature['signature_uuid']] = signature['author_name']
-
-    cluster_ids_by_signature_uuid = {}
-    with open(clusters_path, 'r') as fd:
-        for line in fd:
-            cluster = json.loads(line)
-            for signature_uuid in cluster['signature_uuids']:
-                cluster_ids_by_signature_uuid[signature_uuid] = cluster['cluster_id']
+    signatures = Columns(signatures_path)
+    cluster_ids = np.asarray(signatures['author_id'])
+    author_name_ids = np.asarray(signatures['author_name'])
+    block_ids = np.asarray(signatures['signature_block'])
+
+    by_cluster_order = np.lexsort((author_name_ids, cluster_ids, block_ids))
+    by_name_order = np.lexsort((cluster_ids, author_name_ids, block_ids))
+
+    block = _group_bounds(by_cluster_order, block_ids)
+    cluster = _group_bounds(by_cluster_order, block_ids, cluster_ids)
+    cluster_and_name = _group_bounds(by_cluster_order, block_ids, cluster_ids, author_name_ids)
+    name = _group_bounds(by_name_order, block_ids, author_name_ids)
+    name_and_cluster = _group_bounds(by_name_order, block_ids, author_name_ids, cluster_ids)
 
     #
-    # 2. Classify
+    # 2. Count
     #
 
-    same_cluster_same_name = []
-    same_cluster_different_name = []
-    different_cluster_same_name = []
-    different_cluster_different_name = []
-    for _, block in six.iteritems(blocks):
-        for s1, s2 in itertools.combinations(block, 2):
-            s1_cluster_id = cluster_ids_by_signature_uuid[s1]
-            s2_cluster_id = cluster_ids_by_signature_uuid[s2]
-            s1_author_name = author_names_by_signature_uuid[s1]
-            s2_author_name = author_names_by_signature_uuid[s2]
-            if s1_cluster_id == s2_cluster_id and s1_author_name == s2_author_name:
-                same_cluster_same_name.append({'same_cluster': True, 'signature_uuids': [s1, s2]})
-            elif s1_cluster_id == s2_cluster_id and s1_author_name != s2_author_name:
-                same_cluster_different_name.append({'same_cluster': True, 'signature_uuids': [s1, s2]})
-            elif s1_cluster_id != s2_cluster_id and s1_author_name == s2_author_name:
-                different_cluster_same_name.append({'same_cluster': False, 'signature_uuids': [s1, s2]})
-            elif s1_cluster_id != s2_cluster_id and s1_author_name != s2_author_name:
-                different_cluster_different_name.append({'same_cluster': False, 'signature_uuids': [s1, s2]})
+    positions = np.arange(len(by_cluster_order))
+    itself = (positions, positions + 1)
+
+    block_sizes = _sizes_by_row(by_cluster_order, block)
+    cluster_sizes = _sizes_by_row(by_cluster_order, cluster)
+    name_sizes = _sizes_by_row(by_name_order, name)
+    cluster_and_name_sizes = _sizes_by_row(by_cluster_order, cluster_and_name)
+    different_cluster_and_name_partners = (
+        block_sizes - cluster_sizes - name_sizes + cluster_and_name_sizes
+    )
+
+    def same_name(s1, s2):
+        return author_name_ids[s1] == author_name_ids[s2]
+
+    categories = [
+        (
+            by_cluster_order,
+            cluster_and_name,
+            itself,
+            cluster_and_name[1] - cluster_and_name[0] - 1,
+            None,
+            True,
+        ),
+        (
+            by_cluster_order,
+            cluster,
+            cluster_and_name,
+            (cluster[1] - cluster[0]) - (cluster_and_name[1] - cluster_and_name[0]),
+            None,
+            True,
+        ),
+        (
+            by_name_order,
+            name,
+            name_and_cluster,
+            (name[1] - name[0]) - (name_and_cluster[1] - name_and_cluster[0]),
+            None,
+            False,
+        ),
+        (
+            by_cluster_order,
+            block,
+            cluster,
+            different_cluster_and_name_partners[by_cluster_order],
+            same_name,
+            False,
+        ),
+    ]
 
     #
     # 3. Sample
     #
 
-    non_empty_categories = [
-        category for category in [
-            same_cluster_same_name,
-            same_cluster_different_name,
-            different_cluster_same_name,
-            different_cluster_different_name,
-        ] if category
-    ]
-    for category in non_empty_categories:
-        for pair in np.random.choice(category, replace=True, size=(pairs_size // len(non_empty_categories))):
-            yield pair
+    non_empty_categories = [category for category in categories if category[3].sum()]
+    for order, group, excluded, weights, reject, is_same_cluster in non_empty_categories:
+        s1, s2 = _sample_category(
+            order,
+            group,
+            excluded,
+            weights.astype(np.float64),
+            pairs_size // len(non_empty_categories),
+            reject=reject,
+        )
+        for pair in zip(np.minimum(s1, s2).tolist(), np.maximum(s1, s2).tolist()):
+            yield pair + (is_same_cluster,)
@@ -44,18 +44,26 @@ class InspireDisambiguation(object):
         app.config['DISAMBIGUATION_BASE_PATH'] = disambiguation_base_path
         app.config['DISAMBIGUATION_CURATED_SIGNATURES_PATH'] = os.path.join(
             disambiguation_base_path, 'curated_signatures.jsonl')
+        app.config['DISAMBIGUATION_CURATED_SIGNATURES_COLUMNS_PATH'] = os.path.join(
+            disambiguation_base_path, 'curated_signatures')
         app.config['DISAMBIGUATION_INPUT_CLUSTERS_PATH'] = os.path.join(
             disambiguation_base_path, 'input_clusters.jsonl')
         app.config['DISAMBIGUATION_SAMPLED_PAIRS_PATH'] = os.path.join(
             disambiguation_base_path, 'sampled_pairs.jsonl')
+        app.config['DISAMBIGUATION_SAMPLED_PAIRS_COLUMNS_PATH'] = os.path.join(
+            disambiguation_base_path, 'sampled_pairs')
         app.config['DISAMBIGUATION_PUBLICATIONS_PATH'] = os.path.join(
             disambiguation_base_path, 'publications.jsonl')
+        app.config['DISAMBIGUATION_PUBLICATIONS_COLUMNS_PATH'] = os.path.join(
+            disambiguation_base_path, 'publications')
         app.config['DISAMBIGUATION_ETHNICITY_DATA_PATH'] = os.path.join(
             disambiguation_base_path, 'ethnicity.csv')
         app.config['DISAMBIGUATION_ETHNICITY_MODEL_PATH'] = os.path.join(
             disambiguation_base_path, 'ethnicity.pkl')
         app.config['DISAMBIGUATION_DISTANCE_MODEL_PATH'] = os.path.join(
             disambiguation_base_path, 'distance.pkl')
+        app.config['DISAMBIGUATION_FEATURES_CACHE_PATH'] = os.path.join(
+            disambiguation_base_path, 'features')
 
         for k in dir(config):
             if k.startswith('DISAMBIGUATION_'):
@@ -35,6 +35,10 @@ from sqlalchemy.ext.hybrid import hybrid_property
 from .utils import get_collection_from_marcxml
 
 
+def format_error(exc):
+    return u'{}: {}'.format(type(exc).__name__, exc)
+
+
 class LegacyRecordsMirror(db.Model):
     __tablename__ = 'legacy_records_mirror'
 
@@ -50,6 +54,7 @@ class LegacyRecordsMirror(db.Model):
     collection = db.Column(db.Text(), default='')
 
     re_recid = re.compile('<controlfield.*?tag=.001.*?>(?P<recid>\d+)</controlfield>')
+    re_legacy_version = re.compile('<controlfield.*?tag=.005.*?>(?P<version>[\d.]+)</controlfield>')
 
     @hybrid_property
     def marcxml(self):
@@ -64,16 +69,36 @@ class LegacyRecordsMirror(db.Model):
     def marcxml(self, value):
         self._marcxml = compress(value)
 
+    @property
+    def legacy_version(self):
+        """The timestamp of the last modification of the record on Legacy."""
+        return self.get_legacy_version(self.marcxml)
+
+    @classmethod
+    def get_legacy_version(cls, raw_record):
+        """Return the timestamp in the ``005`` tag of a MARCXML record.
+
+        The timestamps sort in chronological order, and the records without
+        one get an empty string, which sorts before all of them.
+        """
+        match = cls.re_legacy_version.search(raw_record)
+        return match.group('version') if match else ''
+
     @hybrid_property
     def error(self):
         return self._errors
 
     @error.setter
     def error(self, value):
-        """Errors column setter that stores an Exception and sets the ``valid`` flag."""
+        """Errors column setter that stores an Exception and sets the ``valid`` flag.
+
+        The Exception can also be passed already formatted, see ``format_error``.
+        """
         self.valid = False
         self.collection = get_collection_from_marcxml(self.marcxml)
-        self._errors = u'{}: {}'.format(type(value).__name__, value)
+        if isinstance(value, Exception):
+            value = format_error(value)
+        self._errors = value
 
     @classmethod
     def from_marcxml(cls, raw_record):
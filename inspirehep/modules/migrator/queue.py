@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Reliable queue of the records pushed by Legacy."""
+
+from __future__ import absolute_import, division, print_function
+
+import uuid
+from time import time
+
+import flask
+from flask import current_app as app
+from redis import StrictRedis
+
+
+CLAIM_SCRIPT = """
+local batch = redis.call('lpop', KEYS[4])
+while batch do
+    local items = redis.call('lrange', batch, 0, -1)
+    if #items > 0 then
+        redis.call('zadd', KEYS[2], ARGV[2], batch)
+        return {batch, items}
+    end
+    batch = redis.call('lpop', KEYS[4])
+end
+local items = redis.call('lrange', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items == 0 then
+    return {KEYS[3], items}
+end
+redis.call('ltrim', KEYS[1], #items, -1)
+redis.call('rpush', KEYS[3], unpack(items))
+redis.call('zadd', KEYS[2], ARGV[2], KEYS[3])
+return {KEYS[3], items}
+"""
+
+RETRY_FUNCTION = """
+local function retry(batch)
+    redis.call('zrem', KEYS[1], batch)
+    local attempts = redis.call('hincrby', KEYS[2], batch, 1)
+    if attempts < tonumber(ARGV[2]) then
+        redis.call('rpush', KEYS[3], batch)
+        return 0
+    end
+    local items = redis.call('lrange', batch, 0, -1)
+    if #items > 0 then
+        redis.call('rpush', KEYS[4], unpack(items))
+    end
+    redis.call('del', batch)
+    redis.call('hdel', KEYS[2], batch)
+    return 1
+end
+"""
+
+REQUEUE_SCRIPT = RETRY_FUNCTION + """
+local expired = redis.call('zrangebyscore', KEYS[1], '-inf', ARGV[1])
+for _, batch in ipairs(expired) do
+    retry(batch)
+end
+return #expired
+"""
+
+FAIL_SCRIPT = RETRY_FUNCTION + """
+if not redis.call('zscore', KEYS[1], ARGV[1]) then
+    return 0
+end
+return retry(ARGV[1])
+"""
+
+EXTEND_SCRIPT = """
+if redis.call('zscore', KEYS[1], KEYS[2]) then
+    redis.call('zadd', KEYS[1], ARGV[1], KEYS[2])
+    return 1
+end
+return 0
+"""
+
+
+class LegacyRecordsQueue(object):
+    """Redis list of the compressed records pushed by Legacy.
+
+    Legacy appends records to the list, and consumers claim them in batches:
+    a batch is atomically moved from the head of the list to a processing
+    list of its own, which is deleted when the batch is acknowledged. Several
+    consumers can then drain the queue in parallel, and the batches of the
+    consumers which died before acknowledging them are retried once their
+    visibility timeout expires. The consumers extend the timeout of their
+    batch while processing it, so that slow batches are not retried while
+    still being processed.
+
+    The batches to retry, which failed or expired, are claimed as they are
+    before any new record. After ``max_attempts`` attempts, their records
+    are moved to a dead-letter list instead, so that a batch which always
+    fails doesn't block a consumer forever.
+    """
+    key = 'legacy_records'
+    batches_key = 'legacy_records:batches'
+    batch_key = 'legacy_records:batch:{}'
+    retry_key = 'legacy_records:retry'
+    attempts_key = 'legacy_records:attempts'
+    dead_key = 'legacy_records:dead'
+
+    def __init__(self, visibility_timeout=600, max_attempts=5):
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    def claim(self, size):
+        """Claim the next batch to retry, or move up to ``size`` records from
+        the queue to a new batch.
+
+        Returns:
+            Tuple[str, List[bytes]]: the key of the batch, to acknowledge it
+            once processed, and its records, oldest first.
+        """
+        claim = self.redis.register_script(CLAIM_SCRIPT)
+        batch_key, records = claim(
+            keys=[
+                self.key,
+                self.batches_key,
+                self.batch_key.format(uuid.uuid4()),
+                self.retry_key,
+            ],
+            args=[size, time() + self.visibility_timeout],
+        )
+
+        return batch_key, records
+
+    def extend(self, batch_key):
+        """Extend the visibility timeout of a batch being processed.
+
+        Returns:
+            bool: whether the batch was still claimed, i.e. it was not put
+            back in the queue because its visibility timeout expired.
+        """
+        extend = self.redis.register_script(EXTEND_SCRIPT)
+        return bool(extend(
+            keys=[self.batches_key, batch_key],
+            args=[time() + self.visibility_timeout],
+        ))
+
+    def ack(self, batch_key):
+        """Delete a processed batch."""
+        with self.redis.pipeline() as pipe:
+            pipe.delete(batch_key)
+            pipe.zrem(self.batches_key, batch_key)
+            pipe.hdel(self.attempts_key, batch_key)
+            pipe.lrem(self.retry_key, 0, batch_key)
+            pipe.execute()
+
+    def fail(self, batch_key):
+        """Release a batch which could not be processed, to retry it later.
+
+        Returns:
+            bool: whether the batch failed ``max_attempts`` times, and its
+            records were moved to the dead-letter list.
+        """
+        fail = self.redis.register_script(FAIL_SCRIPT)
+        return bool(fail(keys=self._retry_keys(), args=[batch_key, self.max_attempts]))
+
+    def requeue_expired(self):
+        """Release the batches whose visibility timeout expired, to retry them.
+
+        Each expiration counts as a failed attempt.
+
+        Returns:
+            int: the number of batches released.
+        """
+        requeue = self.redis.register_script(REQUEUE_SCRIPT)
+        return requeue(keys=self._retry_keys(), args=[time(), self.max_attempts])
+
+    def _retry_keys(self):
+        return [
+            self.batches_key,
+            self.attempts_key,
+            self.retry_key,
+            self.dead_key,
+        ]
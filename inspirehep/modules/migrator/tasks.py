@@ -27,8 +27,12 @@ from __future__ import absolute_import, division, print_function
 import gzip
 import re
 import tarfile
+import uuid
 import zlib
 from contextlib import closing
+from datetime import datetime
+from multiprocessing import Pool
+from time import time
 
 import click
 import requests
@@ -36,27 +40,47 @@ import requests
 from celery import group, shared_task
 from elasticsearch.helpers import bulk as es_bulk
 from flask import current_app
-from flask_sqlalchemy import models_committed
 from functools import wraps
+from itertools import islice
 from jsonschema import ValidationError
-from redis import StrictRedis
-from redis_lock import Lock
+from six.moves import map
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+try:
+    from xml.etree import cElementTree as ElementTree
+except ImportError:
+    from xml.etree import ElementTree
 
 from invenio_db import db
-from invenio_pidstore.models import PersistentIdentifier
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus, RecordIdentifier
+from invenio_records.models import RecordMetadata
 from invenio_search import current_search_client as es
 
 from inspire_dojson import marcxml2record
+from inspire_dojson.utils import strip_empty_values
 from inspire_utils.logging import getStackTraceLogger
 from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.pidstore.cache import PidCache
 from inspirehep.modules.pidstore.utils import (
+    get_pid_type_from_schema,
     get_pid_types_from_endpoints,
 )
-from inspirehep.modules.records.receivers import index_after_commit
-from inspirehep.utils.schema import ensure_valid_schema
-from inspirehep.utils.record import create_index_op
+from inspirehep.modules.records.index_versions import (
+    skip_paused_index_ops,
+    track_index_ops,
+)
+from inspirehep.modules.records.receivers import (
+    assign_phonetic_block,
+    assign_uuid,
+    reindex_modified_citations,
+    skip_indexing_receivers,
+)
+from inspirehep.utils.schema import ensure_valid_schema, validate_with_cached_schema
+from inspirehep.utils.record import create_index_ops
 
-from .models import LegacyRecordsMirror
+from .models import LegacyRecordsMirror, format_error
+from .queue import LegacyRecordsQueue
 
 LOGGER = getStackTraceLogger(__name__)
 
@@ -104,6 +128,33 @@ def split_blob(blob):
         yield match.group()
 
 
+def open_streams(source):
+    """Open the MARCXML files contained in a file.
+
+    Yields:
+        file: a stream for each MARCXML file, which is the file itself for an
+        (optionally gzipped) XML file, or each of its members for a prodsync
+        tarball.
+    """
+    if source.endswith('.gz'):
+        with gzip.open(source, 'rb') as fd:
+            yield fd
+    elif source.endswith('.tar'):  # assuming prodsync tarball
+        with closing(tarfile.open(source)) as tar:
+            for file_ in tar:
+                print('Processing {}'.format(file_.name))
+                yield gzip.GzipFile(fileobj=tar.extractfile(file_), mode='rb')
+    else:
+        with open(source, 'rb') as fd:
+            yield fd
+
+
+def read_file(source):
+    for stream in open_streams(source):
+        for line in stream:
+            yield line
+
+
 def split_stream(stream):
     """Split the stream using <record.*?>.*?</record> as pattern.
 
@@ -123,22 +174,46 @@ def split_stream(stream):
             buf.append(row)
 
 
-def read_file(source):
-    if source.endswith('.gz'):
-        with gzip.open(source, 'rb') as fd:
-            for line in fd:
-                yield line
-    elif source.endswith('.tar'):  # assuming prodsync tarball
-        with closing(tarfile.open(source)) as tar:
-            for file_ in tar:
-                print('Processing {}'.format(file_.name))
-                unzipped = gzip.GzipFile(fileobj=tar.extractfile(file_), mode='rb')
-                for line in unzipped:
-                    yield line
-    else:
-        with open(source, 'rb') as fd:
-            for line in fd:
-                yield line
+def iter_marcxml_records(stream):
+    """Split a MARCXML stream into records while parsing it incrementally.
+
+    The MARC namespace is dropped from the records, so that they look like
+    the ones sent by legacy. If the stream is not well-formed, the records
+    after the last one parsed are split with ``split_stream`` instead, so
+    that a malformed record is mirrored, and fails its migration, without
+    stopping the rest of the stream.
+
+    Args:
+        stream(file): a seekable stream of MARCXML.
+
+    Yields:
+        bytes: each record of the stream, serialized as ``<record>...</record>``.
+    """
+    parsed = 0
+    try:
+        for record in _iterparse_marcxml_records(stream):
+            yield record
+            parsed += 1
+    except ElementTree.ParseError:
+        LOGGER.exception('Cannot parse MARCXML stream, splitting it instead')
+        stream.seek(0)
+        for record in islice(split_stream(stream), parsed, None):
+            yield record
+
+
+def _iterparse_marcxml_records(stream):
+    context = ElementTree.iterparse(stream, events=('start', 'end'))
+    _, root = next(context)
+    for event, element in context:
+        if event != 'end' or element.tag.rsplit('}', 1)[-1] != 'record':
+            continue
+
+        for sub_element in element.iter():
+            sub_element.tag = sub_element.tag.rsplit('}', 1)[-1]
+        element.tail = None
+        yield ElementTree.tostring(element, encoding='utf-8')
+
+        root.clear()
 
 
 def migrate_record_from_legacy(recid):
@@ -148,7 +223,7 @@ def migrate_record_from_legacy(recid):
     db.session.commit()
 
 
-def migrate_from_mirror(also_migrate=None, wait_for_results=False, skip_files=None):
+def migrate_from_mirror(also_migrate=None, wait_for_results=False, skip_files=None, bulk=False, processes=None):
     """Migrate legacy records from the local mirror.
 
     By default, only the records that have not been migrated yet are migrated.
@@ -164,12 +239,20 @@ def migrate_from_mirror(also_migrate=None, wait_for_results=False, skip_files=No
         wait_for_results(bool): flag indicating whether the task should wait
             for the migration to finish (if True) or fire and forget the migration
             tasks (if False).
+        bulk(bool): flag indicating whether to migrate the records in bulk,
+            see ``bulk_migrate_prod_records``. As the files are then never
+            migrated, ``skip_files`` has to be set.
+        processes(Optional[int]): if set together with ``bulk``, the records
+            are migrated in the current process instead of in celery tasks,
+            and converted in a pool of this number of processes.
     """
     if skip_files is None:
         skip_files = current_app.config.get(
             'RECORDS_MIGRATION_SKIP_FILES',
             False,
         )
+    if bulk and not skip_files:
+        raise ValueError('"bulk" can only be used together with "skip_files"')
 
     query = LegacyRecordsMirror.query.with_entities(LegacyRecordsMirror.recid)
     if also_migrate is None:
@@ -188,12 +271,30 @@ def migrate_from_mirror(also_migrate=None, wait_for_results=False, skip_files=No
         migrate_recids_from_mirror.ignore_result = False
 
     chunked_recids = chunker(res.recid for res in query.yield_per(CHUNK_SIZE))
+
+    if bulk and processes:
+        # Celery workers can't start processes, so the pool has to live here.
+        pool = Pool(processes)
+        try:
+            for i, chunk in enumerate(chunked_recids):
+                bulk_migrate_prod_records(chunk, pool=pool)
+                print("Migrated {} records".format(i * CHUNK_SIZE + len(chunk)))
+        finally:
+            pool.close()
+            pool.join()
+        return
+
     for i, chunk in enumerate(chunked_recids):
         print("Scheduled {} records for migration".format(i * CHUNK_SIZE + len(chunk)))
+        if bulk:
+            task = bulk_migrate_recids_from_mirror.s(chunk)
+        else:
+            task = migrate_recids_from_mirror.s(chunk, skip_files=skip_files)
+
         if wait_for_results:
-            tasks.append(migrate_recids_from_mirror.s(chunk, skip_files=skip_files))
+            tasks.append(task)
         else:
-            migrate_recids_from_mirror.delay(chunk, skip_files=skip_files)
+            task.delay()
 
     if wait_for_results:
         job = group(tasks)
@@ -208,56 +309,338 @@ def migrate_from_file(source, wait_for_results=False):
     migrate_from_mirror(wait_for_results=wait_for_results)
 
 
-def populate_mirror_from_file(source):
-    for i, chunk in enumerate(chunker(split_stream(read_file(source)), CHUNK_SIZE)):
-        insert_into_mirror(chunk)
-        print("Inserted {} records into mirror".format(i * CHUNK_SIZE + len(chunk)))
+def populate_mirror_from_file(source, processes=None):
+    """Insert or update in the mirror all the records of a file.
+
+    The records are split from the file while it is parsed and turned into
+    mirror rows in a pool of ``processes`` processes, then written to the DB
+    in batches of ``LARGE_CHUNK_SIZE``.
+
+    Args:
+        source(str): path of an (optionally gzipped) XML file containing
+            MARCXML, or of a prodsync tarball.
+        processes(Optional[int]): number of processes parsing the records.
+            Defaults to the number of CPUs, if set to 1 everything runs in the
+            current process.
+    """
+    raw_records = (
+        raw_record
+        for stream in open_streams(source)
+        for raw_record in iter_marcxml_records(stream)
+    )
+
+    pool = None
+    if processes == 1:
+        rows = map(_mirror_row_from_marcxml, raw_records)
+    else:
+        pool = Pool(processes)
+        rows = pool.imap(_mirror_row_from_marcxml, raw_records, chunksize=CHUNK_SIZE)
+
+    inserted = 0
+    start_time = time()
+    try:
+        for chunk in chunker((row for row in rows if row), LARGE_CHUNK_SIZE):
+            bulk_insert_into_mirror(chunk)
+            inserted += len(chunk)
+            print('Inserted {} records into mirror ({:.1f} records/sec)'.format(
+                inserted, inserted / max(time() - start_time, 1e-6),
+            ))
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+
+def _mirror_row_from_marcxml(raw_record):
+    try:
+        prod_record = LegacyRecordsMirror.from_marcxml(raw_record)
+    except ValueError:
+        LOGGER.exception('Cannot mirror record without recid')
+        return None
+
+    return {'recid': prod_record.recid, 'marcxml': prod_record._marcxml}
+
+
+def bulk_insert_into_mirror(rows):
+    """Insert or update mirror rows in a single statement.
+
+    Updated records are marked as not migrated yet. The rows are compared by
+    the Legacy timestamp of their record, so that a revision which was
+    pushed late, or claimed by a slower worker, never replaces a newer one.
+    The mirror rows of the records are locked until the end of the
+    transaction, in the order of their recids, for the same reason.
+
+    Args:
+        rows(List[dict]): the ``recid`` and compressed ``marcxml`` of each
+            record. When a recid appears several times, the newest one wins,
+            or the last one among the equally new ones.
+    """
+    newest = {}
+    for row in rows:
+        version = LegacyRecordsMirror.get_legacy_version(zlib.decompress(row['marcxml']))
+        if row['recid'] not in newest or version >= newest[row['recid']][0]:
+            newest[row['recid']] = version, row
+
+    stored = LegacyRecordsMirror.query.filter(
+        LegacyRecordsMirror.recid.in_(list(newest))
+    ).order_by(LegacyRecordsMirror.recid).with_for_update().all()
+    for prod_record in stored:
+        if prod_record.legacy_version > newest[prod_record.recid][0]:
+            LOGGER.warning(
+                'Skipping record %s older than its mirror', prod_record.recid)
+            del newest[prod_record.recid]
+
+    rows = [newest[recid][1] for recid in sorted(newest)]
+    if not rows:
+        db.session.commit()
+        return
+
+    now = datetime.utcnow()
+    for row in rows:
+        row['valid'] = None
+        row['last_updated'] = now
+        row['collection'] = ''
+
+    statement = insert(LegacyRecordsMirror.__table__).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=['recid'],
+        set_={
+            'marcxml': statement.excluded.marcxml,
+            'valid': None,
+            'last_updated': now,
+        },
+    )
+    db.session.execute(statement)
+    db.session.commit()
 
 
 @shared_task(ignore_result=True)
 def continuous_migration(skip_files=None):
-    """Task to continuously migrate what is pushed up by Legacy."""
+    """Task to continuously migrate what is pushed up by Legacy.
+
+    The records are claimed from ``LegacyRecordsQueue`` in batches, each
+    migrated in a single transaction and indexed with a single bulk request,
+    and only acknowledged after that, so that several workers can drain the
+    queue in parallel without losing records. The visibility timeout of a
+    batch is extended after each of its records is migrated.
+
+    A batch which fails is released to be retried by the next run, which is
+    why the current run stops there. Once it failed too many times, its
+    records are moved to the dead-letter list of the queue, and the error is
+    stored on their mirror rows.
+    """
     if skip_files is None:
         skip_files = current_app.config.get(
             'RECORDS_MIGRATION_SKIP_FILES',
             False,
         )
-    redis_url = current_app.config.get('CACHE_REDIS_URL')
-    r = StrictRedis.from_url(redis_url)
-    lock = Lock(r, 'continuous_migration', expire=120, auto_renewal=True)
-    if lock.acquire(blocking=False):
+    queue = LegacyRecordsQueue()
+    requeued = queue.requeue_expired()
+    if requeued:
+        LOGGER.warning('Requeued %d expired batches of legacy records', requeued)
+
+    while True:
+        batch_key, raw_records = queue.claim(CHUNK_SIZE)
+        if not raw_records:
+            break
+
+        def heartbeat():
+            if not queue.extend(batch_key):
+                LOGGER.warning('Batch %s expired while being migrated', batch_key)
+
+        raw_records = [zlib.decompress(raw_record) for raw_record in raw_records]
         try:
-            while r.llen('legacy_records'):
-                raw_record = r.lrange('legacy_records', 0, 0)
-                if raw_record:
-                    migrate_and_insert_record(
-                        zlib.decompress(raw_record[0]),
-                        skip_files=skip_files,
-                    )
-                    db.session.commit()
-                r.lpop('legacy_records')
-        finally:
-            lock.release()
-    else:
-        LOGGER.info("Continuous_migration already executed. Skipping.")
+            migrate_and_insert_records(
+                raw_records,
+                skip_files=skip_files,
+                heartbeat=heartbeat,
+            )
+        except Exception as e:
+            db.session.rollback()
+            LOGGER.exception('Cannot migrate batch %s of legacy records', batch_key)
+            if queue.fail(batch_key):
+                LOGGER.error(
+                    'Moved batch %s of legacy records to %s after %d attempts',
+                    batch_key, queue.dead_key, queue.max_attempts,
+                )
+                _store_mirror_errors(raw_records, e)
+            break
+
+        queue.ack(batch_key)
+
+
+def _store_mirror_errors(raw_records, error):
+    """Store an error on the mirror rows of records which could not be migrated.
+
+    Only the rows still holding the same revision of the records are marked.
+    """
+    rows = []
+    versions = {}
+    for raw_record in raw_records:
+        row = _mirror_row_from_marcxml(raw_record)
+        if row:
+            rows.append(row)
+            version = LegacyRecordsMirror.get_legacy_version(raw_record)
+            versions[row['recid']] = max(versions.get(row['recid'], ''), version)
+    try:
+        bulk_insert_into_mirror(rows)
+        for prod_record in LegacyRecordsMirror.query.filter(
+            LegacyRecordsMirror.recid.in_(list(versions))
+        ):
+            if prod_record.legacy_version == versions[prod_record.recid]:
+                prod_record.error = error
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        LOGGER.exception('Cannot store the errors of legacy records %s', sorted(versions))
+
+
+def migrate_and_insert_records(raw_records, skip_files=False, heartbeat=None):
+    """Mirror and migrate several records in a single transaction.
+
+    When a record appears several times, only its newest version is
+    migrated. The mirror rows are locked while the records are migrated, so
+    that concurrent migrations of a record are applied in order. The
+    migrated records are indexed with a single bulk request.
+
+    Args:
+        raw_records(List[str]): the MARCXML of the records.
+        skip_files(bool): flag indicating whether the files in the records
+            metadata should be copied over from legacy.
+        heartbeat(Callable): called after each record is migrated.
+    """
+    rows = [row for row in map(_mirror_row_from_marcxml, raw_records) if row]
+    if not rows:
+        return
+    bulk_insert_into_mirror(rows)
+
+    prod_records = LegacyRecordsMirror.query.filter(
+        LegacyRecordsMirror.recid.in_([row['recid'] for row in rows])
+    ).order_by(LegacyRecordsMirror.recid).with_for_update().all()
+    with skip_indexing_receivers():
+        records = []
+        for prod_record in prod_records:
+            with db.session.begin_nested():
+                record = migrate_record_from_mirror(prod_record, skip_files=skip_files)
+                if record:
+                    records.append(record)
+            if heartbeat:
+                heartbeat()
+        index_queue = skip_paused_index_ops(create_index_ops(records))
+        db.session.commit()
+
+    req_timeout = current_app.config['INDEXER_BULK_REQUEST_TIMEOUT']
+    es_bulk(
+        es,
+        index_queue,
+        stats_only=True,
+        request_timeout=req_timeout,
+    )
+
+    track_index_ops(index_queue)
+
+    for record in records:
+        reindex_modified_citations(record.model)
 
 
 @shared_task(ignore_result=False, queue='migrator')
 @disable_orcid_push
 def migrate_recids_from_mirror(prod_recids, skip_files=False):
-    models_committed.disconnect(index_after_commit)
+    with skip_indexing_receivers():
+        records_to_index = []
+
+        for recid in prod_recids:
+            with db.session.begin_nested():
+                record = migrate_record_from_mirror(
+                    LegacyRecordsMirror.query.get(recid),
+                    skip_files=skip_files,
+                )
+                if record:
+                    records_to_index.append(record)
+        index_queue = create_index_ops(records_to_index)
+        db.session.commit()
+
+    req_timeout = current_app.config['INDEXER_BULK_REQUEST_TIMEOUT']
+    es_bulk(
+        es,
+        index_queue,
+        stats_only=True,
+        request_timeout=req_timeout,
+    )
 
-    index_queue = []
 
-    for recid in prod_recids:
-        with db.session.begin_nested():
-            record = migrate_record_from_mirror(
-                LegacyRecordsMirror.query.get(recid),
-                skip_files=skip_files,
-            )
-            if record:
-                index_queue.append(create_index_op(record))
-    db.session.commit()
+@shared_task(ignore_result=False, queue='migrator')
+@disable_orcid_push
+def bulk_migrate_recids_from_mirror(prod_recids):
+    """Migrate a chunk of records from the mirror in bulk.
+
+    See ``bulk_migrate_prod_records``.
+    """
+    bulk_migrate_prod_records(prod_recids)
+
+
+def bulk_migrate_prod_records(prod_recids, pool=None):
+    """Migrate a chunk of records from the mirror in bulk.
+
+    Unlike ``migrate_recids_from_mirror``, the records are not created or
+    updated one by one through ``InspireRecord``: the chunk is converted
+    and validated at once, the new pids are minted together, the records and
+    their versions are written in a single flush, and the whole chunk is
+    indexed with a single bulk request. The files of the records are not
+    migrated, as with ``skip_files``: their buckets are created the first
+    time their files are accessed, as for the records created by
+    ``InspireRecord.create_or_update``.
+
+    Deleted records, as well as the whole chunk if writing it fails, are
+    migrated one by one instead.
+
+    Args:
+        prod_recids(List[int]): the recids of the records to migrate.
+        pool(Optional[multiprocessing.Pool]): if passed, the records are
+            converted in this pool.
+    """
+    prod_records = LegacyRecordsMirror.query.filter(
+        LegacyRecordsMirror.recid.in_(prod_recids)
+    ).all()
+    marcxmls = [prod_record.marcxml for prod_record in prod_records]
+    if pool:
+        converted = pool.map(convert_marcxml, marcxmls)
+    else:
+        converted = [convert_marcxml(marcxml) for marcxml in marcxmls]
+
+    to_migrate = []
+    one_by_one = []
+    for prod_record, (json_record, error) in zip(prod_records, converted):
+        if error:
+            prod_record.error = error
+        elif json_record.get('deleted'):
+            one_by_one.append(prod_record)
+        else:
+            ensure_valid_schema(json_record)
+            to_migrate.append((prod_record, json_record))
+
+    with skip_indexing_receivers():
+        try:
+            with db.session.begin_nested():
+                records = _bulk_create_or_update(
+                    [json_record for _, json_record in to_migrate]
+                )
+        except Exception:
+            LOGGER.exception('Migrator Bulk Insert Error')
+            records = []
+            one_by_one.extend(prod_record for prod_record, _ in to_migrate)
+        else:
+            for prod_record, _ in to_migrate:
+                prod_record.valid = True
+
+        for prod_record in one_by_one:
+            with db.session.begin_nested():
+                record = migrate_record_from_mirror(prod_record, skip_files=True)
+                if record:
+                    records.append(record)
+
+        index_queue = skip_paused_index_ops(create_index_ops(records))
+        db.session.commit()
 
     req_timeout = current_app.config['INDEXER_BULK_REQUEST_TIMEOUT']
     es_bulk(
@@ -267,7 +650,109 @@ def migrate_recids_from_mirror(prod_recids, skip_files=False):
         request_timeout=req_timeout,
     )
 
-    models_committed.connect(index_after_commit)
+
+def convert_marcxml(marcxml):
+    """Convert and validate a MARCXML record.
+
+    This doesn't need an application context, so that it can run in a pool
+    of processes.
+
+    Returns:
+        Tuple[Optional[dict], Optional[str]]: the record, or the error which
+        prevented its migration.
+    """
+    try:
+        json_record = strip_empty_values(marcxml2record(marcxml))
+    except Exception as exc:
+        LOGGER.exception('Migrator DoJSON Error')
+        return None, format_error(exc)
+
+    try:
+        validate_with_cached_schema(json_record)
+    except ValidationError as exc:
+        pattern = u'Migrator Validator Error: {}, Value: %r, Record: %r'
+        LOGGER.error(pattern.format('.'.join(exc.schema_path)), exc.instance, json_record.get('control_number'))
+        return None, format_error(exc)
+    except Exception as exc:
+        LOGGER.exception('Migrator Record Insert Error')
+        return None, format_error(exc)
+
+    return json_record, None
+
+
+def _bulk_create_or_update(json_records):
+    """Write records and mint their pids with as few queries as possible.
+
+    The receivers enriching the records before they are written and the
+    citations table are run as ``InspireRecord.create_or_update`` would.
+
+    Returns:
+        List[InspireRecord]: the records written.
+    """
+    pids = [
+        (get_pid_type_from_schema(json_record['$schema']), str(json_record['control_number']))
+        for json_record in json_records
+    ]
+    if not pids:
+        return []
+
+    existing_uuids = dict(
+        ((pid_type, pid_value), object_uuid)
+        for pid_type, pid_value, object_uuid in db.session.query(
+            PersistentIdentifier.pid_type,
+            PersistentIdentifier.pid_value,
+            PersistentIdentifier.object_uuid,
+        ).filter(
+            tuple_(PersistentIdentifier.pid_type, PersistentIdentifier.pid_value).in_(pids),
+            PersistentIdentifier.object_type == 'rec',
+            PersistentIdentifier.status == PIDStatus.REGISTERED,
+        )
+    )
+    existing_models = {
+        model.id: model for model in RecordMetadata.query.filter(
+            RecordMetadata.id.in_(list(existing_uuids.values()))
+        )
+    } if existing_uuids else {}
+
+    records = []
+    new_pids = []
+    for pid, json_record in zip(pids, json_records):
+        assign_phonetic_block(None, json_record)
+        assign_uuid(None, json_record)
+
+        if pid in existing_uuids:
+            model = existing_models[existing_uuids[pid]]
+            model.json = json_record
+        else:
+            model = RecordMetadata(id=uuid.uuid4(), json=json_record)
+            db.session.add(model)
+            new_pids.append({
+                'pid_type': pid[0],
+                'pid_value': pid[1],
+                'object_type': 'rec',
+                'object_uuid': model.id,
+                'status': PIDStatus.REGISTERED,
+            })
+
+        if json_record.get('legacy_creation_date'):
+            model.created = datetime.strptime(json_record['legacy_creation_date'], '%Y-%m-%d')
+        records.append(InspireRecord(json_record, model=model))
+
+    if new_pids:
+        db.session.bulk_insert_mappings(
+            RecordIdentifier,
+            [{'recid': int(pid['pid_value'])} for pid in new_pids],
+        )
+        db.session.bulk_insert_mappings(PersistentIdentifier, new_pids)
+    db.session.flush()
+
+    for record in records:
+        record.update_citations()
+        record.update_authors()
+
+    PidCache().invalidate(pids=[(pid['pid_type'], pid['pid_value']) for pid in new_pids])
+
+    return records
 
 
 def _build_recid_to_uuid_map(citations_lookup):
@@ -283,13 +768,6 @@ def _build_recid_to_uuid_map(citations_lookup):
         }
 
 
-def insert_into_mirror(raw_records):
-    for raw_record in raw_records:
-        prod_record = LegacyRecordsMirror.from_marcxml(raw_record)
-        db.session.merge(prod_record)
-    db.session.commit()
-
-
 def migrate_and_insert_record(raw_record, skip_files=False):
     """Migrate a record and insert it if valid, or log otherwise."""
     prod_record = LegacyRecordsMirror.from_marcxml(raw_record)
@@ -46,21 +46,41 @@ from .putcode_getter import OrcidPutcodeGetter
 logger = logging.getLogger(__name__)
 
 
+def get_orcid_lock_name(orcid):
+    return 'orcid:{}'.format(orcid)
+
+
 class OrcidPusher(object):
-    def __init__(self, orcid, recid, oauth_token):
+    def __init__(self, orcid, recid, oauth_token, inspire_record=None, use_lock=True):
+        """Push a Literature record to ORCID.
+
+        Args:
+            orcid (string): the ORCID to push to.
+            recid (int): the recid of the record.
+            oauth_token (string): the token of the ORCID.
+            inspire_record (Optional[dict]): the record, if it was already
+                fetched from the DB, e.g. with the other records of a batch.
+            use_lock (bool): if ``False``, the POSTs and PUTs are not
+                serialized with the lock of the ORCID, as the caller already
+                holds it.
+        """
         self.orcid = orcid
         self.recid = recid
         self.oauth_token = oauth_token
 
-        try:
-            self.inspire_record = get_db_record('lit', recid)
-        except RecordGetterError as exc:
-            raise exceptions.RecordNotFoundException(
-                'recid={} not found for pid_type=lit'.format(self.recid),
-                from_exc=exc)
+        if inspire_record is not None:
+            self.inspire_record = inspire_record
+        else:
+            try:
+                self.inspire_record = get_db_record('lit', recid)
+            except RecordGetterError as exc:
+                raise exceptions.RecordNotFoundException(
+                    'recid={} not found for pid_type=lit'.format(self.recid),
+                    from_exc=exc)
 
         self.cache = OrcidCache(orcid, recid)
-        self.lock_name = 'orcid:{}'.format(self.orcid)
+        self.lock_name = get_orcid_lock_name(self.orcid)
+        self.use_lock = use_lock
         self.client = OrcidClient(self.oauth_token, self.orcid)
         self.xml_element = None
 
@@ -101,11 +121,11 @@ class OrcidPusher(object):
 
         # ORCID API allows 1 POST/PUT only for the same orcid at the same time.
         # Using `distributed_lock` to achieve this.
-        with distributed_lock(self.lock_name, blocking=True):
-            if putcode:
-                response = self.client.put_updated_work(self.xml_element, putcode)
-            else:
-                response = self.client.post_new_work(self.xml_element)
+        if self.use_lock:
+            with distributed_lock(self.lock_name, blocking=True):
+                response = self._send_work(putcode)
+        else:
+            response = self._send_work(putcode)
 
         utils.log_service_response(logger, response, 'in OrcidPusher for recid={}'.format(self.recid))
         try:
@@ -117,6 +137,11 @@ class OrcidPusher(object):
             raise exceptions.InputDataInvalidException(from_exc=exc)
         return putcode
 
+    def _send_work(self, putcode=None):
+        if putcode:
+            return self.client.put_updated_work(self.xml_element, putcode)
+        return self.client.post_new_work(self.xml_element)
+
     @time_execution
     def _cache_all_author_putcodes(self):
         logger.info('New OrcidPusher cache all author putcodes for orcid={}'.format(self.orcid))
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Coalescing queue of the works to push to each ORCID."""
+
+from __future__ import absolute_import, division, print_function
+
+import flask
+from flask import current_app as app
+from redis import StrictRedis
+
+
+class OrcidPushQueue(object):
+    """Redis sets of the recids of the works to push to each ORCID.
+
+    The recids pushed for the same ORCID within the same time window are
+    deduplicated and pushed together by one ``orcid_push_batch`` task, so
+    that the works of an author are not pushed by concurrent tasks competing
+    for the lock of the ORCID.
+    """
+    key = 'orcid_push_queue:{}'
+    scheduled_key = 'orcid_push_queue:{}:scheduled'
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    def push(self, orcid, recids, window):
+        """Add the recids of works to push to an ORCID.
+
+        Args:
+            orcid (str): the ORCID.
+            recids (List[int]): recids of the Literature records to push.
+            window (int): number of seconds after which the works are
+                pushed.
+
+        Returns:
+            bool: ``True`` if no push is scheduled for the current window of
+            the ORCID, in which case the caller is responsible for
+            scheduling it.
+        """
+        with self.redis.pipeline() as pipe:
+            pipe.sadd(self.key.format(orcid), *recids)
+            pipe.set(self.scheduled_key.format(orcid), 1, nx=True, ex=max(window, 1))
+            _, needs_push = pipe.execute()
+
+        return bool(needs_push)
+
+    def pop_all(self, orcid):
+        """Atomically remove all the recids queued for an ORCID and return them.
+
+        This also closes the current window of the ORCID, so that the next
+        push schedules a new batch.
+        """
+        with self.redis.pipeline() as pipe:
+            pipe.smembers(self.key.format(orcid))
+            pipe.delete(self.key.format(orcid))
+            pipe.delete(self.scheduled_key.format(orcid))
+            recids, _, _ = pipe.execute()
+
+        return sorted(int(recid) for recid in recids)
+
+    def depth(self, orcid):
+        """Return the number of recids queued for an ORCID."""
+        return self.redis.scard(self.key.format(orcid))
@@ -43,8 +43,11 @@ from invenio_oauthclient.errors import AlreadyLinkedError
 from inspire_utils.logging import getStackTraceLogger
 from inspire_utils.record import get_value
 from inspirehep.modules.orcid.utils import get_literature_recids_for_orcid
+from inspirehep.utils.lock import distributed_lock
+from inspirehep.utils.record_getter import get_db_records
 
 from . import domain_models
+from .queue import OrcidPushQueue
 
 
 LOGGER = getStackTraceLogger(__name__)
@@ -213,21 +216,134 @@ def import_legacy_orcid_tokens(self):
                     orcid_to_push
                 )
                 recids = get_literature_recids_for_orcid(orcid_to_push)
-                for recid in recids:
-                    orcid_push.apply_async(
-                        queue='orcid_push_legacy_tokens',
-                        kwargs={
-                            'orcid': orcid_to_push,
-                            'rec_id': recid,
-                            'oauth_token': token,
-                        },
-                    )
+                schedule_orcid_push(
+                    orcid_to_push,
+                    recids,
+                    token,
+                    queue='orcid_push_legacy_tokens',
+                )
         except SQLAlchemyError as ex:
             LOGGER.exception(ex)
 
     db.session.commit()
 
 
+def _is_orcid_push_enabled(orcid):
+    if not current_app.config['FEATURE_FLAG_ENABLE_ORCID_PUSH']:
+        LOGGER.warning('ORCID push feature flag not enabled')
+        return False
+
+    if not re.match(current_app.config.get(
+            'FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX', '^$'), orcid):
+        LOGGER.warning('ORCID push not enabled for orcid={}'.format(orcid))
+        return False
+
+    return True
+
+
+def schedule_orcid_push(orcid, recids, oauth_token, queue='orcid_push'):
+    """Queue the push of works to an ORCID.
+
+    The works queued for the same ORCID within ``ORCID_PUSH_BATCH_WINDOW``
+    seconds are pushed together by one ``orcid_push_batch`` task.
+
+    Args:
+        orcid(string): an orcid identifier.
+        recids(List[int]): inspire records' ids to push to ORCID.
+        oauth_token(string): orcid token.
+        queue(string): the Celery queue of the task.
+    """
+    if not recids:
+        return
+
+    window = current_app.config['ORCID_PUSH_BATCH_WINDOW']
+    if OrcidPushQueue().push(orcid, recids, window):
+        orcid_push_batch.apply_async(
+            queue=queue,
+            kwargs={
+                'orcid': orcid,
+                'oauth_token': oauth_token,
+            },
+            countdown=window,
+        )
+
+
+@shared_task(bind=True, max_retries=3)
+@time_execution
+def orcid_push_batch(self, orcid, oauth_token):
+    """Celery task to push to ORCID all the works queued for it.
+
+    The records are fetched from the DB at once, and the works are pushed by
+    batches of ``ORCID_PUSH_BATCH_SIZE``, each holding the lock of the ORCID
+    for all its POSTs and PUTs. The works whose push failed because of a
+    network issue, as well as all the works not pushed yet when the task
+    fails for another reason, are queued again, and retried with the task,
+    and they are dropped with an error once the retries are exhausted.
+
+    Args:
+        self(celery.Task): the task
+        orcid(string): an orcid identifier.
+        oauth_token(string): orcid token.
+    """
+    queue = OrcidPushQueue()
+    recids = queue.pop_all(orcid)
+    if not recids or not _is_orcid_push_enabled(orcid):
+        return
+
+    LOGGER.info('New orcid_push_batch task for {} recids and orcid={}'.format(len(recids), orcid))
+    done = set()
+    failed_recids = []
+    try:
+        records = {
+            record['control_number']: record
+            for record in get_db_records(('lit', recid) for recid in recids)
+        }
+
+        batch_size = current_app.config['ORCID_PUSH_BATCH_SIZE']
+        for start in range(0, len(recids), batch_size):
+            with distributed_lock(domain_models.get_orcid_lock_name(orcid), blocking=True):
+                for recid in recids[start:start + batch_size]:
+                    done.add(recid)
+                    if recid not in records:
+                        LOGGER.error('Orcid_push_batch task for orcid={}: recid={} not found'.format(orcid, recid))
+                        continue
+
+                    pusher = domain_models.OrcidPusher(
+                        orcid, recid, oauth_token,
+                        inspire_record=records[recid],
+                        use_lock=False,
+                    )
+                    try:
+                        pusher.push()
+                    except RequestException:
+                        LOGGER.exception(
+                            'Orcid_push_batch task for recid={} and orcid={} raised a'
+                            ' RequestException. Retrying soon. Exception={}'.format(
+                                recid, orcid, traceback.format_exc()))
+                        failed_recids.append(recid)
+                    except Exception:
+                        LOGGER.exception(
+                            'Orcid_push_batch task for recid={} and orcid={} failed'
+                            ' raising the exception={}'.format(
+                                recid, orcid, traceback.format_exc()))
+    except Exception:
+        LOGGER.exception(
+            'Orcid_push_batch task for orcid={} failed, retrying the works not'
+            ' pushed yet. Exception={}'.format(orcid, traceback.format_exc()))
+        failed_recids.extend(recid for recid in recids if recid not in done)
+
+    LOGGER.info('Orcid_push_batch task for orcid={} completed, {} of {} works failed'.format(
+        orcid, len(failed_recids), len(recids)))
+
+    if failed_recids:
+        if self.request.retries >= self.max_retries:
+            LOGGER.error('Orcid_push_batch task for orcid={} gave up after {} retries,'
+                         ' dropping recids={}'.format(orcid, self.max_retries, failed_recids))
+            return
+        queue.push(orcid, failed_recids, 300)
+        raise self.retry(countdown=300)
+
+
 @shared_task(bind=True)
 @time_execution
 def orcid_push(self, orcid, rec_id, oauth_token):
@@ -239,13 +355,7 @@ def orcid_push(self, orcid, rec_id, oauth_token):
         rec_id(int): inspire record's id to push to ORCID.
         oauth_token(string): orcid token.
     """
-    if not current_app.config['FEATURE_FLAG_ENABLE_ORCID_PUSH']:
-        LOGGER.warning('ORCID push feature flag not enabled')
-        return
-
-    if not re.match(current_app.config.get(
-            'FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX', '^$'), orcid):
-        LOGGER.warning('ORCID push not enabled for orcid={}'.format(orcid))
+    if not _is_orcid_push_enabled(orcid):
         return
 
     LOGGER.info('New orcid_push task for recid={} and orcid={}'.format(rec_id, orcid))
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Cache of the resolution between pids and record uuids."""
+
+from __future__ import absolute_import, division, print_function
+
+import flask
+from flask import current_app as app
+from redis import StrictRedis
+from sqlalchemy import tuple_
+
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+
+from inspirehep.utils.cache import LRUCache
+
+
+PENDING_KEY = 'pidstore_cache_pending'
+WRITTEN_KEY = 'pidstore_cache_written'
+
+
+def _pid_key(pid_type, pid_value):
+    return '{}:{}'.format(pid_type, pid_value)
+
+
+def _split_pid_key(pid_key):
+    pid_type, pid_value = pid_key.split(':', 1)
+    return pid_type, pid_value
+
+
+class PidCache(object):
+    """Resolve pids of records to uuids and back.
+
+    Only registered pids of records are cached. Lookups go first through an
+    LRU local to the process, then through Redis keys shared between
+    processes, one per pid and one per uuid, and the pids missing from both
+    are loaded from the DB in one query.
+
+    ``invalidate`` deletes the Redis keys and clears the LRU of the current
+    process. The LRUs of the other processes only keep their items for
+    ``INSPIRE_PID_CACHE_TTL`` seconds, which bounds how long they can return
+    a pid which was redirected or deleted in the meantime. A process which
+    loaded a pid from the DB before it was changed can still write the old
+    mapping to Redis after the invalidation, so the Redis keys also expire
+    after ``INSPIRE_PID_CACHE_REDIS_TTL`` seconds.
+
+    The pids loaded from the DB while the current transaction has written
+    to it may not be committed yet, so they are only cached when the
+    transaction is committed, and dropped if it is rolled back.
+    """
+    pid_to_uuid_key = 'pidstore:pid_to_uuid:{}'
+    uuid_to_pid_key = 'pidstore:uuid_to_pid:{}'
+
+    _local = None
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    @property
+    def local(self):
+        if PidCache._local is None:
+            PidCache._local = LRUCache(
+                app.config['INSPIRE_PID_CACHE_SIZE'],
+                ttl=app.config['INSPIRE_PID_CACHE_TTL'],
+            )
+        return PidCache._local
+
+    def get_uuids(self, pids):
+        """Get the uuids of the records of several pids.
+
+        Args:
+            pids (Iterable[Tuple[str, Union[str, int]]]): the
+                (pid_type, pid_value) to resolve.
+
+        Returns:
+            dict: mapping from the (pid_type, pid_value) of the registered
+            pids, with the value as a string, to the uuid of their record.
+        """
+        pid_keys = set(_pid_key(pid_type, pid_value) for pid_type, pid_value in pids)
+        uuids = self._get_many(pid_keys, self.pid_to_uuid_key, self._load_uuids)
+
+        return {_split_pid_key(pid_key): uuid for pid_key, uuid in uuids.items()}
+
+    def get_uuid(self, pid_type, pid_value):
+        """Get the uuid of the record of a pid.
+
+        Raises:
+            PIDDoesNotExistError: if the pid does not exist.
+        """
+        uuid = self.get_uuids([(pid_type, pid_value)]).get((pid_type, str(pid_value)))
+        if uuid is None:
+            uuid = str(PersistentIdentifier.get(pid_type, pid_value).object_uuid)
+
+        return uuid
+
+    def get_pids(self, uuids):
+        """Get the registered pids of several records.
+
+        Returns:
+            dict: mapping from the uuids to the (pid_type, pid_value) of
+            their record.
+        """
+        uuids = set(str(uuid) for uuid in uuids)
+        pid_keys = self._get_many(uuids, self.uuid_to_pid_key, self._load_pids)
+
+        return {uuid: _split_pid_key(pid_key) for uuid, pid_key in pid_keys.items()}
+
+    def get_pid(self, uuid):
+        """Get the pid of a record.
+
+        Raises:
+            NoResultFound: if the record has no pid.
+        """
+        pid = self.get_pids([uuid]).get(str(uuid))
+        if pid is None:
+            pid = PersistentIdentifier.query.filter_by(object_uuid=uuid).one()
+            pid = (pid.pid_type, pid.pid_value)
+
+        return pid
+
+    def invalidate(self, pids=(), uuids=()):
+        """Remove pids and records from the cache, together with their pair."""
+        pid_keys = set(_pid_key(pid_type, pid_value) for pid_type, pid_value in pids)
+        uuids = set(str(uuid) for uuid in uuids)
+        if not pid_keys and not uuids:
+            return
+
+        if pid_keys:
+            cached_uuids = self.redis.mget(self._redis_keys(self.pid_to_uuid_key, pid_keys))
+            uuids.update(_to_text(uuid) for uuid in cached_uuids if uuid)
+        if uuids:
+            cached_pid_keys = self.redis.mget(self._redis_keys(self.uuid_to_pid_key, uuids))
+            pid_keys.update(_to_text(pid_key) for pid_key in cached_pid_keys if pid_key)
+
+        self.redis.delete(
+            *(self._redis_keys(self.pid_to_uuid_key, pid_keys) +
+              self._redis_keys(self.uuid_to_pid_key, uuids))
+        )
+
+        for key in pid_keys | uuids:
+            self.local.pop(key)
+
+        pending = db.session.info.get(PENDING_KEY)
+        if pending:
+            pending[:] = [
+                (pid_key, uuid) for pid_key, uuid in pending
+                if pid_key not in pid_keys and uuid not in uuids
+            ]
+
+    def clear(self):
+        for redis_key in (self.pid_to_uuid_key, self.uuid_to_pid_key):
+            keys = list(self.redis.scan_iter(redis_key.format('*')))
+            if keys:
+                self.redis.delete(*keys)
+        self.local.clear()
+
+    @staticmethod
+    def _redis_keys(redis_key, keys):
+        return [redis_key.format(key) for key in keys]
+
+    def _get_many(self, keys, redis_key, load):
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing:
+            values = self.redis.mget(self._redis_keys(redis_key, missing))
+            for key, value in zip(missing, values):
+                if value is not None:
+                    found[key] = self.local[key] = _to_text(value)
+            missing = [key for key, value in zip(missing, values) if value is None]
+
+        if missing:
+            loaded = load(missing)
+            if db.session.info.get(WRITTEN_KEY):
+                db.session.info.setdefault(PENDING_KEY, []).extend(loaded)
+            else:
+                self._cache(loaded)
+            for pid_key, uuid in loaded:
+                if redis_key == self.pid_to_uuid_key:
+                    found[pid_key] = uuid
+                else:
+                    found[uuid] = pid_key
+
+        return found
+
+    def _cache(self, loaded):
+        if loaded:
+            ttl = app.config['INSPIRE_PID_CACHE_REDIS_TTL']
+            with self.redis.pipeline() as pipe:
+                for pid_key, uuid in loaded:
+                    pipe.setex(self.pid_to_uuid_key.format(pid_key), ttl, uuid)
+                    pipe.setex(self.uuid_to_pid_key.format(uuid), ttl, pid_key)
+                pipe.execute()
+        for pid_key, uuid in loaded:
+            self.local[pid_key] = uuid
+            self.local[uuid] = pid_key
+
+    def _load_uuids(self, pid_keys):
+        query = self._query_registered().filter(
+            tuple_(PersistentIdentifier.pid_type, PersistentIdentifier.pid_value).in_(
+                [_split_pid_key(pid_key) for pid_key in pid_keys]
+            )
+        )
+        return [(_pid_key(pid_type, pid_value), str(uuid)) for pid_type, pid_value, uuid in query]
+
+    def _load_pids(self, uuids):
+        query = self._query_registered().filter(
+            PersistentIdentifier.object_uuid.in_(uuids)
+        )
+        return [(_pid_key(pid_type, pid_value), str(uuid)) for pid_type, pid_value, uuid in query]
+
+    @staticmethod
+    def _query_registered():
+        return PersistentIdentifier.query.with_entities(
+            PersistentIdentifier.pid_type,
+            PersistentIdentifier.pid_value,
+            PersistentIdentifier.object_uuid,
+        ).filter(
+            PersistentIdentifier.object_type == 'rec',
+            PersistentIdentifier.status == PIDStatus.REGISTERED,
+        )
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def _mark_written(session, flush_context):
+    session.info[WRITTEN_KEY] = True
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def _cache_pending(session):
+    if session.transaction.nested:
+        return
+    PidCache()._cache(session.info.pop(PENDING_KEY, []))
+
+
+@db.event.listens_for(db.session, 'after_rollback')
+def _drop_pending(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+@db.event.listens_for(db.session, 'after_transaction_end')
+def _reset_written(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(WRITTEN_KEY, None)
+        session.info.pop(PENDING_KEY, None)
+
+
+def _to_text(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return value
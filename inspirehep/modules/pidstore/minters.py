@@ -24,6 +24,9 @@
 
 from __future__ import absolute_import, division, print_function
 
+from collections import defaultdict
+
+from .cache import PidCache
 from .providers.recid import InspireRecordIdProvider
 from .utils import get_pid_type_from_schema
 
@@ -40,4 +43,45 @@ def inspire_recid_minter(record_uuid, data):
         args['pid_value'] = data['control_number']
     provider = InspireRecordIdProvider.create(**args)
     data['control_number'] = provider.pid.pid_value
+    PidCache().invalidate(
+        pids=[(provider.pid.pid_type, provider.pid.pid_value)],
+        uuids=[record_uuid],
+    )
     return provider.pid
+
+
+def inspire_recid_minter_many(records):
+    """Mint record identifiers for several records at once.
+
+    The records without a ``control_number`` get their identifiers with one
+    call to ``InspireRecordIdProvider.create_many`` per pid type.
+
+    Args:
+        records (List[Tuple[str, dict]]): the uuid and the data of each
+            record.
+
+    Returns:
+        List[PersistentIdentifier]: the pids, in the order of ``records``.
+    """
+    pids = [None] * len(records)
+    to_create = defaultdict(list)
+    for index, (record_uuid, data) in enumerate(records):
+        if 'control_number' in data:
+            pids[index] = inspire_recid_minter(record_uuid, data)
+        else:
+            assert '$schema' in data
+            to_create[get_pid_type_from_schema(data['$schema'])].append(index)
+
+    for pid_type, indices in to_create.items():
+        providers = InspireRecordIdProvider.create_many(
+            pid_type, [records[index][0] for index in indices])
+        for index, provider in zip(indices, providers):
+            records[index][1]['control_number'] = provider.pid.pid_value
+            pids[index] = provider.pid
+
+    created = [index for indices in to_create.values() for index in indices]
+    PidCache().invalidate(
+        pids=[(pids[index].pid_type, pids[index].pid_value) for index in created],
+        uuids=[records[index][0] for index in created],
+    )
+    return pids
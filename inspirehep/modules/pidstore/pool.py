@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Pool of record identifiers reserved in advance."""
+
+from __future__ import absolute_import, division, print_function
+
+import flask
+import requests
+from flask import current_app as app
+from redis import StrictRedis
+from sqlalchemy.exc import IntegrityError
+
+from invenio_db import db
+from invenio_pidstore.models import RecordIdentifier
+
+RESERVE_FROM_SEQUENCE = """
+INSERT INTO pidstore_recid (recid)
+SELECT nextval(pg_get_serial_sequence('pidstore_recid', 'recid'))
+FROM generate_series(1, :count)
+RETURNING recid
+"""
+
+
+def _get_next_pids_from_legacy(count):
+    """Reserve the next ``count`` pids on legacy.
+
+    Legacy reserves one identifier per request, so the requests are sent
+    over the same connection.
+    """
+    headers = {
+        'User-Agent': 'invenio_webupload'
+    }
+
+    url = app.config.get('LEGACY_PID_PROVIDER')
+    with requests.Session() as session:
+        return [session.get(url, headers=headers).json() for _ in range(count)]
+
+
+def reserve_recids(count):
+    """Reserve new record identifiers.
+
+    The identifiers are taken from legacy if ``LEGACY_PID_PROVIDER`` is set,
+    else from the sequence of ``RecordIdentifier``, in one statement on
+    PostgreSQL. They are inserted in the ``RecordIdentifier`` table right
+    away, so that they can't be reserved twice.
+
+    Args:
+        count (int): number of identifiers to reserve.
+
+    Returns:
+        List[int]: the reserved identifiers.
+    """
+    if count <= 0:
+        return []
+
+    if app.config.get('LEGACY_PID_PROVIDER'):
+        recids = [int(recid) for recid in _get_next_pids_from_legacy(count)]
+        with db.session.begin_nested():
+            db.session.execute(
+                RecordIdentifier.__table__.insert(),
+                [{'recid': recid} for recid in recids],
+            )
+        return recids
+
+    if db.engine.dialect.name == 'postgresql':
+        try:
+            with db.session.begin_nested():
+                rows = db.session.execute(RESERVE_FROM_SEQUENCE, {'count': count})
+                return sorted(row[0] for row in rows)
+        except IntegrityError:
+            # The sequence is behind identifiers inserted explicitly, e.g. by
+            # the migrator, fix it like ``RecordIdentifier.next`` does.
+            with db.session.begin_nested():
+                RecordIdentifier._set_sequence(RecordIdentifier.max())
+                rows = db.session.execute(RESERVE_FROM_SEQUENCE, {'count': count})
+                return sorted(row[0] for row in rows)
+
+    return [RecordIdentifier.next() for _ in range(count)]
+
+
+class RecidPool(object):
+    """Redis list of record identifiers reserved in advance.
+
+    The identifiers are reserved in blocks by ``refill_recid_pool``, and
+    popped by the processes minting new records, so that minting does not
+    have to wait for legacy or for the DB sequence. Legacy and the DB
+    sequence have pools of their own, so that switching between them never
+    hands out an identifier of the other.
+    """
+    key = 'pidstore:recid_pool:{}'
+    refilling_key = 'pidstore:recid_pool:{}:refilling'
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    @property
+    def source(self):
+        return 'legacy' if app.config.get('LEGACY_PID_PROVIDER') else 'db'
+
+    def pop(self, count):
+        """Atomically remove up to ``count`` identifiers from the pool.
+
+        Returns:
+            Tuple[List[int], int]: the identifiers removed, and the number
+            of identifiers left in the pool.
+        """
+        key = self.key.format(self.source)
+        with self.redis.pipeline() as pipe:
+            pipe.lrange(key, 0, count - 1)
+            pipe.ltrim(key, count, -1)
+            pipe.llen(key)
+            recids, _, left = pipe.execute()
+
+        return [int(recid) for recid in recids], left
+
+    def push(self, recids):
+        """Add reserved identifiers to the pool."""
+        if recids:
+            self.redis.rpush(self.key.format(self.source), *recids)
+
+    def size(self):
+        """Return the number of identifiers in the pool."""
+        return self.redis.llen(self.key.format(self.source))
+
+    def start_refill(self, timeout):
+        """Mark the pool as being refilled.
+
+        Returns:
+            bool: ``True`` if no refill was started in the last ``timeout``
+            seconds, in which case the caller is responsible for it.
+        """
+        started = self.redis.set(
+            self.refilling_key.format(self.source), 1, nx=True, ex=timeout)
+        return bool(started)
+
+    def finish_refill(self):
+        """Mark the refill of the pool as done."""
+        self.redis.delete(self.refilling_key.format(self.source))
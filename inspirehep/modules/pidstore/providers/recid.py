@@ -24,27 +24,43 @@
 
 from __future__ import absolute_import, division, print_function
 
-import requests
 from flask import current_app
 
 from invenio_pidstore.models import PIDStatus, RecordIdentifier
 from invenio_pidstore.providers.base import BaseProvider
 
+from inspirehep.modules.pidstore.pool import RecidPool, reserve_recids
+from inspirehep.modules.pidstore.tasks import refill_recid_pool
 
-def _get_next_pid_from_legacy():
-    """Reserve the next pid on legacy.
 
-    Sends a request to a legacy instance to reserve the next available
-    identifier, and returns it to the caller.
+def take_recids(count):
+    """Take new record identifiers for minting.
+
+    If ``INSPIRE_RECID_POOL_SIZE`` is set, the identifiers are taken from the
+    ``RecidPool``, which is refilled in the background once it is less than
+    half full, and only the identifiers missing from the pool are reserved
+    on the spot. Otherwise, they are all reserved on the spot.
+
+    Args:
+        count (int): number of identifiers to take.
+
+    Returns:
+        List[int]: identifiers reserved in the ``RecordIdentifier`` table.
     """
-    headers = {
-        'User-Agent': 'invenio_webupload'
-    }
+    pool_size = current_app.config['INSPIRE_RECID_POOL_SIZE']
+    if not pool_size:
+        return reserve_recids(count)
 
-    url = current_app.config.get('LEGACY_PID_PROVIDER')
-    next_pid = requests.get(url, headers=headers).json()
+    pool = RecidPool()
+    recids, left = pool.pop(count)
+    recids.extend(reserve_recids(count - len(recids)))
 
-    return next_pid
+    if left < pool_size // 2 and pool.start_refill(
+        current_app.config['INSPIRE_RECID_POOL_REFILL_TIMEOUT']
+    ):
+        refill_recid_pool.delay()
+
+    return recids
 
 
 class InspireRecordIdProvider(BaseProvider):
@@ -67,11 +83,7 @@ class InspireRecordIdProvider(BaseProvider):
         """Create a new record identifier."""
         # Request next integer in recid sequence.
         if 'pid_value' not in kwargs:
-            if current_app.config.get('LEGACY_PID_PROVIDER'):
-                kwargs['pid_value'] = _get_next_pid_from_legacy()
-                RecordIdentifier.insert(kwargs['pid_value'])
-            else:
-                kwargs['pid_value'] = RecordIdentifier.next()
+            kwargs['pid_value'] = take_recids(1)[0]
         else:
             RecordIdentifier.insert(kwargs['pid_value'])
 
@@ -80,3 +92,26 @@ class InspireRecordIdProvider(BaseProvider):
             kwargs['status'] = PIDStatus.REGISTERED
         return super(InspireRecordIdProvider, cls).create(
             object_type=object_type, object_uuid=object_uuid, **kwargs)
+
+    @classmethod
+    def create_many(cls, pid_type, object_uuids):
+        """Create new record identifiers for several records at once.
+
+        Args:
+            pid_type (str): type of the identifiers.
+            object_uuids (List[str]): uuids of the records.
+
+        Returns:
+            List[InspireRecordIdProvider]: the providers, in the order of
+            ``object_uuids``.
+        """
+        recids = take_recids(len(object_uuids))
+        return [
+            super(InspireRecordIdProvider, cls).create(
+                object_type='rec',
+                object_uuid=object_uuid,
+                pid_type=pid_type,
+                pid_value=recid,
+                status=PIDStatus.REGISTERED,
+            ) for object_uuid, recid in zip(object_uuids, recids)
+        ]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Pidstore tasks."""
+
+from __future__ import absolute_import, division, print_function
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from flask import current_app
+from time_execution.decorator import write_metric
+
+from invenio_db import db
+
+from inspirehep.modules.pidstore.pool import RecidPool, reserve_recids
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(ignore_result=True)
+def refill_recid_pool():
+    """Reserve record identifiers until the pool is full.
+
+    This task is scheduled by ``take_recids`` when the pool runs low. The
+    identifiers are reserved in blocks of ``INSPIRE_RECID_POOL_BLOCK_SIZE``,
+    each committed before being added to the pool.
+    """
+    pool = RecidPool()
+    pool_size = current_app.config['INSPIRE_RECID_POOL_SIZE']
+    block_size = current_app.config['INSPIRE_RECID_POOL_BLOCK_SIZE']
+
+    try:
+        missing = pool_size - pool.size()
+        while missing > 0:
+            recids = reserve_recids(min(missing, block_size))
+            db.session.commit()
+            pool.push(recids)
+            missing -= len(recids)
+    finally:
+        pool.finish_refill()
+
+    size = pool.size()
+    write_metric('recid_pool', size=size)
+    logger.info('Refilled the %s recid pool to %d recids', pool.source, size)
@@ -37,18 +37,30 @@ from invenio_records.api import RecordMetadata
 from inspire_dojson.utils import get_recid_from_ref, strip_empty_values, absolute_url
 from inspire_schemas.api import validate
 from inspire_schemas.builders import LiteratureBuilder
+from inspire_utils.record import get_value
 from invenio_files_rest.models import Bucket
 from invenio_pidstore.errors import PIDDoesNotExistError
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_records_files.api import Record
 from invenio_db import db
-from sqlalchemy import Text, or_, not_, cast, type_coerce
-from sqlalchemy.dialects.postgresql import JSONB, ARRAY
+from sqlalchemy import Text, or_, not_, cast, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, insert
 from sqlalchemy.sql.functions import GenericFunction
 
+from inspirehep.modules.pidstore.cache import PidCache
 from inspirehep.modules.pidstore.minters import inspire_recid_minter
 from inspirehep.modules.pidstore.utils import get_pid_type_from_schema, get_endpoint_from_pid_type
-from inspirehep.modules.records.utils import get_pid_from_record_uri, populate_earliest_date
+from inspirehep.modules.records.models import (
+    RecordAuthors,
+    RecordCitations,
+    RecordCitationsCount,
+)
+from inspirehep.modules.records.utils import (
+    get_pid_from_record,
+    get_pid_from_record_uri,
+    is_hep,
+    populate_earliest_date,
+)
 from inspirehep.utils.record_getter import (
     RecordGetterError,
     get_es_record_by_uuid
@@ -221,6 +233,11 @@ class InspireRecord(Record):
                 pid.redirect(pid_merged)
                 db.session.add(pid)
 
+        PidCache().invalidate(
+            pids=[(pid.pid_type, pid.pid_value) for pid in pids_deleted],
+            uuids=[self.id],
+        )
+
     def delete(self):
         """Mark as deleted all pidstores for a specific record."""
 
@@ -233,9 +250,15 @@ class InspireRecord(Record):
                 pid.delete()
                 db.session.add(pid)
 
+        PidCache().invalidate(
+            pids=[(pid.pid_type, pid.pid_value) for pid in pids],
+            uuids=[self.id],
+        )
         self['deleted'] = True
 
     def _delete(self, *args, **kwargs):
+        self._update_citations_table(set())
+        self._update_authors_table({})
         super(InspireRecord, self).delete(*args, **kwargs)
 
     def _create_bucket(self, location=None, storage_class=None):
@@ -637,10 +660,175 @@ class InspireRecord(Record):
         return self._query_citing_records()
 
     def get_citations_count(self, session=None, show_duplicates=False):
-        """Returns citations count for this record."""
+        """Returns citations count for this record.
+
+        The count is read from the ``records_citations_count`` table, which is
+        kept up to date by ``update_citations``. When ``show_duplicates`` is
+        ``True`` the citing records are counted again from their JSON, which
+        also includes the duplicates that are not in the PID store.
+        """
+        if show_duplicates:
+            return self._query_citing_records(show_duplicates, session).count()
+
+        pid = get_pid_from_record(self)
+        if not pid:
+            return 0
+
+        if not session:
+            session = db.session
+        pid_type, pid_value = pid
+        count = session.query(RecordCitationsCount.citation_count).filter_by(
+            pid_type=pid_type,
+            pid_value=pid_value,
+        ).scalar()
+        return count or 0
+
+    def get_cited_pids(self):
+        """Return the pids of the records cited by this record.
+
+        Only references of non deleted records belonging to the
+        ``Literature`` collection are taken into account, as these are the
+        only ones counted as citations.
 
-        count = self._query_citing_records(show_duplicates, session).count()
-        return count
+        Returns:
+            Set[Tuple[str, str]]: pids of the records cited by this record.
+        """
+        if self.get('deleted') or 'Literature' not in self.get('_collections', []):
+            return set()
+
+        pids = (
+            get_pid_from_record_uri(ref)
+            for ref in get_value(self, 'references.record.$ref', [])
+        )
+        return set(pid for pid in pids if pid)
+
+    def update_citations(self):
+        """Synchronize the citations table with the references of this record.
+
+        The pids currently cited by the record are compared with the ones
+        stored in the ``records_citations`` table, and only the difference is
+        written, together with the corresponding change in the citation
+        counts of the cited records.
+
+        Note: record should be flushed to DB before calling this method.
+        """
+        self._update_citations_table(self.get_cited_pids())
+
+    def _update_citations_table(self, cited_pids):
+        if self.id is None:
+            return
+
+        stored_pids = set(
+            (pid_type, pid_value) for pid_type, pid_value in
+            db.session.query(
+                RecordCitations.cited_pid_type,
+                RecordCitations.cited_pid_value,
+            ).filter(RecordCitations.citer_id == self.id)
+        )
+
+        added_pids = cited_pids - stored_pids
+        removed_pids = stored_pids - cited_pids
+
+        # Collected until the commit, see ``index_after_commit``.
+        modified_citations = getattr(self.model, '_modified_citations', set())
+        self.model._modified_citations = modified_citations | added_pids | removed_pids
+
+        # Collected until the commit, see ``update_citation_graph_after_commit``.
+        citation_graph_changes = getattr(self.model, '_citation_graph_changes', [])
+        citer_recid = self.get('control_number')
+        if citer_recid and is_hep(self):
+            citation_graph_changes.extend(
+                (op, int(citer_recid), int(pid_value))
+                for op, pids in (('+', added_pids), ('-', removed_pids))
+                for pid_type, pid_value in sorted(pids)
+                if pid_type == 'lit'
+            )
+        self.model._citation_graph_changes = citation_graph_changes
+
+        if added_pids:
+            db.session.execute(RecordCitations.__table__.insert(), [
+                {
+                    'citer_id': self.id,
+                    'cited_pid_type': pid_type,
+                    'cited_pid_value': pid_value,
+                } for pid_type, pid_value in added_pids
+            ])
+            _increment_citations_count(added_pids, 1)
+
+        if removed_pids:
+            RecordCitations.query.filter(
+                RecordCitations.citer_id == self.id,
+                tuple_(
+                    RecordCitations.cited_pid_type,
+                    RecordCitations.cited_pid_value,
+                ).in_(removed_pids),
+            ).delete(synchronize_session=False)
+            _increment_citations_count(removed_pids, -1)
+
+    def get_author_signatures(self):
+        """Return the authors of this record which have a recid.
+
+        As for ``get_cited_pids``, only non deleted records belonging to the
+        ``Literature`` collection are taken into account.
+
+        Returns:
+            Dict[int, str]: full name of each author of this record, by recid.
+        """
+        if self.get('deleted') or 'Literature' not in self.get('_collections', []):
+            return {}
+
+        signatures = {}
+        for author in self.get('authors', []):
+            recid = get_recid_from_ref(author.get('record'))
+            if recid and recid not in signatures:
+                signatures[recid] = author['full_name']
+
+        return signatures
+
+    def update_authors(self):
+        """Synchronize the authors table with the authors of this record.
+
+        Only the signatures which were added, removed or renamed since the
+        last update are written to the ``records_authors`` table.
+
+        Note: record should be flushed to DB before calling this method.
+        """
+        self._update_authors_table(self.get_author_signatures())
+
+    def _update_authors_table(self, signatures):
+        if self.id is None:
+            return
+
+        stored_signatures = dict(
+            db.session.query(
+                RecordAuthors.author_recid,
+                RecordAuthors.full_name,
+            ).filter(RecordAuthors.record_id == self.id)
+        )
+
+        removed_recids = set(
+            recid for recid, full_name in stored_signatures.items()
+            if signatures.get(recid) != full_name
+        )
+        added_recids = set(
+            recid for recid, full_name in signatures.items()
+            if stored_signatures.get(recid) != full_name
+        )
+
+        if removed_recids:
+            RecordAuthors.query.filter(
+                RecordAuthors.record_id == self.id,
+                RecordAuthors.author_recid.in_(removed_recids),
+            ).delete(synchronize_session=False)
+
+        if added_recids:
+            db.session.execute(RecordAuthors.__table__.insert(), [
+                {
+                    'record_id': self.id,
+                    'author_recid': recid,
+                    'full_name': signatures[recid],
+                } for recid in added_recids
+            ])
 
     def dumps(self):
         """Returns a dict 'representation' of the record.
@@ -702,6 +890,25 @@ class InspireRecord(Record):
         return set.symmetric_difference(ids_latest, ids_oldest)
 
 
+def _increment_citations_count(pids, delta):
+    """Add ``delta`` to the citation counts of ``pids`` in a single statement."""
+    table = RecordCitationsCount.__table__
+    statement = insert(table).values([
+        {
+            'pid_type': pid_type,
+            'pid_value': pid_value,
+            'citation_count': delta,
+        } for pid_type, pid_value in pids
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.pid_type, table.c.pid_value],
+        set_={
+            'citation_count': table.c.citation_count + statement.excluded.citation_count,
+        },
+    )
+    db.session.execute(statement)
+
+
 class ESRecord(InspireRecord):
     """Record class that fetches records from ElasticSearch."""
 
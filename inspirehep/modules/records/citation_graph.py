@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""In-memory graph of the citations between Literature records.
+
+The graph is built from the ``records_citations`` table into two CSR
+matrices indexed by recid, one from each cited record to its citers and one
+from each citing record to its references, which are saved as NumPy arrays
+and memory-mapped by every process using them. The citations changed since
+the graph was built are appended by ``log_citation_changes`` to a Redis
+list, which the processes replay on top of the arrays. As the replayed
+changes are kept in the memory of each process, a graph stops being used
+after ``INSPIRE_CITATION_GRAPH_MAX_CHANGES`` of them, until it is rebuilt.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import shutil
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from time import time
+
+import flask
+import numpy as np
+from flask import current_app as app
+from redis import StrictRedis
+
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier, PIDStatus
+
+from inspirehep.modules.records.models import RecordCitations
+from inspirehep.utils.stats import calculate_h_index
+
+LOG_KEY = 'citation_graph:log'
+LOG_TRIMMED_KEY = 'citation_graph:log_trimmed'
+
+ARRAYS = ('citers_indptr', 'citers', 'references_indptr', 'references')
+
+_citation_graph = None
+
+
+def _get_redis():
+    redis = getattr(flask.g, 'redis_client', None)
+    if redis is None:
+        url = app.config.get('CACHE_REDIS_URL')
+        redis = StrictRedis.from_url(url)
+        flask.g.redis_client = redis
+    return redis
+
+
+def _get_log_length(redis):
+    """Return the number of changes ever appended to the log."""
+    with redis.pipeline() as pipe:
+        pipe.get(LOG_TRIMMED_KEY)
+        pipe.llen(LOG_KEY)
+        trimmed, length = pipe.execute()
+
+    return int(trimmed or 0) + length
+
+
+def log_citation_changes(changes):
+    """Append committed citation changes to the log of the graph.
+
+    Nothing is logged when no ``INSPIRE_CITATION_GRAPH_PATH`` is configured,
+    as the log is only trimmed when the graph is built.
+
+    Args:
+        changes (List[Tuple[str, int, int]]): ``'+'`` or ``'-'``, the recid of
+            the citing record and the recid of the cited record of each
+            added or removed citation.
+    """
+    if changes and app.config['INSPIRE_CITATION_GRAPH_PATH']:
+        _get_redis().rpush(LOG_KEY, *(
+            '{} {} {}'.format(op, citer, cited) for op, citer, cited in changes
+        ))
+
+
+def _to_csr(rows, columns, size):
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+
+    return indptr, columns[order].astype(np.uint32)
+
+
+def _get_lit_citations(batch_size):
+    return db.session.query(
+        PersistentIdentifier.pid_value,
+        RecordCitations.cited_pid_value,
+    ).join(
+        RecordCitations,
+        RecordCitations.citer_id == PersistentIdentifier.object_uuid,
+    ).filter(
+        PersistentIdentifier.pid_type == 'lit',
+        PersistentIdentifier.object_type == 'rec',
+        PersistentIdentifier.status == PIDStatus.REGISTERED,
+        RecordCitations.cited_pid_type == 'lit',
+    ).yield_per(batch_size)
+
+
+def _iter_lit_citation_chunks(batch_size):
+    """Yield the citations by arrays of ``batch_size`` (citer, cited) recids.
+
+    The recids never go through a Python list, which would take several
+    times the size of the arrays for the whole table.
+    """
+    citations = iter(_get_lit_citations(batch_size))
+    while True:
+        rows = list(islice(citations, batch_size))
+        if not rows:
+            return
+        yield np.fromiter(
+            (int(pid_value) for row in rows for pid_value in row),
+            dtype=np.uint32,
+            count=2 * len(rows),
+        ).reshape(-1, 2)
+
+
+def build_citation_graph(path, batch_size=10000):
+    """Build the graph from the citations table and make it the current one.
+
+    The position of the log is read before the citations table, so that the
+    citations committed while the graph is built are replayed on it.
+
+    Args:
+        path (str): directory where the versions of the graph are stored.
+        batch_size (int): number of citations read from the DB at once.
+
+    Returns:
+        CitationGraph: the new graph.
+    """
+    redis = _get_redis()
+    log_offset = _get_log_length(redis)
+
+    chunks = list(_iter_lit_citation_chunks(batch_size))
+    edges = np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.uint32)
+    del chunks
+    citers = edges[:, 0]
+    cited = edges[:, 1]
+    size = int(max(citers.max(), cited.max())) + 1 if len(citers) else 0
+
+    arrays = dict(zip(ARRAYS, _to_csr(cited, citers, size) + _to_csr(citers, cited, size)))
+
+    version = datetime.utcnow().strftime('%Y%m%d%H%M%S%f')
+    version_path = os.path.join(path, version)
+    os.makedirs(version_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(version_path, name + '.npy'), array)
+    with open(os.path.join(version_path, 'meta.json'), 'w') as meta_file:
+        json.dump({'log_offset': log_offset, 'size': size}, meta_file)
+
+    current_path = os.path.join(path, 'current')
+    with open(current_path + '.tmp', 'w') as current_file:
+        current_file.write(version)
+    os.rename(current_path + '.tmp', current_path)
+
+    _trim_log(redis, log_offset)
+
+    # The previous version is kept for the processes still loading it.
+    versions = sorted(name for name in os.listdir(path) if not name.startswith('current'))
+    for old_version in versions[:-2]:
+        shutil.rmtree(os.path.join(path, old_version), ignore_errors=True)
+
+    return CitationGraph(path)
+
+
+def _trim_log(redis, log_offset):
+    """Remove the changes older than ``log_offset`` from the log."""
+    trimmed = int(redis.get(LOG_TRIMMED_KEY) or 0)
+    if log_offset <= trimmed:
+        return
+
+    with redis.pipeline() as pipe:
+        pipe.ltrim(LOG_KEY, log_offset - trimmed, -1)
+        pipe.incrby(LOG_TRIMMED_KEY, log_offset - trimmed)
+        pipe.execute()
+
+
+class CitationGraph(object):
+    """Citations between Literature records, by recid.
+
+    The lookups replay the new changes of the log at most once every
+    ``INSPIRE_CITATION_GRAPH_SYNC_INTERVAL`` seconds, and switch to a newer
+    version of the graph as soon as one is built. Once more than
+    ``INSPIRE_CITATION_GRAPH_MAX_CHANGES`` changes were logged since the
+    version was built, the replayed changes are dropped and the lookups
+    raise a ``RuntimeError`` until a newer version is built.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.version = None
+        self._last_sync = 0
+        self._load()
+
+    @property
+    def number_of_citations(self):
+        """Number of citations in the version of the graph loaded."""
+        return len(self._citers)
+
+    def _get_current_version(self):
+        with open(os.path.join(self.path, 'current')) as current_file:
+            return current_file.read().strip()
+
+    def _load(self):
+        self.version = self._get_current_version()
+        version_path = os.path.join(self.path, self.version)
+        for name in ARRAYS:
+            setattr(self, '_' + name, np.load(
+                os.path.join(version_path, name + '.npy'), mmap_mode='r'))
+        with open(os.path.join(version_path, 'meta.json')) as meta_file:
+            meta = json.load(meta_file)
+
+        self.size = meta['size']
+        self.log_offset = meta['log_offset']
+        self._built_log_offset = meta['log_offset']
+        self._outdated = False
+        self._added = {'citers': defaultdict(set), 'references': defaultdict(set)}
+        self._removed = {'citers': defaultdict(set), 'references': defaultdict(set)}
+
+    def sync(self, force=False):
+        """Replay the changes appended to the log since the last sync.
+
+        Raises:
+            RuntimeError: if the graph has to be rebuilt.
+        """
+        interval = app.config['INSPIRE_CITATION_GRAPH_SYNC_INTERVAL']
+        if force or time() - self._last_sync >= interval:
+            self._last_sync = time()
+            self._sync()
+
+        if self._outdated:
+            raise RuntimeError(
+                'Too many changes since the citation graph was built, it has to be rebuilt.'
+            )
+
+    def _sync(self):
+        if self._get_current_version() != self.version:
+            self._load()
+        if self._outdated:
+            return
+
+        redis = _get_redis()
+        with redis.pipeline() as pipe:
+            pipe.get(LOG_TRIMMED_KEY)
+            pipe.llen(LOG_KEY)
+            trimmed, length = pipe.execute()
+        trimmed = int(trimmed or 0)
+        if self.log_offset < trimmed:
+            raise RuntimeError(
+                'Changes of the citation graph were lost, it has to be rebuilt.'
+            )
+
+        max_changes = app.config['INSPIRE_CITATION_GRAPH_MAX_CHANGES']
+        if trimmed + length - self._built_log_offset > max_changes:
+            self._outdated = True
+            self._added = {'citers': defaultdict(set), 'references': defaultdict(set)}
+            self._removed = {'citers': defaultdict(set), 'references': defaultdict(set)}
+            return
+
+        changes = redis.lrange(LOG_KEY, self.log_offset - trimmed, -1)
+        for change in changes:
+            op, citer, cited = change.decode('utf-8').split()
+            self._apply(op, int(citer), int(cited))
+        self.log_offset += len(changes)
+
+    def _apply(self, op, citer, cited):
+        if op == '+':
+            self._removed['citers'][cited].discard(citer)
+            self._removed['references'][citer].discard(cited)
+            self._added['citers'][cited].add(citer)
+            self._added['references'][citer].add(cited)
+        else:
+            self._added['citers'][cited].discard(citer)
+            self._added['references'][citer].discard(cited)
+            self._removed['citers'][cited].add(citer)
+            self._removed['references'][citer].add(cited)
+
+    def _get_row(self, kind, recid):
+        if recid < self.size:
+            indptr = getattr(self, '_{}_indptr'.format(kind))
+            row = getattr(self, '_' + kind)[indptr[recid]:indptr[recid + 1]]
+        else:
+            row = np.empty(0, dtype=np.uint32)
+
+        added = self._added[kind].get(recid)
+        removed = self._removed[kind].get(recid)
+        if not added and not removed:
+            return row
+
+        recids = (set(row.tolist()) - (removed or set())) | (added or set())
+        return np.array(sorted(recids), dtype=np.uint32)
+
+    def citers_of(self, recid, excluded=None):
+        """Return the recids of the records citing a record.
+
+        Args:
+            recid (int): recid of the cited record.
+            excluded (Optional[Iterable[int]]): recids of citing records to
+                leave out, e.g. the papers of the authors of the record to
+                filter out self-citations.
+
+        Returns:
+            numpy.ndarray: the sorted recids of the citing records.
+        """
+        self.sync()
+        citers = self._get_row('citers', recid)
+        if excluded:
+            citers = np.setdiff1d(citers, np.fromiter(excluded, dtype=np.uint32))
+
+        return citers
+
+    def references_of(self, recid):
+        """Return the sorted recids of the records cited by a record."""
+        self.sync()
+        return self._get_row('references', recid)
+
+    def citation_count(self, recid, excluded=None):
+        """Return the number of records citing a record, see ``citers_of``."""
+        return len(self.citers_of(recid, excluded=excluded))
+
+    def h_index(self, recids):
+        """Return the h-index of a set of records, e.g. the papers of an author."""
+        return calculate_h_index({
+            recid: self.citation_count(recid) for recid in recids
+        })
+
+
+def get_citation_graph():
+    """Return the citation graph of the process, if it was built.
+
+    Returns:
+        Optional[CitationGraph]: the graph, or ``None`` if none was built
+        in ``INSPIRE_CITATION_GRAPH_PATH``.
+    """
+    global _citation_graph
+
+    path = app.config['INSPIRE_CITATION_GRAPH_PATH']
+    if _citation_graph is None or _citation_graph.path != path:
+        if not path or not os.path.exists(os.path.join(path, 'current')):
+            return None
+        _citation_graph = CitationGraph(path)
+
+    return _citation_graph
@@ -22,7 +22,8 @@
 
 from __future__ import absolute_import, division, print_function
 
-from time import sleep
+from collections import deque
+from time import sleep, time
 
 import click
 import click_spinner
@@ -33,6 +34,8 @@ import pprint
 from os import path, makedirs
 from datetime import datetime
 
+from elasticsearch.helpers import parallel_bulk
+
 from multiprocessing.pool import mapstar, RUN, ThreadPool, IMapUnorderedIterator, Pool
 
 from invenio_db import db
@@ -42,22 +45,44 @@ from flask import current_app
 from flask.cli import with_appcontext
 from invenio_records_files.models import RecordsBuckets
 
-from inspirehep.modules.records.utils import get_citations_from_es
+from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.pidstore.utils import get_pid_type_from_endpoint
+from inspirehep.modules.records.checkers import check_unlinked_references
+from inspirehep.modules.records.citation_graph import build_citation_graph
+from inspirehep.modules.records.errors import IncompleteIndexSwapError
+from inspirehep.modules.records.index_versions import (
+    IndexBuilds,
+    create_index_version,
+    drop_index_version,
+    finalize_index_version,
+    index_records_into,
+    replay_index_build,
+    swap_index_version,
+)
+from inspirehep.modules.records.models import (
+    RecordAuthors,
+    RecordCitations,
+    RecordCitationsCount,
+)
+from inspirehep.utils.record import create_index_ops
 from inspirehep.utils.record_getter import get_db_record, get_es_record, \
     RecordGetterError
-from inspirehep.modules.records.checkers import check_unlinked_references
 from inspirehep.modules.records.tasks import batch_reindex
 
 from invenio_records.models import RecordMetadata
+from invenio_search import current_search_client as es
 from inspirehep.modules.search.api import LiteratureSearch
 
 
 from sqlalchemy import (
     String,
+    and_,
     cast,
+    func,
     type_coerce,
     or_,
-    not_
+    not_,
+    select,
 )
 
 from sqlalchemy.dialects.postgresql import JSONB
@@ -173,14 +198,135 @@ def _dump_errors_to_file(errors, log_file_path, tasks_uuids, msg='Check errors i
         click.secho('{}: {}'.format(msg, log_file_path))
 
 
+def _init_index_worker():
+    """Give each indexing worker process its own app and DB connections."""
+    from inspirehep.factory import create_app
+
+    app = create_app()
+    app.app_context().push()
+
+
+def _create_index_ops(uuids):
+    records = [
+        record for record in InspireRecord.get_records(uuids)
+        if not record.get('deleted', False)
+    ]
+    index_ops = create_index_ops(records, version_type='force')
+    db.session.remove()
+
+    return uuids[-1], index_ops
+
+
+def _read_checkpoint(checkpoint_path):
+    if not path.exists(checkpoint_path):
+        return {'last_uuids': {}, 'finished': []}
+
+    with open(checkpoint_path) as checkpoint_file:
+        return json.load(checkpoint_file)
+
+
+def _write_checkpoint(checkpoint, checkpoint_path):
+    _prepare_logdir(checkpoint_path)
+    with open(checkpoint_path, 'w') as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+
+
+def _index_with_processes(pid_types, batch_size, processes, checkpoint_path, resume):
+    """Index records from worker processes, saving a checkpoint as it goes.
+
+    The uuids of each pid type are streamed in order from the DB, the bulk
+    operations are built by the worker processes and sent to ElasticSearch
+    with ``parallel_bulk``. After each batch is fully indexed, its last uuid
+    is saved in the checkpoint, so that an interrupted run can be resumed.
+
+    Returns:
+        Tuple[int, List[dict]]: the number of successes and the failures.
+    """
+    checkpoint = _read_checkpoint(checkpoint_path) if resume else {'last_uuids': {}, 'finished': []}
+    request_timeout = current_app.config.get('INDEXER_BULK_REQUEST_TIMEOUT')
+
+    # Forked processes must not share the DB connections of the parent.
+    db.session.close()
+    db.engine.dispose()
+    pool = Pool(processes, initializer=_init_index_worker)
+
+    successes = 0
+    failures = []
+    start_time = time()
+
+    try:
+        for pid_type in pid_types:
+            if pid_type in checkpoint['finished']:
+                click.secho('Skipping {}, already indexed.'.format(pid_type))
+                continue
+
+            query = get_query_records_to_index([pid_type]).order_by(PersistentIdentifier.object_uuid)
+            last_uuid = checkpoint['last_uuids'].get(pid_type)
+            if last_uuid:
+                query = query.filter(PersistentIdentifier.object_uuid > last_uuid)
+
+            uuids = (str(item[0]) for item in query.yield_per(2000))
+            batches = iter(lambda: next_batch(uuids, batch_size), [])
+            pending_batches = deque()
+
+            def _index_ops():
+                end = 0
+                for batch_last_uuid, index_ops in pool.imap(_create_index_ops, batches):
+                    end += len(index_ops)
+                    pending_batches.append((batch_last_uuid, end))
+                    for index_op in index_ops:
+                        yield index_op
+
+            processed = 0
+            for ok, info in parallel_bulk(
+                es,
+                _index_ops(),
+                thread_count=processes,
+                chunk_size=batch_size,
+                request_timeout=request_timeout,
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                processed += 1
+                if ok:
+                    successes += 1
+                else:
+                    failures.append(info)
+
+                while pending_batches and pending_batches[0][1] <= processed:
+                    checkpoint['last_uuids'][pid_type] = pending_batches.popleft()[0]
+                    _write_checkpoint(checkpoint, checkpoint_path)
+
+                if processed % 10000 == 0:
+                    _echo_throughput(successes + len(failures), start_time)
+
+            checkpoint['finished'].append(pid_type)
+            _write_checkpoint(checkpoint, checkpoint_path)
+    finally:
+        pool.terminate()
+        pool.join()
+
+    _echo_throughput(successes + len(failures), start_time)
+    return successes, failures
+
+
+def _echo_throughput(count, start_time):
+    elapsed = time() - start_time
+    click.secho('{} records indexed in {:.0f}s ({:.1f} docs/sec)'.format(
+        count, elapsed, count / elapsed if elapsed else 0,
+    ))
+
+
 @click.command()
 @click.option('--yes-i-know', is_flag=True)
 @click.option('-t', '--pid-type', multiple=True, required=True)
 @click.option('-s', '--batch-size', default=200)
 @click.option('-q', '--queue-name', default='indexer_task')
 @click.option('-l', '--log-path', default='/tmp/inspire/')
+@click.option('-p', '--processes', default=0)
+@click.option('--resume', is_flag=True)
 @with_appcontext
-def simpleindex(yes_i_know, pid_type, batch_size, queue_name, log_path):
+def simpleindex(yes_i_know, pid_type, batch_size, queue_name, log_path, processes, resume):
     """Bulk reindex all records in a parallel manner.
 
     Indexes in batches all articles belonging to the given pid_types.
@@ -193,6 +339,11 @@ def simpleindex(yes_i_know, pid_type, batch_size, queue_name, log_path):
         batch_size (int): number of documents per batch sent to workers.
         queue_name (str): name of the celery queue
         log_path (str): path of the indexing logs
+        processes (int): if set, index from this number of local processes
+            instead of sending the batches to celery, saving a checkpoint in
+            the log_path folder.
+        resume (bool): if True, resume the indexing with local processes from
+            the last checkpoint.
 
     Returns:
         None
@@ -203,6 +354,24 @@ def simpleindex(yes_i_know, pid_type, batch_size, queue_name, log_path):
             abort=True,
         )
 
+    if processes:
+        checkpoint_path = path.join(log_path, 'records_index_checkpoint.json')
+        successes, failures = _index_with_processes(
+            pid_type, batch_size, processes, checkpoint_path, resume,
+        )
+
+        color = 'red' if failures else 'green'
+        click.secho(
+            'Reindexing finished: {} failed, {} succeeded.'.format(
+                len(failures), successes,
+            ),
+            fg=color,
+        )
+
+        failures_log_path = path.join(log_path, 'records_index_failures.log')
+        _dump_errors_to_file(failures, failures_log_path, {}, msg='Failed index tasks')
+        return
+
     click.secho('Sending record UUIDs to the indexing queue...', fg='green')
 
     query = get_query_records_to_index(pid_type)
@@ -277,6 +446,108 @@ def simpleindex(yes_i_know, pid_type, batch_size, queue_name, log_path):
     _dump_errors_to_file(batch_errors, errors_log_path, uuid_records_per_tasks, msg='Failed batches')
 
 
+@click.command()
+@click.option('--yes-i-know', is_flag=True)
+@click.option('-i', '--index', default='records-hep')
+@click.option('-s', '--batch-size', default=200)
+@click.option('-l', '--log-path', default='/tmp/inspire/')
+@with_appcontext
+def reindex_new_version(yes_i_know, index, batch_size, log_path):
+    """Reindex all records of an index into a new version of it.
+
+    The records are loaded into ``<index>-<timestamp>``, created from the
+    current mapping with refresh and replicas disabled. The records written
+    to the index in the meantime are then replayed on the new version, which
+    finally replaces the old one behind the ``index`` alias. If the rebuild
+    fails before that, the new version is deleted and the old one is left
+    in place. If it fails after the old index was deleted, the new version
+    is kept and the command to create the alias by hand is printed.
+
+    Args:
+        yes_i_know (bool): if True, skip confirmation screen
+        index (str): name of the index to rebuild.
+        batch_size (int): number of documents per bulk request.
+        log_path (str): path of the indexing logs
+
+    Returns:
+        None
+    """
+    if not yes_i_know:
+        click.confirm(
+            'Do you really want to rebuild {}?'.format(index),
+            abort=True,
+        )
+
+    endpoint = {
+        v: k for k, v in current_app.config['INSPIRE_ENDPOINT_TO_INDEX'].items()
+    }[index]
+    pid_type = get_pid_type_from_endpoint(endpoint)
+
+    new_index = create_index_version(index)
+    index_builds = IndexBuilds()
+    index_builds.start(index, new_index)
+    click.secho('Created {}.'.format(new_index), fg='green')
+
+    successes = 0
+    failures = []
+    swap_incomplete = False
+    try:
+        query = get_query_records_to_index([pid_type])
+        with click.progressbar(
+            query.yield_per(2000),
+            length=query.count(),
+            label='Indexing records into {}'.format(new_index),
+        ) as items:
+            batch = next_batch(items, batch_size)
+            while batch:
+                uuids = [str(item[0]) for item in batch]
+                batch_successes, batch_failures = index_records_into(uuids, index, new_index)
+                successes += batch_successes
+                failures.extend(batch_failures)
+                batch = next_batch(items, batch_size)
+
+        batch_successes, batch_failures = replay_index_build(index, new_index)
+        successes += batch_successes
+        failures.extend(batch_failures)
+
+        finalize_index_version(index, new_index)
+        swap_index_version(index, new_index)
+
+        # The writes between the last replay and the swap went to the old index.
+        batch_successes, batch_failures = replay_index_build(index, new_index)
+        successes += batch_successes
+        failures.extend(batch_failures)
+    except IncompleteIndexSwapError as e:
+        # The new version is the only copy left: keep it, and keep tracking
+        # the paused writes until the alias is created by hand.
+        swap_incomplete = True
+        click.secho(str(e), fg='red')
+        click.secho(
+            'The writes to {0} stay paused and tracked. Once the alias exists, '
+            'call IndexBuilds().resume({0!r}), replay_index_build({0!r}, {1!r}) '
+            'and IndexBuilds().finish({0!r}).'.format(index, new_index),
+            fg='red',
+        )
+        raise
+    except Exception:
+        drop_index_version(index, new_index)
+        raise
+    finally:
+        if not swap_incomplete:
+            index_builds.finish(index)
+
+    color = 'red' if failures else 'green'
+    click.secho(
+        'Reindexing finished: {} failed, {} succeeded. {} now points to {}.'.format(
+            len(failures), successes, index, new_index,
+        ),
+        fg=color,
+    )
+
+    failures_log_path = path.join(log_path, 'records_index_failures.log')
+    _dump_errors_to_file(failures, failures_log_path, {}, msg='Failed index tasks')
+
+
 @click.command()
 @click.option('--remove-no-control-number', is_flag=True)
 @click.option('--remove-duplicates', is_flag=True)
@@ -542,123 +813,247 @@ def benchmark_citations(from_page, to_page, pagesize, data_output, pool_size):
             click.echo("Results saved in %s" % data_output)
 
 
-def _process_record(pid, app):
-    if stop:
-        return
-    with app.app_context():
-        success = False
-        deleted = False
-        no_cits = False
-        db_cits = None
-        es_cits = None
-        es_citation_count_field = None
-        data = {}
-        rec = get_db_record('lit', pid.pid_value)
-        if rec.get('deleted'):
-            success = True
-            deleted = True
-        if not deleted:
-            try:
-                es_cits = get_citations_from_es(rec).total
-                search = LiteratureSearch().source(includes=['citation_count'])
-                results = search.get_record(rec.id).execute()
-                if not results.hits:
-                    es_citation_count_field = None
-                else:
-                    es_citation_count_field = results.hits[0]['citation_count']
-                db_cits = rec.get_citations_count()
-            except Exception as err:
-                click.echo("Cannot prepare data for %s record. %s",
-                           pid.pid_value,
-                           err)
-        if not deleted and es_cits is not None and es_cits == db_cits == es_citation_count_field:
-            if es_cits == 0:
-                no_cits = True
-            success = True
-        else:
-            data = {'pid_value': pid.pid_value,
-                    'db_citations_count': db_cits,
-                    'es_citations_count': es_cits,
-                    'es_citations_field': es_citation_count_field}
-        return (success, deleted, no_cits, data)
+@click.group()
+def citations():
+    """Commands to maintain the citations table"""
 
 
-@check.command()
-@click.option('-f', '--from-page', default=1)
-@click.option('-t', '--to-page', default=-1)
-@click.option('-s', '--pagesize', default=100)
-@click.option('-o', '--output', default='/tmp/inspire/citations_inconsistencies.txt')
-@click.option('-p', '--pool-size', default=10)
+def _get_query_citing_records():
+    return db.session.query(RecordMetadata.id, RecordMetadata.json).join(
+        PersistentIdentifier,
+        PersistentIdentifier.object_uuid == RecordMetadata.id,
+    ).filter(
+        PersistentIdentifier.pid_type == 'lit',
+        PersistentIdentifier.object_type == 'rec',
+        PersistentIdentifier.status == PIDStatus.REGISTERED,
+        type_coerce(RecordMetadata.json, JSONB)['_collections'].contains(['Literature']),
+    )
+
+
+def _get_citations_count_from_edges():
+    return select([
+        RecordCitations.cited_pid_type,
+        RecordCitations.cited_pid_value,
+        func.count().label('citation_count'),
+    ]).group_by(
+        RecordCitations.cited_pid_type,
+        RecordCitations.cited_pid_value,
+    )
+
+
+@citations.command()
+@click.option('--yes-i-know', is_flag=True)
+@click.option('-s', '--batch-size', default=1000)
 @with_appcontext
-def find_citations_inconsistencies(from_page, to_page, pagesize, output, pool_size):
-    """Process all non deleted records and check if citation in ES
-    are the same like in DB"""
-    if pool_size > 10:
-        click.echo("Using more than 10 threads is unsafe. It will propably"
-                   " break as flask sets db connection limit per process"
-                   " to 10!")
-        click.confirm("Are you sure you want to continue?", abort=True)
-    global stop
-    stop = False
-    ok = 0
-    fail = 0
-    no_cits = 0
-    deleted = 0
+def backfill(yes_i_know, batch_size):
+    """Rebuild the citations table from the references of all records."""
+    if not yes_i_know:
+        click.confirm(
+            'Do you really want to rebuild the citations table?',
+            abort=True,
+        )
 
-    all_recs = int(PersistentIdentifier.query.filter(
-        PersistentIdentifier.pid_type == 'lit').count())
-    all_pages = int(all_recs / pagesize) + 1
-    if -1 < to_page < all_pages:
-        all_recs = (all_pages - (all_pages - to_page)) * pagesize
-    if from_page > 1:
-        all_recs -= int((from_page - 1) * pagesize)
-    with click.progressbar(length=all_recs,
-                           label="Processing %s records..." % all_recs) as bar:
-        _prepare_logdir(output)
-        with open(output, 'w') as data_file:
-            keys = ['pid_value', 'db_citations_count',
-                    'es_citations_count', 'es_citations_field']
-            out_data = csv.DictWriter(data_file, keys)
-            out_data.writeheader()
-            _query = _gen_query(
-                PersistentIdentifier.query.filter(PersistentIdentifier.pid_type == 'lit'),
-                from_page,
-                to_page,
-                pagesize
+    RecordCitations.query.delete()
+    RecordCitationsCount.query.delete()
+
+    query = _get_query_citing_records()
+    with click.progressbar(
+        query.yield_per(batch_size),
+        length=query.count(),
+        label='Collecting citations',
+    ) as items:
+        edges = []
+        for record_id, record_json in items:
+            edges.extend({
+                'citer_id': record_id,
+                'cited_pid_type': pid_type,
+                'cited_pid_value': pid_value,
+            } for pid_type, pid_value in InspireRecord(record_json).get_cited_pids())
+
+            if len(edges) >= batch_size:
+                db.session.execute(RecordCitations.__table__.insert(), edges)
+                edges = []
+
+        if edges:
+            db.session.execute(RecordCitations.__table__.insert(), edges)
+
+    click.secho('Computing citation counts...', fg='green')
+    db.session.execute(
+        RecordCitationsCount.__table__.insert().from_select(
+            ['pid_type', 'pid_value', 'citation_count'],
+            _get_citations_count_from_edges(),
+        )
+    )
+    db.session.commit()
+
+    click.secho(
+        'Citations table rebuilt: {} citations of {} records.'.format(
+            RecordCitations.query.count(), RecordCitationsCount.query.count(),
+        ),
+        fg='green',
+    )
+
+
+@citations.command('check')
+@click.option('--fix', is_flag=True)
+@click.option('--check-es', is_flag=True)
+@click.option('-o', '--output', default='/tmp/inspire/citations_inconsistencies.csv')
+@with_appcontext
+def check_citations(fix, check_es, output):
+    """Find citation counts that disagree with the citations table.
+
+    Compares the stored citation counts with the number of citations in the
+    ``records_citations`` table and, with ``--check-es``, with the
+    ``citation_count`` field indexed in ElasticSearch. With ``--fix`` the
+    stored counts are rewritten from the citations table, after which the
+    records with inconsistent ES counts should be reindexed.
+    """
+    edges = _get_citations_count_from_edges().alias('edges')
+    counts = RecordCitationsCount.__table__
+    on_clause = and_(
+        edges.c.cited_pid_type == counts.c.pid_type,
+        edges.c.cited_pid_value == counts.c.pid_value,
+    )
+    mismatches = db.session.execute(
+        select([
+            func.coalesce(edges.c.cited_pid_type, counts.c.pid_type),
+            func.coalesce(edges.c.cited_pid_value, counts.c.pid_value),
+            func.coalesce(edges.c.citation_count, 0),
+            func.coalesce(counts.c.citation_count, 0),
+        ]).select_from(
+            edges.outerjoin(counts, on_clause, full=True)
+        ).where(
+            func.coalesce(edges.c.citation_count, 0) !=
+            func.coalesce(counts.c.citation_count, 0)
+        )
+    ).fetchall()
+
+    inconsistencies = [
+        {
+            'pid_type': pid_type,
+            'pid_value': pid_value,
+            'edges_citations_count': edges_count,
+            'db_citations_count': db_count,
+            'es_citations_count': None,
+        } for pid_type, pid_value, edges_count, db_count in mismatches
+    ]
+
+    if check_es:
+        db_counts = dict(
+            db.session.query(
+                RecordCitationsCount.pid_value,
+                RecordCitationsCount.citation_count,
+            ).filter(RecordCitationsCount.pid_type == 'lit')
+        )
+        search = LiteratureSearch().source(includes=['control_number', 'citation_count'])
+        with click.progressbar(search.scan(), label='Checking ES citation counts') as hits:
+            for hit in hits:
+                pid_value = str(hit.control_number)
+                db_count = db_counts.get(pid_value, 0)
+                es_count = getattr(hit, 'citation_count', None)
+                if es_count != db_count:
+                    inconsistencies.append({
+                        'pid_type': 'lit',
+                        'pid_value': pid_value,
+                        'edges_citations_count': None,
+                        'db_citations_count': db_count,
+                        'es_citations_count': es_count,
+                    })
+
+    _prepare_logdir(output)
+    with open(output, 'w') as data_file:
+        keys = ['pid_type', 'pid_value', 'edges_citations_count',
+                'db_citations_count', 'es_citations_count']
+        out_data = csv.DictWriter(data_file, keys)
+        out_data.writeheader()
+        out_data.writerows(inconsistencies)
+
+    color = 'red' if inconsistencies else 'green'
+    click.secho(
+        'Found {} inconsistent citation counts, saved in {}'.format(
+            len(inconsistencies), output,
+        ),
+        fg=color,
+    )
+
+    if fix and mismatches:
+        RecordCitationsCount.query.delete()
+        db.session.execute(
+            counts.insert().from_select(
+                ['pid_type', 'pid_value', 'citation_count'],
+                _get_citations_count_from_edges(),
             )
-            _threads_pool = MyThreadPool(pool_size)
-            _threads = _threads_pool.imap_unordered(_process_record, _query,
-                                                    current_app._get_current_object())
-            try:
-                for _thread in _threads:
-                    success, record_deleted, no_citations, data = _thread
-                    bar.update(1)
-                    if success:
-                        ok += 1
-                        if record_deleted:
-                            deleted += 1
-                        elif no_citations:
-                            no_cits += 1
-                    else:
-                        fail += 1
-                        out_data.writerow(data)
-                        data_file.flush()
-            except AttributeError as err:
-                click.echo("Cannot process. Threads exception :%s" % err)
-            except Exception as err:
-                click.echo("Other exception during Threads management: %s" % err)
-            stop = True
-            _threads_pool.close()
-            _threads_pool.join()
+        )
+        db.session.commit()
+        click.secho('Citation counts rewritten from the citations table.', fg='green')
+
+
+@citations.command('build-graph')
+@click.option('-p', '--path', default=None, help='Defaults to INSPIRE_CITATION_GRAPH_PATH.')
+@click.option('-s', '--batch-size', default=10000)
+@with_appcontext
+def build_graph(path, batch_size):
+    """Build the citation graph from the citations table."""
+    path = path or current_app.config['INSPIRE_CITATION_GRAPH_PATH']
+    if not path:
+        raise click.UsageError('No path given and INSPIRE_CITATION_GRAPH_PATH is not set.')
+
+    start_time = time()
+    graph = build_citation_graph(path, batch_size=batch_size)
+    click.secho(
+        'Citation graph {} built in {:.0f}s: {} citations of {} records.'.format(
+            graph.version,
+            time() - start_time,
+            graph.number_of_citations,
+            graph.size,
+        ),
+        fg='green',
+    )
+
+
+@click.group()
+def coauthors():
+    """Commands to maintain the authors table"""
+
+
+@coauthors.command('backfill')
+@click.option('--yes-i-know', is_flag=True)
+@click.option('-s', '--batch-size', default=1000)
+@with_appcontext
+def backfill_coauthors(yes_i_know, batch_size):
+    """Rebuild the authors table from the authors of all records."""
+    if not yes_i_know:
+        click.confirm(
+            'Do you really want to rebuild the authors table?',
+            abort=True,
+        )
 
-            output_msg = "\nProcessed {all_recs} records. {ok} were ok, {failed}"\
-                         " had difference between db an es ctations count!"\
-                         "\n{no_citations} records had no citations"\
-                         " at all.\n{deleted} records"\
-                         " were deleted\n".format(all_recs=ok + fail,
-                                                  ok=ok, failed=fail,
-                                                  no_citations=no_cits,
-                                                  deleted=deleted)
-            click.echo(output_msg)
-            click.echo("Additional statistics for incosistent records"
-                       "was saved in %s file" % output)
+    RecordAuthors.query.delete()
+
+    query = _get_query_citing_records()
+    with click.progressbar(
+        query.yield_per(batch_size),
+        length=query.count(),
+        label='Collecting authors',
+    ) as items:
+        signatures = []
+        for record_id, record_json in items:
+            signatures.extend({
+                'record_id': record_id,
+                'author_recid': recid,
+                'full_name': full_name,
+            } for recid, full_name in InspireRecord(record_json).get_author_signatures().items())
+
+            if len(signatures) >= batch_size:
+                db.session.execute(RecordAuthors.__table__.insert(), signatures)
+                signatures = []
+
+        if signatures:
+            db.session.execute(RecordAuthors.__table__.insert(), signatures)
+
+    db.session.commit()
+
+    click.secho(
+        'Authors table rebuilt: {} signatures.'.format(RecordAuthors.query.count()),
+        fg='green',
+    )
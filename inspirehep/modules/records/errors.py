@@ -22,6 +22,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+import json
+
 from invenio_records.errors import RecordsError
 
 
@@ -31,3 +33,22 @@ class MissingInspireRecordError(RecordsError):
 
 class MissingCitedRecordError(RecordsError):
     pass
+
+
+class IncompleteIndexSwapError(RecordsError):
+    """The old version of an index was deleted, but the alias was not created.
+
+    The new version of the index is then the only copy of the records, so it
+    must be kept and the alias created by hand with ``actions``.
+    """
+
+    def __init__(self, index, new_index, actions):
+        super(IncompleteIndexSwapError, self).__init__(
+            '{} was deleted but the alias to {} could not be created, '
+            'create it with: POST /_aliases {}'.format(
+                index, new_index, json.dumps({'actions': actions}),
+            )
+        )
+        self.index = index
+        self.new_index = new_index
+        self.actions = actions
@@ -24,7 +24,14 @@
 
 from __future__ import absolute_import, division, print_function
 
-from .cli import check, simpleindex, handle_duplicates
+from .cli import (
+    check,
+    citations,
+    coauthors,
+    handle_duplicates,
+    reindex_new_version,
+    simpleindex,
+)
 
 
 class InspireRecords(object):
@@ -34,7 +41,10 @@ class InspireRecords(object):
 
     def init_app(self, app):
         app.cli.add_command(check)
+        app.cli.add_command(citations)
+        app.cli.add_command(coauthors)
         app.cli.add_command(simpleindex)
+        app.cli.add_command(reindex_new_version)
         app.cli.add_command(handle_duplicates)
         app.extensions['inspire-records'] = self
 
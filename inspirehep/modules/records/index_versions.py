@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Build new versions of an index and swap them in behind its alias."""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+from collections import defaultdict
+from datetime import datetime
+
+import flask
+from elasticsearch.helpers import bulk
+from flask import current_app as app
+from redis import StrictRedis
+
+from invenio_search import current_search, current_search_client as es
+
+from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.records.errors import IncompleteIndexSwapError
+from inspirehep.utils.record import create_index_ops
+
+
+class IndexBuilds(object):
+    """Redis record of the index versions being built.
+
+    While a new version of an index is built, ``index_after_commit`` adds the
+    uuids of the records it writes to the index to a pending set, so that
+    these writes can be replayed on the new version before it replaces the
+    old one.
+
+    While an index is paused, during the first swap of a concrete index for
+    an alias, the writers skip it and only track the uuids of the records,
+    so that the index is not auto-created again before the alias exists.
+    """
+    key = 'index_builds'
+    pending_key = 'index_builds:pending:{}'
+    paused_key = 'index_builds:paused'
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    def start(self, index, new_index):
+        """Start tracking the writes to ``index``."""
+        self.redis.hset(self.key, index, new_index)
+
+    def finish(self, index):
+        """Stop tracking the writes to ``index``."""
+        with self.redis.pipeline() as pipe:
+            pipe.hdel(self.key, index)
+            pipe.delete(self.pending_key.format(index))
+            pipe.srem(self.paused_key, index)
+            pipe.execute()
+
+    def pause(self, index):
+        """Stop the writes to ``index``, only tracking them."""
+        self.redis.sadd(self.paused_key, index)
+
+    def resume(self, index):
+        """Resume the writes to ``index``."""
+        self.redis.srem(self.paused_key, index)
+
+    def paused(self):
+        """Return the names of the paused indices."""
+        return set(index.decode('utf-8') for index in self.redis.smembers(self.paused_key))
+
+    def track(self, uuids_by_index):
+        """Add the uuids written to indices being rebuilt to their pending sets.
+
+        Args:
+            uuids_by_index (dict): mapping from the name of an index to the
+                uuids of the records written to it.
+        """
+        building = self.redis.hkeys(self.key)
+        if not building:
+            return
+
+        with self.redis.pipeline() as pipe:
+            for index in building:
+                index = index.decode('utf-8')
+                uuids = uuids_by_index.get(index)
+                if uuids:
+                    pipe.sadd(self.pending_key.format(index), *uuids)
+            pipe.execute()
+
+    def pop_pending(self, index):
+        """Atomically remove the pending uuids of ``index`` and return them."""
+        pending_key = self.pending_key.format(index)
+        with self.redis.pipeline() as pipe:
+            pipe.smembers(pending_key)
+            pipe.delete(pending_key)
+            uuids, _ = pipe.execute()
+
+        return [uuid.decode('utf-8') for uuid in uuids]
+
+
+def create_index_version(index):
+    """Create a new version of an index from its mapping.
+
+    Refresh and replicas are disabled on the new index to speed up the bulk
+    load, see ``finalize_index_version``.
+
+    Returns:
+        str: the name of the new index, ``<index>-<timestamp>``.
+    """
+    new_index = '{}-{}'.format(index, datetime.utcnow().strftime('%Y%m%d%H%M%S'))
+
+    with open(current_search.mappings[index]) as mapping_file:
+        body = json.load(mapping_file)
+
+    settings = body.setdefault('settings', {})
+    settings['refresh_interval'] = '-1'
+    settings['number_of_replicas'] = 0
+    es.indices.create(index=new_index, body=body)
+
+    return new_index
+
+
+def finalize_index_version(index, new_index):
+    """Give the new version of an index the settings of the current one."""
+    current_settings = next(iter(es.indices.get_settings(index=index).values()))
+    index_settings = current_settings['settings']['index']
+
+    es.indices.put_settings(index=new_index, body={
+        'refresh_interval': index_settings.get('refresh_interval', '1s'),
+        'number_of_replicas': index_settings['number_of_replicas'],
+    })
+    es.indices.refresh(index=new_index)
+
+
+def swap_index_version(index, new_index):
+    """Make ``index`` and its other aliases point to ``new_index``.
+
+    The old versions of the index are deleted once the aliases point to the
+    new one. When ``index`` is still a concrete index, as before the first
+    swap, it has to be deleted before the alias with its name can be
+    created, so the writes to it are paused in the meantime and only tracked
+    with ``IndexBuilds``, to be replayed on the new version. If creating the
+    alias fails then, it is tried again, as the new version is the only copy
+    of the records left.
+
+    Raises:
+        IncompleteIndexSwapError: if the alias could still not be created
+            once the old index was deleted. The index stays paused, and the
+            new version must be kept.
+    """
+    current_aliases = es.indices.get_alias(index=index)
+    old_indices = list(current_aliases)
+    aliases = set()
+    for old_index in old_indices:
+        aliases.update(current_aliases[old_index]['aliases'])
+
+    if old_indices != [index]:
+        actions = [
+            {'remove': {'index': old_index, 'alias': alias}}
+            for old_index in old_indices
+            for alias in current_aliases[old_index]['aliases']
+        ]
+        actions.extend({'add': {'index': new_index, 'alias': alias}} for alias in sorted(aliases))
+        es.indices.update_aliases(body={'actions': actions})
+        es.indices.delete(index=','.join(old_indices))
+        return
+
+    aliases.add(index)
+    actions = [{'add': {'index': new_index, 'alias': alias}} for alias in sorted(aliases)]
+    index_builds = IndexBuilds()
+    index_builds.pause(index)
+    try:
+        es.indices.delete(index=index)
+    except Exception:
+        index_builds.resume(index)
+        raise
+
+    try:
+        es.indices.update_aliases(body={'actions': actions})
+    except Exception:
+        try:
+            if es.indices.exists(index=index) and not es.indices.exists_alias(name=index):
+                # Auto-created by a writer which missed the pause.
+                es.indices.delete(index=index)
+            es.indices.update_aliases(body={'actions': actions})
+        except Exception:
+            raise IncompleteIndexSwapError(index, new_index, actions)
+
+    index_builds.resume(index)
+
+
+def drop_index_version(index, new_index):
+    """Delete a new version of an index, unless ``index`` already points to it."""
+    if not es.indices.exists(index=new_index):
+        return
+    if es.indices.exists_alias(name=index, index=new_index):
+        return
+    es.indices.delete(index=new_index)
+
+
+def track_index_ops(ops):
+    """Track the records written by bulk ``ops`` with ``IndexBuilds``."""
+    uuids_by_index = defaultdict(list)
+    for op in ops:
+        uuids_by_index[op['_index']].append(op['_id'])
+    IndexBuilds().track(uuids_by_index)
+
+
+def skip_paused_index_ops(ops):
+    """Return the bulk ``ops`` which do not write to a paused index.
+
+    The uuids of the records in the skipped ops are tracked instead, so that
+    they are written to the new version of the index.
+    """
+    paused = IndexBuilds().paused()
+    if not paused:
+        return ops
+
+    track_index_ops([op for op in ops if op['_index'] in paused])
+
+    return [op for op in ops if op['_index'] not in paused]
+
+
+def index_records_into(uuids, index, new_index):
+    """Write the current version of records to the new version of an index.
+
+    Records which were deleted since they were tracked are removed from it.
+
+    Returns:
+        Tuple[int, List[dict]]: the number of successes and the failures.
+    """
+    records = InspireRecord.get_records(uuids)
+    to_index = [record for record in records if not record.get('deleted', False)]
+    indexed_uuids = set(str(record.id) for record in to_index)
+
+    ops = create_index_ops(to_index)
+    for op in ops:
+        op['_index'] = new_index
+    ops.extend(
+        {
+            '_op_type': 'delete',
+            '_index': new_index,
+            '_type': index.rsplit('-', 1)[-1],
+            '_id': uuid,
+        } for uuid in uuids if uuid not in indexed_uuids
+    )
+
+    successes, failures = bulk(
+        es,
+        ops,
+        request_timeout=app.config['INDEXER_BULK_REQUEST_TIMEOUT'],
+        raise_on_error=False,
+        raise_on_exception=False,
+    )
+    failures = [
+        failure for failure in failures
+        if failure.get('delete', {}).get('status') != 404
+    ]
+
+    return successes, failures
+
+
+def replay_index_build(index, new_index):
+    """Write to the new version of an index the records written to the old one.
+
+    Returns:
+        Tuple[int, List[dict]]: the number of successes and the failures.
+    """
+    index_builds = IndexBuilds()
+    successes = 0
+    failures = []
+
+    uuids = index_builds.pop_pending(index)
+    while uuids:
+        batch_successes, batch_failures = index_records_into(uuids, index, new_index)
+        successes += batch_successes
+        failures.extend(batch_failures)
+        uuids = index_builds.pop_pending(index)
+
+    return successes, failures
@@ -24,8 +24,12 @@
 
 from __future__ import absolute_import, division, print_function
 
+from collections import defaultdict
+
+import flask
 from flask import current_app, url_for
 from jsonref import JsonLoader, JsonRef
+from six import iteritems, string_types
 from werkzeug.urls import url_parse
 
 import jsonresolver
@@ -33,43 +37,130 @@ from jsonresolver.contrib.jsonref import json_loader_factory
 
 from inspire_schemas.utils import load_schema
 from inspire_utils.urls import ensure_scheme
-from inspirehep.modules.pidstore.utils import get_pid_type_from_endpoint
+from inspirehep.modules.pidstore.utils import (
+    get_pid_type_from_endpoint,
+    get_pid_type_from_schema,
+)
 from inspirehep.utils import record_getter
+from inspirehep.utils.cache import LRUCache
 
 
 class AbstractRecordLoader(JsonLoader):
     """Base for resource-aware record loaders.
 
     Resolves the refered resource by the given uri by first checking against
-    local resources.
+    local resources. The resolved records are kept in an LRU cache on
+    ``flask.g``, so that they are loaded once per request or celery task, and
+    can be loaded in bulk beforehand with ``prefetch``. The records which
+    were not found are not cached, so that they are found once created.
     """
+    cache_name = None
 
     def get_record(self, pid_type, recid):
         raise NotImplementedError()
 
-    def get_remote_json(self, uri, **kwargs):
+    def get_records(self, pids):
+        """Load several records at once.
+
+        Args:
+            pids (List[Tuple[str, str]]): the (pid_type, recid) to load.
+
+        Returns:
+            dict: mapping from (pid_type, recid) to the records found.
+        """
+        raise NotImplementedError()
+
+    @property
+    def cache(self):
+        if not self.cache_name:
+            return None
+
+        cache = getattr(flask.g, self.cache_name, None)
+        if cache is None:
+            cache = LRUCache(current_app.config['INSPIRE_JSON_REF_CACHE_SIZE'])
+            setattr(flask.g, self.cache_name, cache)
+        return cache
+
+    def clear_cache(self):
+        if self.cache_name:
+            flask.g.pop(self.cache_name, None)
+
+    def parse_uri(self, uri):
+        """Return the (pid_type, recid) of a local uri.
+
+        Returns:
+            Optional[Tuple[str, str]]: ``None`` if the uri is not a local
+            record uri.
+        """
         parsed_uri = url_parse(uri)
+        if not self._is_local(parsed_uri):
+            return None
+
+        path_parts = parsed_uri.path.strip('/').split('/')
+        if len(path_parts) < 2:
+            return None
+
+        endpoint = path_parts[-2]
+        pid_type = get_pid_type_from_endpoint(endpoint)
+        recid = path_parts[-1]
+        return pid_type, recid
+
+    @staticmethod
+    def _is_local(parsed_uri):
         # Add http:// protocol so uri.netloc is correctly parsed.
         server_name = current_app.config.get('SERVER_NAME')
         parsed_server = url_parse(ensure_scheme(server_name))
 
-        if parsed_uri.netloc and parsed_uri.netloc != parsed_server.netloc:
+        return not parsed_uri.netloc or parsed_uri.netloc == parsed_server.netloc
+
+    def prefetch(self, uris):
+        """Load in bulk the records of the local uris which are not cached."""
+        cache = self.cache
+        if cache is None:
+            return
+
+        pids = set()
+        for uri in uris:
+            try:
+                pid = self.parse_uri(uri)
+            except KeyError:
+                continue
+            if pid and pid not in cache:
+                pids.add(pid)
+
+        if not pids:
+            return
+
+        records = self.get_records(sorted(pids))
+        for pid, record in iteritems(records):
+            cache[pid] = record
+
+    def get_remote_json(self, uri, **kwargs):
+        if not self._is_local(url_parse(uri)):
             return super(AbstractRecordLoader, self).get_remote_json(uri,
                                                                      **kwargs)
-        path_parts = parsed_uri.path.strip('/').split('/')
-        if len(path_parts) < 2:
+        pid = self.parse_uri(uri)
+        if not pid:
             current_app.logger.error('Bad JSONref URI: {0}'.format(uri))
             return None
 
-        endpoint = path_parts[-2]
-        pid_type = get_pid_type_from_endpoint(endpoint)
-        recid = path_parts[-1]
-        res = self.get_record(pid_type, recid)
+        cache = self.cache
+        if cache is not None and pid in cache:
+            return cache[pid]
+
+        res = self.get_record(*pid)
+        if cache is not None and res is not None:
+            cache[pid] = res
         return res
 
 
+def _get_pid(record):
+    return get_pid_type_from_schema(record['$schema']), str(record['control_number'])
+
+
 class ESJsonLoader(AbstractRecordLoader):
     """Resolve resources by retrieving them from Elasticsearch."""
+    cache_name = 'es_json_ref_cache'
 
     def get_record(self, pid_type, recid):
         try:
@@ -77,8 +168,20 @@ class ESJsonLoader(AbstractRecordLoader):
         except record_getter.RecordGetterError:
             return None
 
+    def get_records(self, pids):
+        recids_by_pid_type = defaultdict(list)
+        for pid_type, recid in pids:
+            recids_by_pid_type[pid_type].append(recid)
+
+        records = {}
+        for pid_type, recids in iteritems(recids_by_pid_type):
+            for record in record_getter.get_es_records(pid_type, recids):
+                records[_get_pid(record)] = record
+        return records
+
 
 class DatabaseJsonLoader(AbstractRecordLoader):
+    cache_name = 'db_json_ref_cache'
 
     def get_record(self, pid_type, recid):
         try:
@@ -86,9 +189,14 @@ class DatabaseJsonLoader(AbstractRecordLoader):
         except record_getter.RecordGetterError:
             return None
 
+    def get_records(self, pids):
+        return record_getter.get_db_record_instances(pids)
+
 
-es_record_loader = ESJsonLoader()
-db_record_loader = DatabaseJsonLoader()
+# Results are cached per request or task by the loaders themselves, the cache
+# of jsonref would keep them for the lifetime of the process.
+es_record_loader = ESJsonLoader(cache_results=False)
+db_record_loader = DatabaseJsonLoader(cache_results=False)
 SCHEMA_LOADER_CLS = json_loader_factory(
     jsonresolver.JSONResolver(
         plugins=['invenio_jsonschemas.jsonresolver']
@@ -145,4 +253,18 @@ def replace_refs(obj, source='db'):
         raise ValueError('source must be one of {}'.format(loaders.keys()))
 
     loader = loaders[source]
+    if loader:
+        loader.prefetch(_get_refs(obj))
     return JsonRef.replace_refs(obj, loader=loader, load_on_repr=False)
+
+
+def _get_refs(obj):
+    """Return all the ``$ref`` in a JSON document."""
+    if isinstance(obj, dict):
+        refs = [obj['$ref']] if isinstance(obj.get('$ref'), string_types) else []
+        for value in obj.values():
+            refs.extend(_get_refs(value))
+        return refs
+    elif isinstance(obj, (list, tuple)):
+        return [ref for item in obj for ref in _get_refs(item)]
+    return []
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Models for Records."""
+
+from __future__ import absolute_import, division, print_function
+
+from sqlalchemy_utils.types import UUIDType
+
+from invenio_db import db
+
+
+class RecordCitations(db.Model):
+    """Edge of the citation graph: a Literature record citing a pid."""
+
+    __tablename__ = 'records_citations'
+    __table_args__ = (
+        db.PrimaryKeyConstraint('citer_id', 'cited_pid_type', 'cited_pid_value'),
+        db.Index('ix_records_citations_cited', 'cited_pid_type', 'cited_pid_value'),
+    )
+
+    citer_id = db.Column(
+        UUIDType,
+        db.ForeignKey('records_metadata.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    cited_pid_type = db.Column(db.String(6), nullable=False)
+    cited_pid_value = db.Column(db.String(255), nullable=False)
+
+
+class RecordCitationsCount(db.Model):
+    """Number of Literature records citing a pid."""
+
+    __tablename__ = 'records_citations_count'
+
+    pid_type = db.Column(db.String(6), primary_key=True)
+    pid_value = db.Column(db.String(255), primary_key=True)
+    citation_count = db.Column(db.Integer, default=0, nullable=False)
+
+
+class RecordAuthors(db.Model):
+    """Signature of an author with a recid on a Literature record."""
+
+    __tablename__ = 'records_authors'
+    __table_args__ = (
+        db.PrimaryKeyConstraint('record_id', 'author_recid'),
+        db.Index('ix_records_authors_author_recid', 'author_recid'),
+    )
+
+    record_id = db.Column(
+        UUIDType,
+        db.ForeignKey('records_metadata.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    author_recid = db.Column(db.Integer, nullable=False)
+    full_name = db.Column(db.Text, nullable=False)
@@ -26,33 +26,49 @@ from __future__ import absolute_import, division, print_function
 
 import uuid
 import logging
+from collections import defaultdict
+from contextlib import contextmanager
 from copy import deepcopy
 
+import flask
 from flask import current_app
 from flask_sqlalchemy import models_committed
 from elasticsearch import NotFoundError
 from time_execution import time_execution
 
+from invenio_indexer.signals import before_record_index
+from invenio_pidstore.models import PersistentIdentifier
 from invenio_records.models import RecordMetadata
 from invenio_records.signals import (
+    after_record_insert,
     after_record_update,
     before_record_insert,
     before_record_update,
 )
 
+from inspire_dojson.utils import get_recid_from_ref
 from inspire_utils.record import get_value
 
-from inspirehep.modules.authors.utils import phonetic_blocks
+from inspirehep.modules.authors.utils import invalidate_author_stats, phonetic_blocks
 from inspirehep.modules.orcid import tasks as orcid_tasks
 from inspirehep.modules.orcid.utils import (
     get_push_access_tokens,
     get_orcids_for_push,
 )
+from inspirehep.modules.pidstore.cache import PidCache
 from inspirehep.modules.pidstore.utils import get_pid_type_from_schema
+from inspirehep.modules.refextract.matcher import get_reference_match_queries
+from inspirehep.modules.refextract.tasks import invalidate_reference_matches
 from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.records.citation_graph import log_citation_changes
 from inspirehep.modules.records.errors import MissingInspireRecordError
+from inspirehep.modules.records.index_versions import IndexBuilds
+from inspirehep.modules.records.serializers.cache import SerializedRecordCache
 from inspirehep.modules.records.tasks import index_modified_citations_from_record
 from inspirehep.modules.records.utils import (
+    get_citations_counts,
+    get_linked_records_by_pid,
+    get_publication_info_linked_records,
     is_author,
     is_book,
     is_data,
@@ -73,6 +89,7 @@ from inspirehep.modules.records.utils import (
     populate_inspire_document_type,
     populate_name_variations,
     populate_number_of_references,
+    populate_publication_info_linked_titles,
     populate_recid_from_ref,
     populate_title_suggest,
     populate_facet_author_name,
@@ -82,6 +99,26 @@ from inspirehep.modules.records.indexer import InspireRecordIndexer
 LOGGER = logging.getLogger(__name__)
 
 
+@contextmanager
+def skip_indexing_receivers():
+    """Skip the receivers indexing records.
+
+    The flag is stored on ``flask.g``, so unlike disconnecting the receivers
+    it only affects the current request or celery task, which are then
+    responsible for indexing the records they write.
+    """
+    previous = getattr(flask.g, 'skip_indexing_receivers', False)
+    flask.g.skip_indexing_receivers = True
+    try:
+        yield
+    finally:
+        flask.g.skip_indexing_receivers = previous
+
+
+def _indexing_receivers_skipped():
+    return getattr(flask.g, 'skip_indexing_receivers', False)
+
+
 @before_record_insert.connect
 @before_record_update.connect
 def assign_phonetic_block(sender, record, *args, **kwargs):
@@ -142,26 +179,93 @@ def push_to_orcid(sender, record, *args, **kwargs):
     orcids_and_tokens = get_push_access_tokens(orcids)
 
     for orcid, access_token in orcids_and_tokens:
-        orcid_tasks.orcid_push.apply_async(
-            queue='orcid_push',
-            kwargs={
-                'orcid': orcid,
-                'rec_id': record['control_number'],
-                'oauth_token': access_token,
-            },
+        orcid_tasks.schedule_orcid_push(
+            orcid,
+            [record['control_number']],
+            access_token,
         )
 
 
+@after_record_insert.connect
+@after_record_update.connect
+def update_citations(sender, record, *args, **kwargs):
+    """Keep the citations table in sync with the references of the record."""
+    if isinstance(record, InspireRecord):
+        record.update_citations()
+
+
+@after_record_insert.connect
+@after_record_update.connect
+def update_authors(sender, record, *args, **kwargs):
+    """Keep the authors table in sync with the authors of the record."""
+    if isinstance(record, InspireRecord):
+        record.update_authors()
+
+
 @after_record_update.connect
 def enhance_record(sender, record, *args, **kwargs):
     """Enhance the record for ES"""
     if not isinstance(record, InspireRecord):
         raise MissingInspireRecordError("Record is not InspireRecord!")
+    if _indexing_receivers_skipped():
+        return
     enhanced_record = deepcopy(record)
     enhance_before_index(enhanced_record)
     record.model._enhanced_record = enhanced_record
 
 
+@models_committed.connect
+def invalidate_pid_cache_after_commit(sender, changes):
+    """Invalidate the cached pids changed by a transaction once committed.
+
+    They are also invalidated when they change, but they might have been
+    cached again from the state of the DB before the commit in the meantime.
+    """
+    pids = [
+        (model_instance.pid_type, model_instance.pid_value)
+        for model_instance, change in changes
+        if isinstance(model_instance, PersistentIdentifier)
+    ]
+    if pids:
+        PidCache().invalidate(pids=pids)
+
+
+@models_committed.connect
+def invalidate_reference_matches_after_commit(sender, changes):
+    """Invalidate the cached reference matches of the records committed.
+
+    The invalidation is delayed by ``INSPIRE_REFERENCE_MATCH_INVALIDATION_DELAY``
+    seconds, so that the records are already indexed and searchable, and
+    the matcher runs in between cannot cache results without them.
+
+    Only the queries compiled from the current identifiers and publication
+    info of a record are invalidated, so the ones it matched through values
+    which were removed by the commit expire with the TTL of the cache.
+    """
+    query_keys = set()
+    for model_instance, change in changes:
+        if isinstance(model_instance, RecordMetadata) and model_instance.json:
+            query_keys.update(get_reference_match_queries(model_instance.json))
+
+    if query_keys:
+        invalidate_reference_matches.apply_async(
+            args=[sorted(query_keys)],
+            countdown=current_app.config['INSPIRE_REFERENCE_MATCH_INVALIDATION_DELAY'],
+        )
+
+
+@models_committed.connect
+def update_citation_graph_after_commit(sender, changes):
+    """Log the citations changed by a transaction once committed."""
+    citation_graph_changes = []
+    for model_instance, change in changes:
+        if hasattr(model_instance, '_citation_graph_changes'):
+            citation_graph_changes.extend(model_instance._citation_graph_changes)
+            del model_instance._citation_graph_changes
+
+    log_citation_changes(citation_graph_changes)
+
+
 @models_committed.connect
 def index_after_commit(sender, changes):
     """Index a record in ES after it was committed to the DB.
@@ -169,11 +273,31 @@ def index_after_commit(sender, changes):
     This cannot happen in an ``after_record_commit`` receiver from Invenio-Records
     because, despite the name, at that point we are not yet sure whether the record
     has been really committed to the DB.
+
+    The records written to an index of which a new version is being built are
+    tracked with ``IndexBuilds``, to be replayed on the new version, and the
+    cached serializations of the committed records are invalidated. The
+    records of a paused index are only tracked, but the records whose
+    citations they changed are still reindexed.
     """
+    if _indexing_receivers_skipped():
+        return
+
     indexer = InspireRecordIndexer()
+    index_builds = IndexBuilds()
+    paused = index_builds.paused()
+    uuids_by_index = defaultdict(list)
     for model_instance, change in changes:
         if isinstance(model_instance, RecordMetadata):
-            if change in ('insert', 'update') and not model_instance.json.get("deleted"):
+            index = None
+            if model_instance.json:
+                index, _ = indexer.record_to_index(model_instance.json)
+                uuids_by_index[index].append(str(model_instance.id))
+
+            if index in paused:
+                # Only tracked, to be written to the new version of the index.
+                pass
+            elif change in ('insert', 'update') and not model_instance.json.get("deleted"):
                 if hasattr(model_instance, '_enhanced_record'):
                     record = model_instance._enhanced_record
                 else:
@@ -189,16 +313,73 @@ def index_after_commit(sender, changes):
                                  model_instance.json.get("id"))
                     pass
 
-            pid_type = get_pid_type_from_schema(model_instance.json['$schema'])
-            pid_value = model_instance.json['control_number']
-            db_version = model_instance.version_id
+            reindex_modified_citations(model_instance)
+
+    if uuids_by_index:
+        index_builds.track(uuids_by_index)
+        SerializedRecordCache().invalidate(
+            [uuid for uuids in uuids_by_index.values() for uuid in uuids]
+        )
+
+
+@before_record_index.connect
+def invalidate_author_stats_before_index(sender, json=None, *args, **kwargs):
+    """Invalidate the cached statistics of the authors of a reindexed record.
+
+    A record is also reindexed when its citation count changes, so this
+    covers the records citing the papers of the authors.
+    """
+    if not json or not is_hep(json):
+        return
+
+    author_recids = [
+        get_recid_from_ref(ref) for ref in get_value(json, 'authors.record', [])
+    ]
+    invalidate_author_stats(recid for recid in author_recids if recid)
+
 
-            index_modified_citations_from_record.delay(pid_type, pid_value, db_version)
+def reindex_modified_citations(model_instance):
+    """Reindex the records whose citations changed with a committed record."""
+    if not _has_modified_citations(model_instance):
+        return
+
+    pid_type = get_pid_type_from_schema(model_instance.json['$schema'])
+    pid_value = model_instance.json['control_number']
+    db_version = model_instance.version_id
+
+    index_modified_citations_from_record.delay(pid_type, pid_value, db_version)
+
+
+def _has_modified_citations(model_instance):
+    """Tell whether the commit of a record changed which records it cites.
+
+    Only Literature records cite other records. When the record went through
+    ``InspireRecord.update_citations`` the cited records that changed are
+    known, otherwise they have to be computed from the record versions.
+    """
+    if not model_instance.json or not is_hep(model_instance.json):
+        return False
+
+    modified_citations = getattr(model_instance, '_modified_citations', None)
+    if modified_citations is None:
+        return True
 
+    del model_instance._modified_citations
+    return bool(modified_citations)
 
-def enhance_before_index(record):
+
+def enhance_before_index(
+    record,
+    citations_counts=None,
+    linked_authors=None,
+    name_variations_cache=None,
+    publication_info_linked_records=None,
+):
     """Run all the receivers that enhance the record for ES in the right order.
 
+    The optional arguments are lookups shared between several records, see
+    ``enhance_before_index_batch``.
+
     .. note::
 
        ``populate_recid_from_ref`` **MUST** come before ``populate_bookautocomplete``
@@ -214,10 +395,11 @@ def enhance_before_index(record):
         populate_author_count(record)
         populate_authors_full_name_unicode_normalized(record)
         populate_inspire_document_type(record)
-        populate_name_variations(record)
+        populate_name_variations(record, cache=name_variations_cache)
         populate_number_of_references(record)
-        populate_citations_count(record=record)
-        populate_facet_author_name(record)
+        populate_citations_count(record=record, citations_counts=citations_counts)
+        populate_facet_author_name(record, linked_authors=linked_authors)
+        populate_publication_info_linked_titles(record, linked_records=publication_info_linked_records)
 
     elif is_author(record):
         populate_authors_name_variations(record)
@@ -236,4 +418,30 @@ def enhance_before_index(record):
         populate_title_suggest(record)
 
     elif is_data(record):
-        populate_citations_count(record)
+        populate_citations_count(record, citations_counts=citations_counts)
+
+
+def enhance_before_index_batch(records):
+    """Enhance several records for ES at once.
+
+    Same as calling ``enhance_before_index`` on every record, but the
+    citation counts, the linked authors and the records linked by the
+    publication info of all the records are fetched with one query each, and
+    the name variations of the authors are computed once per name.
+    """
+    hep_records = [record for record in records if is_hep(record)]
+    citations_counts = get_citations_counts(
+        record for record in records if is_hep(record) or is_data(record)
+    )
+    linked_authors = get_linked_records_by_pid(hep_records, 'authors.record')
+    publication_info_linked_records = get_publication_info_linked_records(hep_records)
+    name_variations_cache = {}
+
+    for record in records:
+        enhance_before_index(
+            record,
+            citations_counts=citations_counts,
+            linked_authors=linked_authors,
+            name_variations_cache=name_variations_cache,
+            publication_info_linked_records=publication_info_linked_records,
+        )
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Coalescing queue of records to reindex after their citations changed."""
+
+from __future__ import absolute_import, division, print_function
+
+import flask
+from flask import current_app as app
+from redis import StrictRedis
+
+
+class CitationsReindexQueue(object):
+    """Redis set of the uuids of records whose citations changed.
+
+    The uuids pushed within the same time window are deduplicated, so that a
+    record cited by many records committed in a short time is reindexed only
+    once when the queue is flushed.
+    """
+    key = 'citations_reindex_queue'
+    scheduled_key = 'citations_reindex_queue:scheduled'
+    pushed_key = 'citations_reindex_queue:pushed'
+    flushed_key = 'citations_reindex_queue:flushed'
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    def push(self, uuids, window):
+        """Add uuids to the queue.
+
+        Args:
+            uuids (List[str]): uuids of the records to reindex.
+            window (int): number of seconds after which the queue is
+                flushed.
+
+        Returns:
+            bool: ``True`` if no flush is scheduled for the current window, in
+            which case the caller is responsible for scheduling it.
+        """
+        with self.redis.pipeline() as pipe:
+            pipe.sadd(self.key, *uuids)
+            pipe.incrby(self.pushed_key, len(uuids))
+            pipe.set(self.scheduled_key, 1, nx=True, ex=max(window, 1))
+            _, _, needs_flush = pipe.execute()
+
+        return bool(needs_flush)
+
+    def pop_all(self):
+        """Atomically remove all uuids from the queue and return them.
+
+        This also closes the current window, so that the next push schedules
+        a new flush.
+        """
+        with self.redis.pipeline() as pipe:
+            pipe.smembers(self.key)
+            pipe.delete(self.key)
+            pipe.delete(self.scheduled_key)
+            uuids, _, _ = pipe.execute()
+
+        if uuids:
+            self.redis.incrby(self.flushed_key, len(uuids))
+
+        return list(uuids)
+
+    def metrics(self):
+        """Return the queue depth and how many pushes were coalesced.
+
+        The coalescing ratio is the number of pushed uuids per distinct
+        uuid reindexed or waiting to be.
+        """
+        with self.redis.pipeline() as pipe:
+            pipe.scard(self.key)
+            pipe.get(self.pushed_key)
+            pipe.get(self.flushed_key)
+            depth, pushed, flushed = pipe.execute()
+
+        pushed = int(pushed or 0)
+        distinct = int(flushed or 0) + depth
+
+        return {
+            'queue_depth': depth,
+            'pushed': pushed,
+            'coalescing_ratio': pushed / distinct if distinct else None,
+        }
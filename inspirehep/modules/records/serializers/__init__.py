@@ -43,7 +43,12 @@ from .schemas.json import (
     AuthorsRecordSchemaJSONUIV1,
 )
 from .marcxml import MARCXMLSerializer
-from .response import record_responsify_nocache, facets_responsify
+from .response import (
+    facets_responsify,
+    record_responsify_cached,
+    record_responsify_nocache,
+    stream_responsify,
+)
 
 json_literature_ui_v1 = LiteratureJSONUISerializer(
     LiteratureRecordSchemaJSONUIV1
@@ -116,10 +121,15 @@ json_authors_ui_v1_response = record_responsify_nocache(
 bibtex_v1 = PybtexSerializerBase(PybtexSchema(), BibtexWriter())
 marcxml_v1 = MARCXMLSerializer()
 
-bibtex_v1_response = record_responsify_nocache(bibtex_v1,
-                                               'application/x-bibtex')
-marcxml_v1_response = record_responsify_nocache(marcxml_v1,
-                                                'application/marcxml+xml')
+bibtex_v1_response = record_responsify_cached(bibtex_v1,
+                                              'application/x-bibtex',
+                                              version='1')
+marcxml_v1_response = record_responsify_cached(marcxml_v1,
+                                               'application/marcxml+xml',
+                                               version='1')
 
 bibtex_v1_search = search_responsify(bibtex_v1, 'application/x-bibtex')
 marcxml_v1_search = search_responsify(marcxml_v1, 'application/marcxml+xml')
+
+bibtex_v1_stream = stream_responsify(bibtex_v1, 'application/x-bibtex')
+marcxml_v1_stream = stream_responsify(marcxml_v1, 'application/marcxml+xml')
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+"""Cache of the serialized records."""
+
+from __future__ import absolute_import, division, print_function
+
+import flask
+import six
+from flask import current_app as app
+from redis import StrictRedis
+
+
+class SerializedRecordCache(object):
+    """Redis cache of the output of the record serializers.
+
+    The serializations of a record are kept in a hash of their own, keyed by
+    the ETag of each serialization, which is computed from the uuid and the
+    revision of the record, the media type and the version of the serializer
+    (see ``get_serialized_record_etag``). The new revisions of a record and
+    the new versions of a serializer are then never served stale output, and
+    the hash of a record is deleted when it is committed so that the old
+    serializations don't wait to expire. The hashes expire after
+    ``INSPIRE_SERIALIZER_CACHE_TTL`` seconds, which also makes them the
+    first candidates for eviction when Redis uses a ``volatile-lru`` policy.
+
+    As the ETag does not depend on the user, only the serializers whose
+    output is the same for every user can be cached.
+    """
+    key = 'serialized_record:{}'
+    hits_key = 'serialized_record_cache:hits'
+    misses_key = 'serialized_record_cache:misses'
+
+    TEXT = b't'
+    BYTES = b'b'
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    def get(self, uuid, etag):
+        """Return the cached serialization of a record, if any."""
+        data = self.redis.hget(self.key.format(uuid), etag)
+        self.redis.incr(self.misses_key if data is None else self.hits_key)
+        if data is None:
+            return None
+
+        kind, data = data[:1], data[1:]
+        return data.decode('utf-8') if kind == self.TEXT else data
+
+    def set(self, uuid, etag, data):
+        """Cache a serialization of a record.
+
+        The serializers return either text or bytes, like the MARCXML one, so
+        only text is encoded, and its type is stored with it so that ``get``
+        returns it as it was produced.
+        """
+        if isinstance(data, six.text_type):
+            data = self.TEXT + data.encode('utf-8')
+        else:
+            data = self.BYTES + data
+
+        key = self.key.format(uuid)
+        with self.redis.pipeline() as pipe:
+            pipe.hset(key, etag, data)
+            pipe.expire(key, app.config['INSPIRE_SERIALIZER_CACHE_TTL'])
+            pipe.execute()
+
+    def invalidate(self, uuids):
+        """Remove all the cached serializations of several records."""
+        if uuids:
+            self.redis.delete(*[self.key.format(uuid) for uuid in uuids])
+
+    def metrics(self):
+        """Return the number of hits and misses, and the hit rate."""
+        with self.redis.pipeline() as pipe:
+            pipe.get(self.hits_key)
+            pipe.get(self.misses_key)
+            hits, misses = pipe.execute()
+
+        hits = int(hits or 0)
+        misses = int(misses or 0)
+
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else None,
+        }
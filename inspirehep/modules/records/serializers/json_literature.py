@@ -29,6 +29,9 @@ import json
 from invenio_records_rest.serializers.json import JSONSerializer
 
 from inspire_utils.date import format_date
+from inspire_utils.record import get_value
+from inspirehep.modules.records.json_ref_loader import es_record_loader
+from inspirehep.modules.records.utils import PUBLICATION_INFO_LINKED_TITLES
 from inspirehep.modules.records.wrappers import LiteratureRecord
 
 
@@ -61,6 +64,24 @@ def _get_ui_metadata(record):
     return display
 
 
+def _prefetch_publication_info_linked_records(hits):
+    """Load at once the records linked by the publication info of the hits.
+
+    Only the links whose titles were not denormalized at index time, see
+    ``populate_publication_info_linked_titles``, have to be resolved when
+    computing the conference information of the hits.
+    """
+    uris = set()
+    for hit in hits:
+        for publication_info in get_value(hit, '_source.publication_info', []):
+            for field, title_field in PUBLICATION_INFO_LINKED_TITLES:
+                uri = get_value(publication_info, field + '.$ref')
+                if uri and title_field not in publication_info:
+                    uris.add(uri)
+
+    es_record_loader.prefetch(uris)
+
+
 def get_citations_count(original_record):
     """ Try to get citations"""
     if hasattr(original_record, 'get_citations_count'):
@@ -89,6 +110,15 @@ class LiteratureJSONUISerializer(JSONSerializer):
         )
         return _preprocess_result(result, record)
 
+    def serialize_search(self, pid_fetcher, search_result, links=None,
+                         item_links_factory=None, **kwargs):
+        _prefetch_publication_info_linked_records(
+            search_result['hits']['hits'])
+        return super(LiteratureJSONUISerializer, self).serialize_search(
+            pid_fetcher, search_result, links=links,
+            item_links_factory=item_links_factory, **kwargs
+        )
+
     def preprocess_search_hit(self, pid, record_hit, links_factory=None,
                               **kwargs):
         result = super(LiteratureJSONUISerializer, self). \
@@ -46,3 +46,11 @@ class MARCXMLSerializer(object):
         """Serialize a search result as MARCXML."""
         result = [record2marcxml(el['_source']) for el in search_result['hits']['hits']]
         return MARCXML_TEMPLATE.format(''.join(result))
+
+    def serialize_stream(self, hits_pages):
+        """Serialize pages of search hits as a stream of MARCXML."""
+        header, footer = MARCXML_TEMPLATE.split('{}')
+        yield header
+        for hits in hits_pages:
+            yield ''.join(record2marcxml(hit['_source']) for hit in hits)
+        yield footer
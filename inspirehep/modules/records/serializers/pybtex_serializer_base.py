@@ -94,3 +94,16 @@ class PybtexSerializerBase(object):
         """
         records = [hit['_source'] for hit in search_result['hits']['hits']]
         return self.create_bibliography(records)
+
+    def serialize_stream(self, hits_pages):
+        """Serialize pages of search hits as a stream.
+
+        Args:
+            hits_pages: iterable of lists of Elasticsearch hits, e.g. the
+                pages of a scroll.
+
+        Returns:
+            generator: the serialized bibliography of each page.
+        """
+        for hits in hits_pages:
+            yield self.create_bibliography(hit['_source'] for hit in hits)
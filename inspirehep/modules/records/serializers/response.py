@@ -27,7 +27,25 @@ Responsible for creating a HTTP response given the output of a serializer.
 
 from __future__ import absolute_import, division, print_function
 
-from flask import current_app
+import hashlib
+import zlib
+
+import pkg_resources
+import six
+from flask import current_app, request, stream_with_context
+
+from inspirehep.modules.records.serializers.cache import SerializedRecordCache
+
+SERIALIZERS_DEPENDENCIES = (
+    'inspire-dojson',
+    'inspire-schemas',
+    'inspire-utils',
+    'marshmallow',
+    'pybtex',
+)
+"""Distributions whose code produces part of the output of the serializers."""
+
+_dependencies_version = None
 
 
 def record_responsify_nocache(serializer, mimetype):
@@ -47,6 +65,78 @@ def record_responsify_nocache(serializer, mimetype):
         if headers is not None:
             response.headers.extend(headers)
         return response
+    view.source_includes = getattr(serializer, 'source_includes', None)
+    return view
+
+
+def _get_dependencies_version():
+    global _dependencies_version
+
+    if _dependencies_version is None:
+        versions = []
+        for name in SERIALIZERS_DEPENDENCIES:
+            try:
+                versions.append(pkg_resources.get_distribution(name).version)
+            except pkg_resources.DistributionNotFound:
+                versions.append('')
+        _dependencies_version = ','.join(versions)
+
+    return _dependencies_version
+
+
+def get_serialized_record_etag(record, mimetype, version):
+    """Return the ETag of a serialization of a record.
+
+    It changes with the revision of the record, and with the version of the
+    serializer or of any of the ``SERIALIZERS_DEPENDENCIES``, so that
+    upgrading them invalidates the cached serializations.
+    """
+    key = u'{}:{}:{}:{}:{}'.format(
+        record.id,
+        record.revision_id,
+        mimetype,
+        version,
+        _get_dependencies_version(),
+    )
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def record_responsify_cached(serializer, mimetype, version):
+    """Create a Records-REST response serializer with a cache.
+
+    The serializations are cached with ``SerializedRecordCache`` by ETag,
+    and the requests whose ``If-None-Match`` contains the ETag of the record
+    get a ``304 Not Modified`` without the record being serialized.
+
+    :param serializer: Serializer instance.
+    :param mimetype: MIME type of response.
+    :param version: version of the serializer, to bump whenever its output
+        changes.
+    """
+    def view(pid, record, code=200, headers=None, links_factory=None):
+        if getattr(record, 'revision_id', None) is None:
+            return record_responsify_nocache(serializer, mimetype)(
+                pid, record, code=code, headers=headers,
+                links_factory=links_factory)
+
+        etag = get_serialized_record_etag(record, mimetype, version)
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            cache = SerializedRecordCache()
+            data = cache.get(record.id, etag)
+            if data is None:
+                data = serializer.serialize(
+                    pid, record, links_factory=links_factory)
+                cache.set(record.id, etag, data)
+            response = current_app.response_class(data, mimetype=mimetype)
+            response.status_code = code
+
+        response.set_etag(etag)
+        if headers is not None:
+            response.headers.extend(headers)
+        return response
+    view.source_includes = getattr(serializer, 'source_includes', None)
     return view
 
 
@@ -70,4 +160,54 @@ def facets_responsify(serializer, mimetype):
         if headers is not None:
             response.headers.extend(headers)
         return response
+    view.source_includes = getattr(serializer, 'source_includes', None)
+    return view
+
+
+def _encode(chunks):
+    for chunk in chunks:
+        if isinstance(chunk, six.text_type):
+            chunk = chunk.encode('utf-8')
+        yield chunk
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_responsify(serializer, mimetype):
+    """Create a streaming search response serializer.
+
+    The body is generated while the pages of search hits are read, so that
+    the memory used does not depend on the number of hits, and is gzipped
+    if the client accepts it.
+
+    Args:
+        serializer: Serializer instance, with a ``serialize_stream`` method,
+            and optionally a ``source_includes`` list of the only fields of
+            the records it reads.
+        mimetype: MIME type of response.
+    """
+    def view(hits_pages, code=200, headers=None):
+        chunks = _encode(serializer.serialize_stream(hits_pages))
+        gzipped = 'gzip' in request.accept_encodings
+        if gzipped:
+            chunks = _gzip(chunks)
+
+        response = current_app.response_class(
+            stream_with_context(chunks),
+            mimetype=mimetype)
+        response.status_code = code
+        if gzipped:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        if headers is not None:
+            response.headers.extend(headers)
+        return response
+    view.source_includes = getattr(serializer, 'source_includes', None)
     return view
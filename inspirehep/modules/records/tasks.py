@@ -29,8 +29,8 @@ from celery.utils.log import get_task_logger
 from elasticsearch.helpers import bulk, scan
 from flask import current_app
 from six import iteritems
-from sqlalchemy import tuple_
-from sqlalchemy.orm.exc import NoResultFound, StaleDataError
+from sqlalchemy.orm.exc import StaleDataError
+from time_execution.decorator import write_metric
 
 from invenio_db import db
 from invenio_pidstore.models import PersistentIdentifier
@@ -39,9 +39,15 @@ from invenio_search import current_search_client as es
 from inspire_dojson.utils import get_recid_from_ref
 from inspirehep.modules.records.api import InspireRecord
 from inspirehep.modules.records.errors import MissingCitedRecordError
+from inspirehep.modules.records.index_versions import (
+    skip_paused_index_ops,
+    track_index_ops,
+)
+from inspirehep.modules.records.reindex_queue import CitationsReindexQueue
 from inspirehep.modules.records.utils import get_endpoint_from_record
+from inspirehep.modules.pidstore.cache import PidCache
 from inspirehep.modules.pidstore.utils import get_pid_type_from_schema
-from inspirehep.utils.record import create_index_op
+from inspirehep.utils.record import create_index_ops
 from inspirehep.utils.record_getter import get_db_record, RecordGetterError
 
 
@@ -186,17 +192,30 @@ def get_merged_records():
 
 @shared_task(ignore_result=False, max_retries=0)
 def batch_reindex(uuids, request_timeout=None):
-    """Task for bulk reindexing records."""
+    """Task for bulk reindexing records.
+
+    The records are loaded with a single query and enhanced together, see
+    ``create_index_ops``. They are tracked with ``IndexBuilds``, as this
+    task also updates the citation counts of records while a new version of
+    their index is being built.
+    """
     def actions():
-        for uuid in uuids:
-            try:
-                record = InspireRecord.get_record(uuid)
-                if record.get('deleted', False):
-                    logger.debug("Record already %s deleted, not indexing!", uuid)
-                    continue
-                yield create_index_op(record, version_type='force')
-            except NoResultFound as e:
-                logger.warn('Record %s failed to load: %s', uuid, e)
+        records = InspireRecord.get_records(uuids)
+
+        missing_uuids = set(uuids) - set(str(record.id) for record in records)
+        for uuid in missing_uuids:
+            logger.warn('Record %s failed to load: not found', uuid)
+
+        records_to_index = []
+        for record in records:
+            if record.get('deleted', False):
+                logger.debug("Record already %s deleted, not indexing!", record.id)
+                continue
+            records_to_index.append(record)
+
+        ops = create_index_ops(records_to_index, version_type='force')
+        track_index_ops(ops)
+        return skip_paused_index_ops(ops)
 
     if not request_timeout:
         request_timeout = current_app.config['INDEXER_BULK_REQUEST_TIMEOUT']
@@ -215,6 +234,55 @@ def batch_reindex(uuids, request_timeout=None):
     }
 
 
+@shared_task(ignore_result=True, bind=True, max_retries=3)
+def flush_citations_reindex_queue(self):
+    """Reindex all the records collected by the citations reindex queue.
+
+    This task is scheduled once per ``INDEXER_CITATIONS_REINDEX_WINDOW`` by
+    ``index_modified_citations_from_record``, so that records whose citations
+    changed several times in the window are reindexed only once. The records
+    which failed to be reindexed are queued again and retried with the task,
+    and they are dropped with an error once the retries are exhausted.
+    """
+    queue = CitationsReindexQueue()
+    uuids = queue.pop_all()
+
+    metrics = queue.metrics()
+    write_metric('citations_reindex_queue', flushed=len(uuids), **metrics)
+    logger.info(
+        'Flushing %d records from the citations reindex queue: %s',
+        len(uuids), metrics,
+    )
+
+    if not uuids:
+        return
+
+    try:
+        result = batch_reindex(uuids)
+        failed_uuids = [
+            failure[op_type]['_id']
+            for failure in result['failures']
+            for op_type in failure
+        ]
+    except Exception:
+        logger.exception('Failed to reindex the citations reindex queue')
+        failed_uuids = uuids
+
+    if not failed_uuids:
+        return
+
+    if self.request.retries >= self.max_retries:
+        logger.error(
+            'Dropping %d records from the citations reindex queue after %d retries: %s',
+            len(failed_uuids), self.max_retries, failed_uuids,
+        )
+        return
+
+    window = current_app.config['INDEXER_CITATIONS_REINDEX_WINDOW']
+    queue.push(failed_uuids, window)
+    raise self.retry(countdown=window)
+
+
 @shared_task(ignore_result=False, bind=True, max_retries=12)
 def index_modified_citations_from_record(self, pid_type, pid_value, db_version):
     """Index records from the record's citations.
@@ -266,19 +334,16 @@ def index_modified_citations_from_record(self, pid_type, pid_value, db_version):
                                              count_pids=len(pids))
     )
 
-    uuids = [
-        str(pid.object_uuid) for pid in
-        db.session.query(PersistentIdentifier.object_uuid).filter(
-            PersistentIdentifier.object_type == 'rec',
-            tuple_(PersistentIdentifier.pid_type, PersistentIdentifier.pid_value).in_(pids)
-        )
-    ]
+    uuids = list(PidCache().get_uuids(pids).values())
 
     if uuids:
-        logger.info("({pid_value}) contains pids - starting batch".format(
+        logger.info("({pid_value}) contains pids - queueing for reindex".format(
             pid_value=pid_value)
         )
-        return batch_reindex(uuids)
+        window = current_app.config['INDEXER_CITATIONS_REINDEX_WINDOW']
+        if CitationsReindexQueue().push(uuids, window):
+            flush_citations_reindex_queue.apply_async(countdown=window)
+        return uuids
 
     raise MissingCitedRecordError(
         'Cited records to reindex not found:\nuuids: {}'.format(uuids)
@@ -35,12 +35,14 @@ from inspire_utils.name import generate_name_variations, ParsedName
 from inspire_utils.record import get_value
 from inspire_utils.helpers import force_list
 from invenio_db import db
+from sqlalchemy import tuple_
 
 from inspirehep.modules.pidstore.utils import (
     get_endpoint_from_pid_type,
     get_pid_type_from_schema
 )
 from inspirehep.modules.records.errors import MissingInspireRecordError
+from inspirehep.modules.records.models import RecordCitationsCount
 from inspirehep.utils.record_getter import get_db_records
 from inspire_utils.record import get_values_for_schema
 from inspirehep.modules.search import LiteratureSearch
@@ -94,6 +96,14 @@ def get_pid_from_record_uri(record_uri):
     return pid_type, pid_value
 
 
+def get_pid_from_record(record):
+    """Return the (pid_type, pid_value) pair of a record, if it has one."""
+    if 'control_number' not in record:
+        return None
+
+    return get_pid_type_from_schema(record['$schema']), str(record['control_number'])
+
+
 def get_author_display_name(name):
     """Returns the display name in format Firstnames Lastnames"""
     parsed_name = ParsedName.loads(name)
@@ -128,6 +138,32 @@ def get_linked_records_in_field(record, field_path):
     return get_db_records(pids)
 
 
+def get_linked_records_by_pid(records, field_path):
+    """Get all linked records in a given field of several records at once.
+
+    Args:
+        records (Iterable[dict]): the records containing the links
+        field_path (string): a dotted field path specification understandable
+            by ``get_value``, containing a json reference to another record.
+
+    Returns:
+        Dict[Tuple[str, str], dict]: the linked records, by their pid.
+    """
+    full_path = '.'.join([field_path, '$ref'])
+    pids = set()
+    for record in records:
+        pids.update(
+            get_pid_from_record_uri(rec)
+            for rec in force_list(get_value(record, full_path, []))
+        )
+    pids.discard(None)
+
+    return {
+        get_pid_from_record(linked_record): linked_record
+        for linked_record in get_db_records(pids)
+    }
+
+
 def populate_earliest_date(record):
     """Populate the ``earliest_date`` field of Literature records."""
     date_paths = [
@@ -151,9 +187,45 @@ def populate_earliest_date(record):
             record['earliest_date'] = result
 
 
-def populate_citations_count(record):
-    """Populate citations_count in ES from"""
-    if hasattr(record, 'get_citations_count'):
+def get_citations_counts(records):
+    """Get the citation counts of several records with a single query.
+
+    Args:
+        records (Iterable[dict]): the records to get the citation counts of.
+
+    Returns:
+        Dict[Tuple[str, str], int]: the citation counts of the records that are
+        cited at least once, by their pid.
+    """
+    pids = set(get_pid_from_record(record) for record in records)
+    pids.discard(None)
+
+    if not pids:
+        return {}
+
+    query = db.session.query(
+        RecordCitationsCount.pid_type,
+        RecordCitationsCount.pid_value,
+        RecordCitationsCount.citation_count,
+    ).filter(
+        tuple_(RecordCitationsCount.pid_type, RecordCitationsCount.pid_value).in_(pids)
+    )
+
+    return {
+        (pid_type, pid_value): citation_count
+        for pid_type, pid_value, citation_count in query
+    }
+
+
+def populate_citations_count(record, citations_counts=None):
+    """Populate citations_count in ES from
+
+    If ``citations_counts`` is passed, as returned by ``get_citations_counts``,
+    the citation count is taken from it instead of being queried.
+    """
+    if citations_counts is not None:
+        record['citation_count'] = citations_counts.get(get_pid_from_record(record), 0)
+    elif hasattr(record, 'get_citations_count'):
         # Make sure that record has method get_citations_count
         # Session is in commited state here, and I cannot open new one...
         if not db.session.is_active:  # For tests and new entries, It tries to count citations when session is closed
@@ -359,14 +431,24 @@ def populate_experiment_suggest(record):
     }
 
 
-def populate_name_variations(record):
-    """Generate name variations for each signature of a Literature record."""
+def populate_name_variations(record, cache=None):
+    """Generate name variations for each signature of a Literature record.
+
+    If a ``cache`` dict is passed, the name variations are memoized in it by
+    full name, so that they are computed only once when enhancing several
+    records sharing the same authors.
+    """
     authors = record.get('authors', [])
 
     for author in authors:
         full_name = author.get('full_name')
         if full_name:
-            name_variations = generate_name_variations(full_name)
+            if cache is None:
+                name_variations = generate_name_variations(full_name)
+            else:
+                if full_name not in cache:
+                    cache[full_name] = generate_name_variations(full_name)
+                name_variations = list(cache[full_name])
 
             author.update({'name_variations': name_variations})
             author.update({'name_suggest': {
@@ -423,9 +505,22 @@ def get_author_with_record_facet_author_name(author):
         return u'{}_{}'.format(bai, get_author_display_name(author['name']['value']))
 
 
-def populate_facet_author_name(record):
-    """Populate the ``facet_author_name`` field of Literature records."""
-    authors_with_record = get_linked_records_in_field(record, 'authors.record')
+def populate_facet_author_name(record, linked_authors=None):
+    """Populate the ``facet_author_name`` field of Literature records.
+
+    If ``linked_authors`` is passed, as returned by
+    ``get_linked_records_by_pid``, the linked authors are taken from it
+    instead of being fetched from the DB.
+    """
+    if linked_authors is None:
+        authors_with_record = get_linked_records_in_field(record, 'authors.record')
+    else:
+        pids = []
+        for ref in force_list(get_value(record, 'authors.record.$ref', [])):
+            pid = get_pid_from_record_uri(ref)
+            if pid in linked_authors and pid not in pids:
+                pids.append(pid)
+        authors_with_record = [linked_authors[pid] for pid in pids]
     authors_without_record = [author for author in record.get('authors', []) if 'record' not in author]
     result = []
 
@@ -438,6 +533,47 @@ def populate_facet_author_name(record):
     record['facet_author_name'] = result
 
 
+PUBLICATION_INFO_LINKED_TITLES = [
+    ('conference_record', 'conference_title'),
+    ('parent_record', 'parent_title'),
+]
+"""Fields of ``publication_info`` linking to records, with the fields in
+which the titles of the linked records are denormalized for ES."""
+
+
+def get_publication_info_linked_records(records):
+    """Get the conferences and parent records linked by several records at once.
+
+    Returns:
+        Dict[Tuple[str, str], dict]: the linked records, by their pid.
+    """
+    linked_records = {}
+    for field, _ in PUBLICATION_INFO_LINKED_TITLES:
+        linked_records.update(get_linked_records_by_pid(records, 'publication_info.' + field))
+
+    return linked_records
+
+
+def populate_publication_info_linked_titles(record, linked_records=None):
+    """Populate the titles of the records linked by ``publication_info``.
+
+    The titles of the conferences and of the parent records are copied next
+    to the links, so that displaying the search results does not require to
+    fetch these records. If ``linked_records`` is passed, as returned by
+    ``get_publication_info_linked_records``, the linked records are taken
+    from it instead of being fetched from the DB.
+    """
+    if linked_records is None:
+        linked_records = get_publication_info_linked_records([record])
+
+    for publication_info in record.get('publication_info', []):
+        for field, title_field in PUBLICATION_INFO_LINKED_TITLES:
+            ref = get_value(publication_info, field + '.$ref')
+            linked_record = linked_records.get(get_pid_from_record_uri(ref)) if ref else None
+            if linked_record:
+                publication_info[title_field] = get_value(linked_record, 'titles.title[0]', default='')
+
+
 def get_citations_from_es(record, page=1, size=10):
     if 'control_number' not in record:
         return None
@@ -26,14 +26,23 @@ from __future__ import absolute_import, division, print_function
 
 from functools import partial
 
-from flask import Blueprint, request, abort
+from flask import Blueprint, current_app, request, abort
 from invenio_rest.views import ContentNegotiatedMethodView
+from invenio_records_rest.errors import InvalidQueryRESTError
+from invenio_records_rest.sorter import default_sorter_factory
 from invenio_records_rest.views import pass_record
+from invenio_search import current_search_client as es
+from werkzeug.datastructures import MultiDict
 
+from inspirehep.modules.api.v1.common_serializers import json_recids_stream
 from inspirehep.modules.search import LiteratureSearch
-from inspirehep.modules.search.search_factory import inspire_facets_factory
-from .serializers import json_literature_citations_v1_response, \
-    json_literature_search_aggregations_ui_v1
+from inspirehep.modules.search.search_factory import (
+    inspire_facets_factory,
+    inspire_filter_factory,
+)
+from .serializers import bibtex_v1_stream, \
+    json_literature_citations_v1_response, \
+    json_literature_search_aggregations_ui_v1, marcxml_v1_stream
 from inspirehep.modules.records.utils import get_citations_from_es
 
 blueprint = Blueprint(
@@ -131,3 +140,90 @@ blueprint.add_url_rule(
     '/facets',
     view_func=facets_view
 )
+
+
+def _scroll_pages(search, size, scroll):
+    """Read all the hits of a search, one page of ``size`` hits at a time.
+
+    The hits are scrolled in index order unless the search is sorted, which
+    is the cheapest way for ES to return them, and there is no limit on the
+    number of hits like the one of ``max_result_window`` when paginating.
+    """
+    body = search.to_dict()
+    body.pop('from', None)
+    body.setdefault('sort', ['_doc'])
+    result = es.search(
+        index=search._index,
+        doc_type=search._doc_type,
+        body=body,
+        scroll=scroll,
+        size=size,
+    )
+    scroll_id = result.get('_scroll_id')
+
+    try:
+        while result['hits']['hits']:
+            yield result['hits']['hits']
+            result = es.scroll(scroll_id=scroll_id, scroll=scroll)
+            scroll_id = result.get('_scroll_id')
+    finally:
+        if scroll_id:
+            es.clear_scroll(scroll_id=scroll_id, ignore=(404,))
+
+
+class LiteratureExportResource(ContentNegotiatedMethodView):
+    """Stream all the results of a literature search.
+
+    Unlike the search endpoint, the results are not paginated: they are
+    scrolled and serialized ``INSPIRE_EXPORT_CHUNK_SIZE`` at a time while
+    the response is sent. Only the fields in the ``source_includes`` of the
+    serializer are read, when it has some.
+    """
+    view_name = 'literature_export'
+
+    def __init__(self, **kwargs):
+        super(LiteratureExportResource, self).__init__(
+            serializers={
+                'application/x-bibtex': bibtex_v1_stream,
+                'application/marcxml+xml': marcxml_v1_stream,
+                'application/vnd+inspire.ids+json': json_recids_stream,
+            },
+            default_method_media_type={
+                'GET': 'application/x-bibtex',
+            },
+            default_media_type='application/x-bibtex',
+            **kwargs)
+
+    def get(self):
+        query_string = request.values.get('q', '')
+        try:
+            search = LiteratureSearch().query_from_iq(query_string)
+        except SyntaxError:
+            raise InvalidQueryRESTError()
+
+        search, _ = inspire_filter_factory(search, MultiDict(), search._index[0])
+        if 'sort' in request.values:
+            search, _ = default_sorter_factory(search, search._index[0])
+
+        serializer = self.match_serializers(*self.get_method_serializers(request.method))
+        source_includes = getattr(serializer, 'source_includes', None)
+        if source_includes:
+            search = search.source(source_includes)
+
+        hits_pages = _scroll_pages(
+            search,
+            current_app.config['INSPIRE_EXPORT_CHUNK_SIZE'],
+            current_app.config['INSPIRE_EXPORT_SCROLL_TIMEOUT'],
+        )
+
+        return self.make_response(hits_pages)
+
+
+literature_export_view = LiteratureExportResource.as_view(
+    LiteratureExportResource.view_name,
+)
+
+blueprint.add_url_rule(
+    '/export',
+    view_func=literature_export_view
+)
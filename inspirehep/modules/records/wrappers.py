@@ -87,14 +87,22 @@ class LiteratureRecord(ESRecord, AdminToolsMixin):
             parent_recid = None
             parent_rec = {}
             conference_rec = {}
-            if 'conference_record' in pub_info:
+            # The titles are denormalized in the search index, see
+            # ``populate_publication_info_linked_titles``.
+            if 'conference_title' in pub_info:
+                conference_recid = pub_info.get('conference_recid')
+                conference_rec = {'titles': [{'title': pub_info['conference_title']}]}
+            elif 'conference_record' in pub_info:
                 conference_rec = replace_refs(pub_info['conference_record'],
                                               'es')
                 if conference_rec and conference_rec.get('control_number'):
                     conference_recid = conference_rec['control_number']
                 else:
                     conference_rec = {}
-            if 'parent_record' in pub_info:
+            if 'parent_title' in pub_info:
+                parent_recid = pub_info.get('parent_recid')
+                parent_rec = {'titles': [{'title': pub_info['parent_title']}]}
+            elif 'parent_record' in pub_info:
                 parent_rec = replace_refs(pub_info['parent_record'], 'es')
                 if parent_rec and parent_rec.get('control_number'):
                     parent_recid = parent_rec['control_number']
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""Cache of the records matched by the reference matcher queries."""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+
+import flask
+from flask import current_app as app
+from redis import StrictRedis
+
+
+class ReferenceMatchCache(object):
+    """Redis cache of the recids matched by each query of the matcher.
+
+    The queries are compiled from the identifiers and the publication info
+    of the references, so a query is shared by all the references citing
+    the same DOI, arXiv eprint or pubnote. The cached results expire after
+    ``INSPIRE_REFERENCE_MATCH_CACHE_TTL`` seconds, and the results of the
+    queries which could match a record are invalidated once it is committed
+    and indexed, see ``get_reference_match_queries``.
+
+    Only the queries matching some records are cached: the records which are
+    not in INSPIRE yet would otherwise stay unmatched until the entry
+    expires, whenever the query citing them cannot be recompiled from their
+    metadata, as when it has several identifiers or a report number written
+    differently.
+    """
+    key = 'refextract:match:{}'
+
+    @property
+    def redis(self):
+        redis = getattr(flask.g, 'redis_client', None)
+        if redis is None:
+            url = app.config.get('CACHE_REDIS_URL')
+            redis = StrictRedis.from_url(url)
+            flask.g.redis_client = redis
+        return redis
+
+    def _get_key(self, query_key):
+        index, query = query_key
+        digest = hashlib.sha1((index + '\n' + query).encode('utf-8')).hexdigest()
+        return self.key.format(digest)
+
+    def get_many(self, query_keys):
+        """Return the cached results of several queries.
+
+        Args:
+            query_keys (List[Tuple[str, str]]): the index and the serialized
+                ES query of each query.
+
+        Returns:
+            dict: the recids matched by each cached query, by query key.
+        """
+        if not query_keys:
+            return {}
+
+        results = self.redis.mget([self._get_key(query_key) for query_key in query_keys])
+        return {
+            query_key: json.loads(result.decode('utf-8'))
+            for query_key, result in zip(query_keys, results)
+            if result is not None
+        }
+
+    def set_many(self, results):
+        """Cache the results of several queries, unless they are empty.
+
+        Args:
+            results (dict): the recids matched by each query, by query key.
+        """
+        ttl = app.config['INSPIRE_REFERENCE_MATCH_CACHE_TTL']
+        with self.redis.pipeline() as pipe:
+            for query_key, recids in results.items():
+                if recids:
+                    pipe.setex(self._get_key(query_key), ttl, json.dumps(recids))
+            pipe.execute()
+
+    def invalidate(self, query_keys):
+        """Remove the cached results of several queries."""
+        if query_keys:
+            self.redis.delete(*[self._get_key(query_key) for query_key in query_keys])
@@ -22,12 +22,23 @@
 
 from __future__ import absolute_import, division, print_function
 
+import json
+from itertools import chain
+
+from elasticsearch.exceptions import TransportError
 from inspire_dojson.utils import get_record_ref, get_recid_from_ref
 from inspire_matcher import match
+from inspire_matcher.core import compile
 from inspire_utils.dedupers import dedupe_list
 from inspire_utils.record import get_value
+from invenio_search import current_search_client as es
+from time_execution.decorator import write_metric
 
 from inspirehep.modules.refextract import config
+from inspirehep.modules.refextract.cache import ReferenceMatchCache
+
+MSEARCH_BATCH_SIZE = 100
+"""Number of queries sent in a single multi-search request."""
 
 
 def _add_match_to_reference(reference, matched_recid, es_index):
@@ -90,16 +101,7 @@ def match_reference(reference, previous_matched_recid=None):
     if reference.get('curated_relation'):
         return reference
 
-    config_unique_identifiers = config.REFERENCE_MATCHER_UNIQUE_IDENTIFIERS_CONFIG
-    config_default_publication_info = config.REFERENCE_MATCHER_DEFAULT_PUBLICATION_INFO_CONFIG
-    config_jcap_and_jhep_publication_info = config.REFERENCE_MATCHER_JHEP_AND_JCAP_PUBLICATION_INFO_CONFIG
-    config_data = config.REFERENCE_MATCHER_DATA_CONFIG
-
-    journal_title = get_value(reference, 'reference.publication_info.journal_title')
-    config_publication_info = config_jcap_and_jhep_publication_info if \
-        journal_title in ['JCAP', 'JHEP'] else config_default_publication_info
-
-    configs = [config_unique_identifiers, config_publication_info, config_data]
+    configs = [_get_reference_config(reference, stage) for stage in range(3)]
 
     matches = (match_reference_with_config(reference, config, previous_matched_recid) for config in configs)
     matches = (matched_record for matched_record in matches if 'record' in matched_record)
@@ -108,20 +110,248 @@ def match_reference(reference, previous_matched_recid=None):
     return reference
 
 
+def _get_reference_config(reference, stage):
+    """Return the inspire-matcher configuration of a matching stage.
+
+    The references are matched first by unique identifiers, then by
+    publication info, then against the data records.
+    """
+    if stage == 0:
+        return config.REFERENCE_MATCHER_UNIQUE_IDENTIFIERS_CONFIG
+    if stage == 2:
+        return config.REFERENCE_MATCHER_DATA_CONFIG
+
+    journal_title = get_value(reference, 'reference.publication_info.journal_title')
+    if journal_title in ['JCAP', 'JHEP']:
+        return config.REFERENCE_MATCHER_JHEP_AND_JCAP_PUBLICATION_INFO_CONFIG
+    return config.REFERENCE_MATCHER_DEFAULT_PUBLICATION_INFO_CONFIG
+
+
+def _compile_queries(reference, config):
+    """Return the ES queries of inspire-matcher for a reference."""
+    # XXX: avoid this type casting.
+    try:
+        reference['reference']['publication_info']['year'] = str(
+            reference['reference']['publication_info']['year'])
+    except KeyError:
+        pass
+
+    queries = [
+        compile(
+            query,
+            reference,
+            collections=config.get('collections'),
+            match_deleted=config.get('match_deleted', False),
+        )
+        for step in config['algorithm']
+        for query in step['queries']
+    ]
+
+    # XXX: avoid this type casting.
+    try:
+        reference['reference']['publication_info']['year'] = int(
+            reference['reference']['publication_info']['year'])
+    except KeyError:
+        pass
+
+    return [query for query in queries if query]
+
+
+def _get_query_key(query, config):
+    return config['index'], json.dumps(query, sort_keys=True)
+
+
+def _get_identifier_references(record):
+    """Yield references citing a record by one of its identifiers."""
+    for arxiv_eprint in get_value(record, 'arxiv_eprints.value', []):
+        yield {'reference': {'arxiv_eprint': arxiv_eprint}}
+    for doi in get_value(record, 'dois.value', []):
+        yield {'reference': {'dois': [doi]}}
+    for isbn in get_value(record, 'isbns.value', []):
+        yield {'reference': {'isbn': isbn}}
+    for texkey in record.get('texkeys', []):
+        yield {'reference': {'texkey': texkey}}
+    for report_number in get_value(record, 'report_numbers.value', []):
+        yield {'reference': {'report_numbers': [report_number]}}
+
+
+def _get_publication_info_references(record):
+    """Yield references citing a record by one of its publication info.
+
+    The artid and the first page of a reference are both matched against
+    the ``page_artid`` of the records, so each of them is used as both.
+    """
+    for publication_info in record.get('publication_info', []):
+        pages = set(filter(None, [
+            publication_info.get('artid'),
+            publication_info.get('page_start'),
+        ]))
+        for page in pages:
+            reference_publication_info = {
+                key: publication_info[key] for key in (
+                    'journal_issue',
+                    'journal_title',
+                    'journal_volume',
+                    'year',
+                ) if key in publication_info
+            }
+            reference_publication_info['artid'] = page
+            reference_publication_info['page_start'] = page
+            yield {'reference': {'publication_info': reference_publication_info}}
+
+
+def get_reference_match_queries(record):
+    """Return the keys of the matcher queries which could match a record.
+
+    These are the queries compiled from the references citing the record by
+    one of its identifiers or publication info, whose cached results are
+    invalidated when the record changes.
+
+    Args:
+        record (dict): the metadata of a Literature or Data record.
+
+    Returns:
+        Set[Tuple[str, str]]: the index and the serialized ES query of each
+        query.
+    """
+    schema = record.get('$schema', '')
+    if schema.endswith('/hep.json'):
+        configs_and_references = [
+            (config.REFERENCE_MATCHER_UNIQUE_IDENTIFIERS_CONFIG, list(_get_identifier_references(record))),
+            (config.REFERENCE_MATCHER_DEFAULT_PUBLICATION_INFO_CONFIG, list(_get_publication_info_references(record))),
+            (config.REFERENCE_MATCHER_JHEP_AND_JCAP_PUBLICATION_INFO_CONFIG, list(_get_publication_info_references(record))),
+        ]
+    elif schema.endswith('/data.json'):
+        configs_and_references = [
+            (config.REFERENCE_MATCHER_DATA_CONFIG, list(_get_identifier_references(record))),
+        ]
+    else:
+        return set()
+
+    return set(
+        _get_query_key(query, matcher_config)
+        for matcher_config, references in configs_and_references
+        for reference in references
+        for query in _compile_queries(reference, matcher_config)
+    )
+
+
+def _multi_search(queries, config):
+    """Run queries with multi-searches and return the recids they match.
+
+    Args:
+        queries (List[dict]): the ES queries.
+        config (dict): the inspire-matcher configuration of the queries.
+
+    Returns:
+        List[List[int]]: the recids matched by each query.
+    """
+    header = {'index': config['index'], 'type': config['doc_type']}
+    source = config.get('source')
+
+    results = []
+    for start in range(0, len(queries), MSEARCH_BATCH_SIZE):
+        body = []
+        for query in queries[start:start + MSEARCH_BATCH_SIZE]:
+            body.append(header)
+            body.append(dict(query, _source=source) if source else query)
+
+        for response in es.msearch(body=body)['responses']:
+            if 'error' in response:
+                raise TransportError(response.get('status', 500), 'msearch', response['error'])
+            results.append([
+                hit['_source']['control_number'] for hit in response['hits']['hits']
+            ])
+
+    return results
+
+
 def match_references(references):
     """Match references to their respective records in INSPIRE.
 
+    This gives the same result as calling ``match_reference`` on each
+    reference in turn, but the queries of each matching stage are sent for
+    all references at once with multi-searches, identical queries are sent
+    only once, and only the references which were not matched to a unique
+    record go on to the next stage. The results of the queries are cached
+    between runs in ``ReferenceMatchCache``.
+
     Args:
         references (list): the list of references.
 
     Returns:
         list: the matched references.
     """
-    matched_references, previous_matched_recid = [], None
-    for ref in references:
-        ref = match_reference(ref, previous_matched_recid)
-        matched_references.append(ref)
-        if 'record' in ref:
-            previous_matched_recid = get_recid_from_ref(ref['record'])
-
-    return matched_references
+    # The recids matched at each stage, by reference.
+    candidates = [[] for _ in references]
+    # Already linked references are only matched again by unique identifiers.
+    pending = [
+        i for i, reference in enumerate(references)
+        if not reference.get('curated_relation')
+    ]
+    matched_recids_by_query = {}
+    cache = ReferenceMatchCache()
+    cache_hits = 0
+    cache_misses = 0
+
+    for stage in range(3):
+        query_keys_by_reference = {}
+        queries_to_run = {}
+        for i in pending:
+            config = _get_reference_config(references[i], stage)
+            query_keys = []
+            for query in _compile_queries(references[i], config):
+                query_key = _get_query_key(query, config)
+                query_keys.append(query_key)
+                if query_key not in matched_recids_by_query:
+                    queries_to_run[query_key] = (config, query)
+            query_keys_by_reference[i] = (config, query_keys)
+
+        cached = cache.get_many(list(queries_to_run))
+        matched_recids_by_query.update(cached)
+        cache_hits += len(cached)
+        cache_misses += len(queries_to_run) - len(cached)
+
+        queries_by_config = {}
+        for query_key, (config, query) in queries_to_run.items():
+            if query_key not in cached:
+                queries_by_config.setdefault(id(config), (config, {}))[1][query_key] = query
+
+        for config, queries in queries_by_config.values():
+            query_keys = list(queries)
+            results = dict(zip(
+                query_keys,
+                _multi_search([queries[key] for key in query_keys], config),
+            ))
+            matched_recids_by_query.update(results)
+            cache.set_many(results)
+
+        next_pending = []
+        for i in pending:
+            config, query_keys = query_keys_by_reference[i]
+            matched_recids = dedupe_list(chain.from_iterable(
+                matched_recids_by_query[query_key] for query_key in query_keys
+            ))
+            candidates[i].append((matched_recids, config['index']))
+            if len(matched_recids) != 1 and 'record' not in references[i]:
+                next_pending.append(i)
+        pending = next_pending
+
+    write_metric('reference_match_cache', hits=cache_hits, misses=cache_misses)
+
+    # Ambiguous matches depend on the previous reference, so they are
+    # resolved in order once all stages were run.
+    previous_matched_recid = None
+    for reference, reference_candidates in zip(references, candidates):
+        for matched_recids, es_index in reference_candidates:
+            if len(matched_recids) == 1:
+                _add_match_to_reference(reference, matched_recids[0], es_index)
+            elif previous_matched_recid in matched_recids:
+                _add_match_to_reference(reference, previous_matched_recid, es_index)
+            if 'record' in reference:
+                break
+
+        if 'record' in reference:
+            previous_matched_recid = get_recid_from_ref(reference['record'])
+
+    return references
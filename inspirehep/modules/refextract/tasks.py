@@ -28,6 +28,7 @@ from celery import shared_task
 from flask import current_app
 from invenio_db import db
 
+from inspirehep.modules.refextract.cache import ReferenceMatchCache
 from inspirehep.modules.refextract.utils import KbWriter
 
 
@@ -84,3 +85,14 @@ def create_journal_kb_file():
                 value=row['title_variant'],
                 kb_key=row['short_title'],
             )
+
+
+@shared_task(ignore_result=True)
+def invalidate_reference_matches(query_keys):
+    """Remove the cached results of several reference matcher queries.
+
+    Args:
+        query_keys (List[List[str]]): the index and the serialized ES query
+            of each query.
+    """
+    ReferenceMatchCache().invalidate([tuple(query_key) for query_key in query_keys])
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+"""In-process caches."""
+
+from __future__ import absolute_import, division, print_function
+
+from collections import OrderedDict
+from time import time
+
+
+class LRUCache(object):
+    """Mapping keeping only the ``maxsize`` most recently used items.
+
+    Args:
+        maxsize (int): maximum number of items kept.
+        ttl (Optional[int]): if set, number of seconds after which an item
+            is considered missing.
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+
+    def __contains__(self, key):
+        return self._get_item(key) is not None
+
+    def __getitem__(self, key):
+        item = self._get_item(key)
+        if item is None:
+            raise KeyError(key)
+        return item[0]
+
+    def __setitem__(self, key, value):
+        self._items.pop(key, None)
+        expires = time() + self.ttl if self.ttl else None
+        self._items[key] = (value, expires)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def get(self, key, default=None):
+        item = self._get_item(key)
+        return default if item is None else item[0]
+
+    def pop(self, key, default=None):
+        item = self._items.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self):
+        self._items.clear()
+
+    def _get_item(self, key):
+        item = self._items.pop(key, None)
+        if item is None:
+            return None
+
+        if item[1] is not None and item[1] < time():
+            return None
+
+        self._items[key] = item
+        return item
@@ -278,6 +278,26 @@ def create_index_op(record, version_type='external_gte'):
     index, doc_type = current_record_to_index(record)
     enhance_before_index(record)
 
+    return _build_index_op(record, index, doc_type, version_type)
+
+
+def create_index_ops(records, version_type='external_gte'):
+    """Create the bulk index operations of several records at once.
+
+    The records are enhanced together with ``enhance_before_index_batch``,
+    which shares the DB lookups needed by the enhancement between them.
+    """
+    from inspirehep.modules.records.receivers import enhance_before_index_batch
+    indices = [current_record_to_index(record) for record in records]
+    enhance_before_index_batch(records)
+
+    return [
+        _build_index_op(record, index, doc_type, version_type)
+        for record, (index, doc_type) in zip(records, indices)
+    ]
+
+
+def _build_index_op(record, index, doc_type, version_type):
     return {
         '_op_type': 'index',
         '_index': index,
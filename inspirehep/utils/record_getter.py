@@ -33,6 +33,7 @@ from werkzeug.utils import import_string
 from invenio_pidstore.models import PersistentIdentifier
 from invenio_records.models import RecordMetadata
 
+from inspirehep.modules.pidstore.cache import PidCache
 from inspirehep.modules.pidstore.utils import get_endpoint_from_pid_type
 
 
@@ -66,23 +67,18 @@ def raise_record_getter_error_and_log(f):
 
 @raise_record_getter_error_and_log
 def get_es_record(pid_type, recid, **kwargs):
-    pid = PersistentIdentifier.get(pid_type, recid)
+    uuid = PidCache().get_uuid(pid_type, recid)
 
     endpoint = get_endpoint_from_pid_type(pid_type)
     search_conf = current_app.config['RECORDS_REST_ENDPOINTS'][endpoint]
     search_class = import_string(search_conf['search_class'])()
 
-    return search_class.get_source(pid.object_uuid, **kwargs)
+    return search_class.get_source(uuid, **kwargs)
 
 
 def get_es_records(pid_type, recids, **kwargs):
     """Get a list of recids from ElasticSearch."""
-    recids = [str(recid) for recid in recids]
-    uuids = PersistentIdentifier.query.filter(
-        PersistentIdentifier.pid_value.in_(recids),
-        PersistentIdentifier.pid_type == pid_type
-    ).all()
-    uuids = [str(uuid.object_uuid) for uuid in uuids]
+    uuids = list(PidCache().get_uuids((pid_type, recid) for recid in recids).values())
 
     endpoint = get_endpoint_from_pid_type(pid_type)
     search_conf = current_app.config['RECORDS_REST_ENDPOINTS'][endpoint]
@@ -93,9 +89,9 @@ def get_es_records(pid_type, recids, **kwargs):
 
 @raise_record_getter_error_and_log
 def get_es_record_by_uuid(uuid):
-    pid = PersistentIdentifier.query.filter_by(object_uuid=uuid).one()
+    pid_type, _ = PidCache().get_pid(uuid)
 
-    endpoint = get_endpoint_from_pid_type(pid.pid_type)
+    endpoint = get_endpoint_from_pid_type(pid_type)
     search_conf = current_app.config['RECORDS_REST_ENDPOINTS'][endpoint]
     search_class = import_string(search_conf['search_class'])()
 
@@ -105,8 +101,29 @@ def get_es_record_by_uuid(uuid):
 @raise_record_getter_error_and_log
 def get_db_record(pid_type, recid):
     from inspirehep.modules.records.api import InspireRecord
-    pid = PersistentIdentifier.get(pid_type, recid)
-    return InspireRecord.get_record(pid.object_uuid)
+    uuid = PidCache().get_uuid(pid_type, recid)
+    return InspireRecord.get_record(uuid)
+
+
+def get_db_record_instances(pids):
+    """Get the records of several pids from the DB, like ``get_db_record``.
+
+    Args:
+        pids (Iterable[Tuple[str, Union[str, int]]): a list of (pid_type, pid_value) tuples.
+
+    Returns:
+        dict: mapping from the (pid_type, pid_value) of the pids found, with
+        the value as a string, to their ``InspireRecord``.
+    """
+    from inspirehep.modules.records.api import InspireRecord
+    pids_by_uuid = {
+        uuid: pid for pid, uuid in PidCache().get_uuids(pids).items()
+    }
+    if not pids_by_uuid:
+        return {}
+
+    records = InspireRecord.get_records(list(pids_by_uuid))
+    return {pids_by_uuid[str(record.id)]: record for record in records}
 
 
 def get_db_records(pids):
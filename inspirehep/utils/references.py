@@ -22,16 +22,22 @@
 
 from __future__ import absolute_import, division, print_function
 
+import hashlib
+import os
+import tempfile
 from contextlib import contextmanager
+from time import time
 
 from flask import current_app
+from fs.opener import fsopen
 
 from inspire_schemas.api import ReferenceBuilder
 from inspire_utils.helpers import force_list
 
 from inspirehep.utils.jinja2 import render_template_to_string
 from inspirehep.utils.record_getter import get_es_records
-from inspirehep.utils.url import retrieve_uri
+
+_local_refextract_kbs = {}
 
 
 def get_and_format_references(record):
@@ -122,10 +128,41 @@ def map_refextract_to_schema(extracted_references, source=None):
     return result
 
 
+def _get_local_refextract_kb_path(uri):
+    """Return the path of a local copy of a refextract KB.
+
+    The copy is named after the hash of the contents of the KB, and shared by
+    all the processes of the host. refextract caches the KBs it loads by path,
+    so they are parsed only once per process and again only when the KB
+    changed. The KB is checked for changes at most once every
+    ``REFEXTRACT_KB_CHECK_INTERVAL`` seconds.
+    """
+    path, checked_at = _local_refextract_kbs.get(uri, (None, 0))
+    interval = current_app.config['REFEXTRACT_KB_CHECK_INTERVAL']
+    if path and os.path.exists(path) and time() - checked_at < interval:
+        return path
+
+    with fsopen(uri, mode='rb') as remote_file:
+        contents = remote_file.read()
+
+    path = os.path.join(
+        tempfile.gettempdir(),
+        'inspire-refextract-{}.kb'.format(hashlib.sha1(contents).hexdigest()),
+    )
+    if not os.path.exists(path):
+        with tempfile.NamedTemporaryFile(
+            prefix='inspire', dir=os.path.dirname(path), delete=False,
+        ) as local_file:
+            local_file.write(contents)
+        os.rename(local_file.name, path)
+
+    _local_refextract_kbs[uri] = (path, time())
+    return path
+
+
 @contextmanager
 def local_refextract_kbs_path():
-    """Get the path to the temporary refextract kbs from the application config.
+    """Get the path to the local refextract kbs from the application config.
     """
     journal_kb_path = current_app.config.get('REFEXTRACT_JOURNAL_KB_PATH')
-    with retrieve_uri(journal_kb_path) as temp_journal_kb_path:
-        yield {'journals': temp_journal_kb_path}
+    yield {'journals': _get_local_refextract_kb_path(journal_kb_path)}
@@ -23,6 +23,13 @@
 from __future__ import absolute_import, division, print_function
 
 from flask import url_for
+from inspire_schemas.utils import LocalRefResolver, inspire_format_checker, load_schema
+from jsonschema.validators import validator_for
+
+try:
+    from functools import lru_cache
+except ImportError:
+    from functools32 import lru_cache
 
 
 def ensure_valid_schema(record):
@@ -37,3 +44,36 @@ def ensure_valid_schema(record):
             schema_path="records/{0}".format(record['$schema']),
             _external=True,
         )
+
+
+@lru_cache()
+def get_validator(schema_name):
+    """Get the validator of a schema, built once per process.
+
+    Args:
+        schema_name (str): the name or url of the schema.
+
+    Returns:
+        jsonschema.IValidator: a validator equivalent to the one used by
+        ``inspire_schemas.api.validate``.
+    """
+    schema = load_schema(schema_name=schema_name)
+    validator_cls = validator_for(schema)
+
+    return validator_cls(
+        schema,
+        resolver=LocalRefResolver.from_schema(schema),
+        format_checker=inspire_format_checker,
+    )
+
+
+def validate_with_cached_schema(record):
+    """Validate a record like ``inspire_schemas.api.validate``.
+
+    Unlike it, the schema is not loaded and checked at each call, which makes
+    a difference when validating many records.
+
+    Raises:
+        jsonschema.ValidationError: if the record is not valid.
+    """
+    get_validator(record['$schema']).validate(record)
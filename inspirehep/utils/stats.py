@@ -59,3 +59,35 @@ def calculate_i10_index(citations):
     :return: i10-index of the dictionary of citations.
     """
     return len([_ for _, count in citations.items() if count >= 10])
+
+
+def calculate_h_index_from_histogram(histogram):
+    """
+    Calculate the h-index from a histogram of citation counts.
+
+    :param histogram: a list of pairs in the format
+        (citation_count, number_of_papers), as returned by a histogram
+        aggregation on the citation counts.
+    :return: h-index of the histogram.
+    """
+    h_index = 0
+    papers = 0
+    for count, number_of_papers in sorted(histogram, reverse=True):
+        papers += number_of_papers
+        h_index = max(h_index, min(count, papers))
+
+    return h_index
+
+
+def calculate_i10_index_from_histogram(histogram):
+    """
+    Calculate the i10-index from a histogram of citation counts.
+
+    :param histogram: a list of pairs in the format
+        (citation_count, number_of_papers), as returned by a histogram
+        aggregation on the citation counts.
+    :return: i10-index of the histogram.
+    """
+    return sum(
+        number_of_papers for count, number_of_papers in histogram if count >= 10
+    )
@@ -259,6 +259,7 @@ setup(
         'invenio_celery.tasks': [
             'inspire_migrator = inspirehep.modules.migrator.tasks',
             'inspire_orcid = inspirehep.modules.orcid.tasks',
+            'inspire_pidstore = inspirehep.modules.pidstore.tasks',
             'inspire_records = inspirehep.modules.records.tasks',
             'inspire_refextract = inspirehep.modules.refextract.tasks',
             'inspire_hal = inspirehep.modules.hal.tasks',
@@ -267,6 +268,7 @@ setup(
             'inspirehep = inspirehep:alembic',
         ],
         'invenio_db.models': [
+            'inspire_records = inspirehep.modules.records.models',
             'inspire_workflows_audit = inspirehep.modules.workflows.models',
         ],
         'invenio_jsonschemas.schemas': [
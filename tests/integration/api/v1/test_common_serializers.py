@@ -21,9 +21,15 @@
 # or submit itself to any jurisdiction.
 
 from __future__ import absolute_import, division, print_function
+import gzip
+import io
 import pytest
 import json
 
+from mock import patch
+
+from inspirehep.modules.records import views
+
 
 def test_literature_recids_serializer(api_client):
     response = api_client.get(
@@ -42,6 +48,54 @@ def test_literature_recids_serializer(api_client):
     assert response_recids == expected_recids
 
 
+def test_literature_export_recids_serializer(api_client):
+    response = api_client.get(
+        '/literature/export?q=title collider',
+        headers={'Accept': 'application/vnd+inspire.ids+json'}
+    )
+    assert response.status_code == 200
+    assert response.is_streamed
+
+    response_json = json.loads(response.data)
+
+    assert response_json['hits']['total'] == 2
+
+    expected_recids = {1373790, 701585}
+    response_recids = set(response_json['hits']['recids'])
+
+    assert response_recids == expected_recids
+
+
+def test_literature_export_recids_serializer_reads_only_control_numbers(api_client):
+    with patch.object(views, '_scroll_pages', wraps=views._scroll_pages) as mock_scroll_pages:
+        response = api_client.get(
+            '/literature/export?q=title collider',
+            headers={'Accept': 'application/vnd+inspire.ids+json'}
+        )
+        response_json = json.loads(response.data)
+
+    assert response_json['hits']['total'] == 2
+    search = mock_scroll_pages.call_args[0][0]
+    assert search.to_dict()['_source'] == ['control_number']
+
+
+def test_literature_export_recids_serializer_with_gzip(api_client):
+    response = api_client.get(
+        '/literature/export?q=title collider',
+        headers={
+            'Accept': 'application/vnd+inspire.ids+json',
+            'Accept-Encoding': 'gzip',
+        }
+    )
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+    data = gzip.GzipFile(fileobj=io.BytesIO(response.data)).read()
+    response_json = json.loads(data.decode('utf-8'))
+
+    assert response_json['hits']['total'] == 2
+
+
 @pytest.mark.xfail(reason='missing parser for authors')
 def test_authors_recids_serializer(api_client):
     response = api_client.get(
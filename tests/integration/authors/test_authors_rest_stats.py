@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+from __future__ import absolute_import, division, print_function
+
+import json
+
+import pytest
+from mock import patch
+
+from invenio_cache import current_cache
+from invenio_db import db
+from invenio_search import current_search_client as es
+
+from inspirehep.modules.authors.rest.stats import AuthorAPIStats
+from inspirehep.modules.authors.utils import get_author_stats_cache_key
+from inspirehep.modules.records.api import InspireRecord
+
+
+@pytest.fixture
+def author_stats_cache(isolated_app):
+    yield
+    # Cleanup the cache after each test (as atm there is no redis isolation).
+    current_cache.delete(get_author_stats_cache_key(9200001))
+
+
+def _create_record(record_json):
+    record = InspireRecord.create_or_update(record_json)
+    record.commit()
+    db.session.commit()
+    es.indices.refresh('records-hep')
+
+    return record
+
+
+def _create_paper(recid, document_type, refereed=False):
+    return _create_record({
+        '$schema': 'http://localhost:5000/schemas/records/hep.json',
+        '_collections': ['Literature'],
+        'authors': [
+            {
+                'full_name': 'Doe, John',
+                'record': {'$ref': 'http://localhost:5000/api/authors/9200001'},
+            },
+        ],
+        'control_number': recid,
+        'document_type': document_type,
+        'refereed': refereed,
+        'titles': [{'title': 'Paper {}'.format(recid)}],
+    })
+
+
+def _get_stats(client):
+    response = client.get('/authors/9200001/stats')
+
+    assert response.status_code == 200
+
+    return json.loads(response.data)
+
+
+def test_author_stats_count_every_document_type(isolated_api_client, author_stats_cache):
+    _create_record({
+        '$schema': 'http://localhost:5000/schemas/records/authors.json',
+        '_collections': ['Authors'],
+        'control_number': 9200001,
+        'name': {'value': 'Doe, John'},
+    })
+    _create_paper(9200002, ['article', 'conference paper'], refereed=True)
+    _create_paper(9200003, ['thesis'])
+
+    expected = {
+        'citations': 0,
+        'hindex': 0,
+        'i10index': 0,
+        'publications': 2,
+        'types': {
+            'article': 1,
+            'conference paper': 1,
+            'peer reviewed': 1,
+            'thesis': 1,
+        },
+    }
+    result = _get_stats(isolated_api_client)
+
+    assert expected == result
+
+
+def test_author_stats_are_cached_until_a_paper_is_indexed(isolated_api_client, author_stats_cache):
+    _create_record({
+        '$schema': 'http://localhost:5000/schemas/records/authors.json',
+        '_collections': ['Authors'],
+        'control_number': 9200001,
+        'name': {'value': 'Doe, John'},
+    })
+    _create_paper(9200002, ['article'])
+
+    assert _get_stats(isolated_api_client)['publications'] == 1
+
+    with patch.object(AuthorAPIStats, '_get_statistics') as mock_get_statistics:
+        assert _get_stats(isolated_api_client)['publications'] == 1
+
+    mock_get_statistics.assert_not_called()
+
+    _create_paper(9200003, ['article'])
+
+    assert current_cache.get(get_author_stats_cache_key(9200001)) is None
+    assert _get_stats(isolated_api_client)['publications'] == 2
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+from inspirehep.modules.authors.utils import get_coauthors
+
+from factories.db.invenio_records import TestRecordMetadata
+
+
+def _author(recid, full_name):
+    return {
+        'full_name': full_name,
+        'record': {'$ref': 'http://localhost:5000/api/authors/{}'.format(recid)},
+    }
+
+
+def test_get_coauthors(isolated_app):
+    TestRecordMetadata.create_from_kwargs(json={
+        'authors': [_author(90001, 'Smith, J.'), _author(90002, 'Doe, J.'), _author(90003, 'Roe, R.')],
+    })
+    TestRecordMetadata.create_from_kwargs(json={
+        'authors': [_author(90001, 'Smith, John'), _author(90003, 'Roe, Richard')],
+    })
+    TestRecordMetadata.create_from_kwargs(json={
+        'authors': [_author(90002, 'Doe, J.'), _author(90004, 'Poe, E.')],
+    })
+
+    expected = [(90003, 'Roe, R.', 2), (90002, 'Doe, J.', 1)]
+    result = get_coauthors(90001)
+
+    assert expected == result
+
+    expected = [(90003, 'Roe, R.', 2)]
+    result = get_coauthors(90001, size=1)
+
+    assert expected == result
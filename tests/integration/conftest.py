@@ -41,6 +41,11 @@ from invenio_search import current_search_client as es
 from inspirehep.factory import create_app
 from inspirehep.modules.fixtures.files import init_all_storage_paths
 from inspirehep.modules.fixtures.users import init_users_and_permissions
+from inspirehep.modules.pidstore.cache import PidCache
+from inspirehep.modules.records.json_ref_loader import (
+    db_record_loader,
+    es_record_loader,
+)
 
 # Use the helpers folder to store test helpers.
 # See: http://stackoverflow.com/a/33515264/374865
@@ -149,6 +154,9 @@ def isolated_app(app):
     connection.close()
     db.session = original_session
     invenio_records_factory_cleanup()
+    db_record_loader.clear_cache()
+    es_record_loader.clear_cache()
+    PidCache().clear()
 
 
 # TODO: all fixtures using ``app`` must be replaced by ones that use ``isolated_app``.
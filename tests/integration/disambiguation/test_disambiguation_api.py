@@ -61,6 +61,7 @@ def test_save_curated_signatures_and_input_clusters(isolated_app, tmpdir):
 
     config = {
         'DISAMBIGUATION_CURATED_SIGNATURES_PATH': str(curated_signatures_fd),
+        'DISAMBIGUATION_CURATED_SIGNATURES_COLUMNS_PATH': str(tmpdir.join('curated_signatures')),
         'DISAMBIGUATION_INPUT_CLUSTERS_PATH': str(input_clusters_fd),
     }
 
@@ -102,8 +103,10 @@ def test_save_sampled_signature_pairs(isolated_app, tmpdir):
 
     config = {
         'DISAMBIGUATION_CURATED_SIGNATURES_PATH': str(curated_signatures_fd),
+        'DISAMBIGUATION_CURATED_SIGNATURES_COLUMNS_PATH': str(tmpdir.join('curated_signatures')),
         'DISAMBIGUATION_INPUT_CLUSTERS_PATH': str(input_clusters_fd),
         'DISAMBIGUATION_SAMPLED_PAIRS_PATH': str(sampled_pairs_fd),
+        'DISAMBIGUATION_SAMPLED_PAIRS_COLUMNS_PATH': str(tmpdir.join('sampled_pairs')),
         'DISAMBIGUATION_SAMPLED_PAIRS_SIZE': 12 * 100,
     }
 
@@ -133,7 +136,10 @@ def test_save_publications(isolated_app, tmpdir):
 
     publications_fd = tmpdir.join('publications.jsonl')
 
-    config = {'DISAMBIGUATION_PUBLICATIONS_PATH': str(publications_fd)}
+    config = {
+        'DISAMBIGUATION_PUBLICATIONS_PATH': str(publications_fd),
+        'DISAMBIGUATION_PUBLICATIONS_COLUMNS_PATH': str(tmpdir.join('publications')),
+    }
 
     with patch.dict(current_app.config, config):
         save_publications()
@@ -195,12 +201,16 @@ def test_train_and_save_distance_model(isolated_app, tmpdir):
 
     config = {
         'DISAMBIGUATION_CURATED_SIGNATURES_PATH': str(curated_signatures_fd),
+        'DISAMBIGUATION_CURATED_SIGNATURES_COLUMNS_PATH': str(tmpdir.join('curated_signatures')),
         'DISAMBIGUATION_SAMPLED_PAIRS_PATH': str(sampled_pairs_fd),
+        'DISAMBIGUATION_SAMPLED_PAIRS_COLUMNS_PATH': str(tmpdir.join('sampled_pairs')),
         'DISAMBIGUATION_SAMPLED_PAIRS_SIZE': 12 * 100,
         'DISAMBIGUATION_PUBLICATIONS_PATH': str(publications_fd),
+        'DISAMBIGUATION_PUBLICATIONS_COLUMNS_PATH': str(tmpdir.join('publications')),
         'DISAMBIGUATION_ETHNICITY_DATA_PATH': str(ethnicity_data_fd),
         'DISAMBIGUATION_ETHNICITY_MODEL_PATH': str(ethnicity_model_fd),
-        'DISAMBIGUATION_DISTANCE_MODEL_PATH': str(distance_model_fd)
+        'DISAMBIGUATION_DISTANCE_MODEL_PATH': str(distance_model_fd),
+        'DISAMBIGUATION_FEATURES_CACHE_PATH': str(tmpdir.join('features')),
     }
 
     with patch.dict(current_app.config, config):
@@ -215,3 +225,5 @@ def test_train_and_save_distance_model(isolated_app, tmpdir):
 
     distance_estimator = DistanceEstimator(ethnicity_estimator)
     distance_estimator.load_model(str(distance_model_fd))
+
+    assert len(tmpdir.join('features').listdir()) == 13
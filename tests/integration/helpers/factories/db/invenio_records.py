@@ -131,6 +131,12 @@ class TestRecordMetadata(TestBaseModel):
                         object_uuid=instance.record_metadata.id,
                         pid_value=instance.record_metadata.json.get('control_number'),
                         **kwargs).persistent_identifier
+            record = InspireRecord(
+                instance.record_metadata.json,
+                model=instance.record_metadata,
+            )
+            record.update_citations()
+            record.update_authors()
 
         instance.inspire_record = InspireRecord(instance.record_metadata.json,
                                                 model=RecordMetadata)
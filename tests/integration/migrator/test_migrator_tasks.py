@@ -35,9 +35,12 @@ from invenio_pidstore.models import PersistentIdentifier
 from inspirehep.modules.migrator.models import LegacyRecordsMirror
 from inspirehep.modules.migrator.tasks import (
     _build_recid_to_uuid_map,
+    bulk_migrate_prod_records,
     migrate_from_file,
+    migrate_from_mirror,
     migrate_and_insert_record,
 )
+from inspirehep.utils.record_getter import get_db_record
 
 
 @pytest.fixture
@@ -178,6 +181,48 @@ def test_migrate_and_insert_record_other_exception(mock_logger, isolated_app):
     mock_logger.exception.assert_called_once_with('Migrator Record Insert Error')
 
 
+@patch('inspirehep.modules.migrator.tasks.es_bulk')
+def test_bulk_migrate_prod_records(mock_es_bulk, isolated_app):
+    valid_record = (
+        '<record>'
+        '  <controlfield tag="001">12345</controlfield>'
+        '  <datafield tag="245" ind1=" " ind2=" ">'
+        '    <subfield code="a">On the validity of INSPIRE records</subfield>'
+        '  </datafield>'
+        '  <datafield tag="980" ind1=" " ind2=" ">'
+        '    <subfield code="a">HEP</subfield>'
+        '  </datafield>'
+        '</record>'
+    )
+    invalid_record = (
+        '<record>'
+        '  <controlfield tag="001">12346</controlfield>'
+        '  <datafield tag="980" ind1=" " ind2=" ">'
+        '    <subfield code="a">HEP</subfield>'
+        '  </datafield>'
+        '</record>'
+    )
+    db.session.add(LegacyRecordsMirror.from_marcxml(valid_record))
+    db.session.add(LegacyRecordsMirror.from_marcxml(invalid_record))
+
+    bulk_migrate_prod_records([12345, 12346])
+
+    assert LegacyRecordsMirror.query.get(12345).valid is True
+    assert LegacyRecordsMirror.query.get(12346).valid is False
+
+    record = get_db_record('lit', 12345)
+    assert record['titles'] == [{'title': 'On the validity of INSPIRE records'}]
+    assert PersistentIdentifier.query.filter_by(pid_type='lit', pid_value='12346').count() == 0
+
+    index_ops = list(mock_es_bulk.call_args[0][1])
+    assert [op['_id'] for op in index_ops] == [str(record.id)]
+
+
+def test_migrate_from_mirror_bulk_requires_skip_files(isolated_app):
+    with pytest.raises(ValueError):
+        migrate_from_mirror(bulk=True, skip_files=False)
+
+
 def test_orcid_push_disabled_on_migrate_from_mirror(app, cleanup, enable_orcid_push_feature):
     record_fixture_path = pkg_resources.resource_filename(
         __name__,
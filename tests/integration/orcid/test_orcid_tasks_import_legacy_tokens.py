@@ -194,10 +194,10 @@ def test_import_multiple_orcid_tokens_no_user_exists(
     assert_db_has_n_legacy_tokens(1, SAMPLE_USER_2)
 
 
-@patch('inspirehep.modules.orcid.tasks.orcid_push')
+@patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
 @patch('inspirehep.modules.orcid.tasks.get_literature_recids_for_orcid')
 def test_import_legacy_orcid_tokens_pushes_on_new_user(
-        mock_get_literature_recids_for_orcid, mock_orcid_push,
+        mock_get_literature_recids_for_orcid, mock_schedule_orcid_push,
         app_with_config, redis_setup, teardown_sample_user):
     mock_get_literature_recids_for_orcid.return_value = [4328]
 
@@ -215,13 +215,11 @@ def test_import_legacy_orcid_tokens_pushes_on_new_user(
     assert_db_has_n_legacy_tokens(1, SAMPLE_USER)
 
     # Check that we pushed to ORCID
-    mock_orcid_push.apply_async.assert_called_with(
+    mock_schedule_orcid_push.assert_called_with(
+        '0000-0002-1825-0097',
+        [4328],
+        '3d25a708-dae9-48eb-b676-80a2bfb9d35c',
         queue='orcid_push_legacy_tokens',
-        kwargs={
-            'orcid': '0000-0002-1825-0097',
-            'rec_id': 4328,
-            'oauth_token': '3d25a708-dae9-48eb-b676-80a2bfb9d35c',
-        },
     )
 
 
@@ -352,15 +350,15 @@ class TestImportLegacyOrcidTokens(object):
 
         self._patcher_legacy_orcid_arrays = patch('inspirehep.modules.orcid.tasks.legacy_orcid_arrays')
         self.mock_legacy_orcid_arrays = self._patcher_legacy_orcid_arrays.start()
-        self._patcher_orcid_push = patch('inspirehep.modules.orcid.tasks.orcid_push')
-        self.mock_orcid_push = self._patcher_orcid_push.start()
+        self._patcher_schedule_orcid_push = patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
+        self.mock_schedule_orcid_push = self._patcher_schedule_orcid_push.start()
 
         self._patcher_logger = patch('inspirehep.modules.orcid.tasks.LOGGER')
         self.mock_logger = self._patcher_logger.start()
 
     def teardown(self):
         self._patcher_legacy_orcid_arrays.stop()
-        self._patcher_orcid_push.stop()
+        self._patcher_schedule_orcid_push.stop()
         self.mock_logger.stop()
 
     def _assert_user_and_token_models(self, orcid, token, email, name):
@@ -388,13 +386,11 @@ class TestImportLegacyOrcidTokens(object):
 
         import_legacy_orcid_tokens()
 
-        self.mock_orcid_push.apply_async.assert_any_call(
+        self.mock_schedule_orcid_push.assert_any_call(
+            self.orcid,
+            [self.inspire_record_literature['control_number']],
+            token,
             queue='orcid_push_legacy_tokens',
-            kwargs={
-                'orcid': self.orcid,
-                'rec_id': self.inspire_record_literature['control_number'],
-                'oauth_token': token,
-            },
         )
 
         self._assert_user_and_token_models(self.orcid, token, email, name)
@@ -427,13 +423,11 @@ class TestImportLegacyOrcidTokens(object):
 
         import_legacy_orcid_tokens()
 
-        self.mock_orcid_push.apply_async.assert_any_call(
+        self.mock_schedule_orcid_push.assert_any_call(
+            self.orcid,
+            [self.inspire_record_literature['control_number']],
+            token,
             queue='orcid_push_legacy_tokens',
-            kwargs={
-                'orcid': self.orcid,
-                'rec_id': self.inspire_record_literature['control_number'],
-                'oauth_token': token,
-            },
         )
 
         self._assert_user_and_token_models(self.orcid, token, email, name)
@@ -450,13 +444,11 @@ class TestImportLegacyOrcidTokens(object):
 
         import_legacy_orcid_tokens()
 
-        self.mock_orcid_push.apply_async.assert_any_call(
+        self.mock_schedule_orcid_push.assert_any_call(
+            self.orcid,
+            [self.inspire_record_literature['control_number']],
+            token,
             queue='orcid_push_legacy_tokens',
-            kwargs={
-                'orcid': self.orcid,
-                'rec_id': self.inspire_record_literature['control_number'],
-                'oauth_token': token,
-            },
         )
 
         self._assert_user_and_token_models(self.orcid, token, email, name)
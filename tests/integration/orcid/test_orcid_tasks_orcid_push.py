@@ -33,7 +33,12 @@ from requests.exceptions import RequestException
 from factories.db.invenio_records import TestRecordMetadata
 from inspirehep.modules.orcid import exceptions
 from inspirehep.modules.orcid.cache import OrcidCache
-from inspirehep.modules.orcid.tasks import orcid_push
+from inspirehep.modules.orcid.queue import OrcidPushQueue
+from inspirehep.modules.orcid.tasks import (
+    orcid_push,
+    orcid_push_batch,
+    schedule_orcid_push,
+)
 
 from utils import override_config
 
@@ -173,6 +178,108 @@ class TestOrcidPushRetryTask(object):
         mock_orcid_push_task_retry.assert_not_called()
 
 
+@pytest.mark.usefixtures('isolated_app')
+class TestOrcidPushBatchTask(object):
+    def setup(self):
+        self._patcher = mock.patch('inspirehep.modules.orcid.domain_models.OrcidPusher')
+        self.mock_pusher = self._patcher.start()
+
+        self.orcid = '0000-0002-7638-5686'
+        self.oauth_token = 'mytoken'
+        self.records = [
+            TestRecordMetadata.create_from_kwargs().record_metadata.json
+            for _ in range(3)
+        ]
+        self.recids = sorted(record['control_number'] for record in self.records)
+        self.queue = OrcidPushQueue()
+
+        # Disable logging.
+        logging.getLogger('inspirehep.modules.orcid.tasks').disabled = logging.CRITICAL
+
+    def teardown(self):
+        self._patcher.stop()
+        self.queue.redis.delete(
+            self.queue.key.format(self.orcid),
+            self.queue.scheduled_key.format(self.orcid),
+        )
+        logging.getLogger('inspirehep.modules.orcid.tasks').disabled = 0
+
+    def test_schedule_coalesces_the_pushes_to_the_same_orcid(self):
+        with mock.patch('inspirehep.modules.orcid.tasks.orcid_push_batch') as mock_orcid_push_batch:
+            schedule_orcid_push(self.orcid, self.recids[:2], self.oauth_token)
+            schedule_orcid_push(self.orcid, self.recids[1:], self.oauth_token)
+
+        mock_orcid_push_batch.apply_async.assert_called_once_with(
+            queue='orcid_push',
+            kwargs={
+                'orcid': self.orcid,
+                'oauth_token': self.oauth_token,
+            },
+            countdown=current_app.config['ORCID_PUSH_BATCH_WINDOW'],
+        )
+        assert self.queue.depth(self.orcid) == 3
+
+    def test_push_batch_pushes_all_the_queued_works_with_one_lock(self):
+        self.queue.push(self.orcid, self.recids, 60)
+
+        with override_config(FEATURE_FLAG_ENABLE_ORCID_PUSH=True,
+                             FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX='.*',
+                             ORCID_PUSH_BATCH_SIZE=100), \
+                mock.patch('inspirehep.modules.orcid.tasks.distributed_lock') as mock_lock:
+            orcid_push_batch(self.orcid, self.oauth_token)
+
+        mock_lock.assert_called_once_with('orcid:{}'.format(self.orcid), blocking=True)
+        pushed_recids = [call[0][1] for call in self.mock_pusher.call_args_list]
+        assert pushed_recids == self.recids
+        assert all(not call[1]['use_lock'] for call in self.mock_pusher.call_args_list)
+        assert self.mock_pusher.return_value.push.call_count == 3
+        assert self.queue.depth(self.orcid) == 0
+
+    def test_push_batch_queues_again_the_works_failed_with_request_exception(self):
+        self.queue.push(self.orcid, self.recids, 60)
+        self.mock_pusher.return_value.push.side_effect = [None, RequestException(), None]
+
+        with override_config(FEATURE_FLAG_ENABLE_ORCID_PUSH=True,
+                             FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX='.*'), \
+                mock.patch('inspirehep.modules.orcid.tasks.orcid_push_batch.retry', side_effect=RequestException) as mock_orcid_push_batch_retry, \
+                pytest.raises(RequestException):
+            orcid_push_batch(self.orcid, self.oauth_token)
+
+        mock_orcid_push_batch_retry.assert_called_once()
+        assert self.queue.pop_all(self.orcid) == [self.recids[1]]
+
+    def test_push_batch_queues_again_the_works_not_pushed_when_the_batch_fails(self):
+        self.queue.push(self.orcid, self.recids, 60)
+
+        with override_config(FEATURE_FLAG_ENABLE_ORCID_PUSH=True,
+                             FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX='.*'), \
+                mock.patch('inspirehep.modules.orcid.tasks.get_db_records', side_effect=ValueError), \
+                mock.patch('inspirehep.modules.orcid.tasks.orcid_push_batch.retry', side_effect=RequestException) as mock_orcid_push_batch_retry, \
+                pytest.raises(RequestException):
+            orcid_push_batch(self.orcid, self.oauth_token)
+
+        mock_orcid_push_batch_retry.assert_called_once()
+        self.mock_pusher.return_value.push.assert_not_called()
+        assert self.queue.pop_all(self.orcid) == self.recids
+
+    def test_push_batch_drops_the_failed_works_when_retries_are_exhausted(self):
+        self.queue.push(self.orcid, self.recids, 60)
+        self.mock_pusher.return_value.push.side_effect = [None, RequestException(), None]
+
+        orcid_push_batch.push_request(retries=orcid_push_batch.max_retries)
+        try:
+            with override_config(FEATURE_FLAG_ENABLE_ORCID_PUSH=True,
+                                 FEATURE_FLAG_ORCID_PUSH_WHITELIST_REGEX='.*'), \
+                    mock.patch('inspirehep.modules.orcid.tasks.orcid_push_batch.retry') as mock_orcid_push_batch_retry:
+                orcid_push_batch(self.orcid, self.oauth_token)
+        finally:
+            orcid_push_batch.pop_request()
+
+        mock_orcid_push_batch_retry.assert_not_called()
+        assert self.queue.depth(self.orcid) == 0
+        assert not self.queue.redis.exists(self.queue.scheduled_key.format(self.orcid))
+
+
 def get_local_access_tokens(orcid):
     # Pick the token from local inspirehep.cfg first.
     # This way you can store tokens in your local inspirehep.cfg (ignored
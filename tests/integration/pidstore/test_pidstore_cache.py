@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+from invenio_db import db
+from invenio_pidstore.models import PersistentIdentifier
+
+from inspirehep.modules.pidstore.cache import PENDING_KEY, WRITTEN_KEY, PidCache
+from inspirehep.utils.record_getter import get_db_record
+
+from factories.db.invenio_records import TestRecordMetadata
+
+
+def end_write_transaction():
+    """Read the next pids as if the records created in the test were committed.
+
+    The isolation of the tests never commits the transaction which wrote
+    them, so the pids loaded in it would otherwise never be cached.
+    """
+    db.session.flush()
+    db.session.info.pop(WRITTEN_KEY, None)
+
+
+def test_get_uuids_resolves_registered_pids(isolated_app):
+    record_1 = TestRecordMetadata.create_from_kwargs(json={'control_number': 111}).record_metadata
+    record_2 = TestRecordMetadata.create_from_kwargs(json={'control_number': 222}).record_metadata
+
+    expected = {
+        ('lit', '111'): str(record_1.id),
+        ('lit', '222'): str(record_2.id),
+    }
+    result = PidCache().get_uuids([('lit', 111), ('lit', '222'), ('lit', '333')])
+
+    assert expected == result
+
+
+def test_get_pids_resolves_uuids(isolated_app):
+    record = TestRecordMetadata.create_from_kwargs(json={'control_number': 111}).record_metadata
+
+    expected = {str(record.id): ('lit', '111')}
+    result = PidCache().get_pids([record.id])
+
+    assert expected == result
+
+
+def test_get_uuid_does_not_query_the_db_when_cached(isolated_app):
+    record = TestRecordMetadata.create_from_kwargs(json={'control_number': 111}).record_metadata
+    end_write_transaction()
+    PidCache().get_uuid('lit', 111)
+
+    PersistentIdentifier.query.filter_by(pid_value='111').delete()
+
+    assert PidCache().get_uuid('lit', 111) == str(record.id)
+
+
+def test_delete_invalidates_the_cache(isolated_app):
+    record = TestRecordMetadata.create_from_kwargs(json={'control_number': 111}).record_metadata
+    cache = PidCache()
+    cache.get_uuid('lit', 111)
+
+    get_db_record('lit', 111).delete()
+
+    assert cache.get_uuids([('lit', 111)]) == {}
+    assert cache.get_pids([record.id]) == {}
+
+
+def test_redis_entries_expire(isolated_app):
+    record = TestRecordMetadata.create_from_kwargs(json={'control_number': 111}).record_metadata
+    end_write_transaction()
+    cache = PidCache()
+    cache.get_uuid('lit', 111)
+
+    assert 0 < cache.redis.ttl(cache.pid_to_uuid_key.format('lit:111')) <= 3600
+    assert 0 < cache.redis.ttl(cache.uuid_to_pid_key.format(record.id)) <= 3600
+
+
+def test_pids_loaded_in_a_write_transaction_are_cached_only_on_commit(isolated_app):
+    record = TestRecordMetadata.create_from_kwargs(json={'control_number': 111}).record_metadata
+    cache = PidCache()
+
+    assert cache.get_uuid('lit', 111) == str(record.id)
+    assert not cache.redis.exists(cache.pid_to_uuid_key.format('lit:111'))
+    assert db.session.info[PENDING_KEY] == [('lit:111', str(record.id))]
+
+    db.session.rollback()
+
+    assert PENDING_KEY not in db.session.info
+    assert not cache.redis.exists(cache.pid_to_uuid_key.format('lit:111'))
@@ -24,7 +24,11 @@ from __future__ import absolute_import, division, print_function
 
 import os
 
-from inspirehep.modules.records.cli import check
+from invenio_db import db
+
+from inspirehep.modules.records.cli import check, citations
+from inspirehep.modules.records.models import RecordCitationsCount
+from inspirehep.utils.record_getter import get_db_record
 
 
 def test_check_unlinked_references_generate_files(app_cli_runner, isolated_app, tmpdir):
@@ -64,3 +68,33 @@ def test_check_unlinked_references_works_without_arguments(app_cli_runner, isola
     os.remove("missing_cited_arxiv_eprints.txt")
 
     assert result.exit_code == 0
+
+
+def test_citations_backfill_rebuilds_citation_counts(app_cli_runner, isolated_app):
+    record = get_db_record('lit', 1373790)
+    expected = record.get_citations_count()
+
+    RecordCitationsCount.query.delete()
+    db.session.commit()
+    assert record.get_citations_count() == 0
+
+    result = app_cli_runner.invoke(citations, ['backfill', '--yes-i-know'])
+
+    assert result.exit_code == 0
+    assert record.get_citations_count() == expected
+
+
+def test_citations_check_finds_and_fixes_wrong_counts(app_cli_runner, isolated_app, tmpdir):
+    output = tmpdir.join('inconsistencies.csv')
+    record = get_db_record('lit', 1373790)
+    expected = record.get_citations_count()
+
+    RecordCitationsCount.query.filter_by(pid_value='1373790').update(
+        {'citation_count': expected + 1})
+    db.session.commit()
+
+    result = app_cli_runner.invoke(citations, ['check', '--fix', '-o', str(output)])
+
+    assert result.exit_code == 0
+    assert '1373790' in output.read()
+    assert record.get_citations_count() == expected
@@ -32,6 +32,7 @@ from jsonschema import ValidationError
 from six.moves.urllib.parse import quote
 
 from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.records.models import RecordAuthors
 from inspirehep.utils.record_getter import get_db_record
 from factories.db.invenio_records import TestRecordMetadata
 
@@ -180,3 +181,128 @@ def test_not_count_citations_from_other_collections(isolated_app):
     TestRecordMetadata.create_from_kwargs(json=ref)
 
     assert record_1.get_citations_count() == 1
+
+
+def test_citations_count_is_updated_when_references_change(isolated_app):
+    cited = TestRecordMetadata.create_from_kwargs(
+        json={'control_number': 321}).inspire_record
+    data = {
+        '$schema': 'http://localhost:5000/schemas/records/hep.json',
+        '_collections': ['Literature'],
+        'document_type': ['article'],
+        'titles': [{'title': 'citing record'}],
+        'references': [{'record': {'$ref': cited._get_ref()}}],
+    }
+    citing = InspireRecord.create(data)
+    citing.commit()
+
+    assert cited.get_citations_count() == 1
+
+    del citing['references']
+    citing.commit()
+
+    assert cited.get_citations_count() == 0
+
+
+def test_citations_count_is_updated_when_citing_record_is_deleted(isolated_app):
+    cited = TestRecordMetadata.create_from_kwargs(
+        json={'control_number': 321}).inspire_record
+    ref = {'control_number': 4321, 'references': [{'record': {'$ref': cited._get_ref()}}]}
+    citing = get_db_record('lit', TestRecordMetadata.create_from_kwargs(
+        json=ref).inspire_record['control_number'])
+
+    assert cited.get_citations_count() == 1
+
+    citing.delete()
+    citing.commit()
+
+    assert cited.get_citations_count() == 0
+
+
+def test_get_cited_pids_ignores_unlinked_references():
+    record = InspireRecord({
+        '_collections': ['Literature'],
+        'references': [
+            {'record': {'$ref': 'http://localhost:5000/api/literature/1'}},
+            {'record': {'$ref': 'http://localhost:5000/api/data/2'}},
+            {'reference': {'title': {'title': 'unlinked'}}},
+        ],
+    })
+
+    expected = {('lit', '1'), ('dat', '2')}
+    result = record.get_cited_pids()
+
+    assert expected == result
+
+
+def test_get_cited_pids_is_empty_for_deleted_records():
+    record = InspireRecord({
+        '_collections': ['Literature'],
+        'deleted': True,
+        'references': [
+            {'record': {'$ref': 'http://localhost:5000/api/literature/1'}},
+        ],
+    })
+
+    assert record.get_cited_pids() == set()
+
+
+def test_authors_table_is_updated_when_authors_change(isolated_app):
+    data = {
+        '$schema': 'http://localhost:5000/schemas/records/hep.json',
+        '_collections': ['Literature'],
+        'document_type': ['article'],
+        'titles': [{'title': 'record with authors'}],
+        'authors': [
+            {
+                'full_name': 'Smith, John',
+                'record': {'$ref': 'http://localhost:5000/api/authors/1'},
+            },
+            {
+                'full_name': 'Doe, Jane',
+                'record': {'$ref': 'http://localhost:5000/api/authors/2'},
+            },
+            {'full_name': 'Unlinked, Author'},
+        ],
+    }
+    record = InspireRecord.create(data)
+    record.commit()
+
+    expected = {(1, 'Smith, John'), (2, 'Doe, Jane')}
+    result = set(
+        (signature.author_recid, signature.full_name)
+        for signature in RecordAuthors.query.filter_by(record_id=record.id)
+    )
+
+    assert expected == result
+
+    record['authors'] = [
+        {
+            'full_name': 'Doe, J.',
+            'record': {'$ref': 'http://localhost:5000/api/authors/2'},
+        },
+    ]
+    record.commit()
+
+    expected = {(2, 'Doe, J.')}
+    result = set(
+        (signature.author_recid, signature.full_name)
+        for signature in RecordAuthors.query.filter_by(record_id=record.id)
+    )
+
+    assert expected == result
+
+
+def test_get_author_signatures_is_empty_for_deleted_records():
+    record = InspireRecord({
+        '_collections': ['Literature'],
+        'deleted': True,
+        'authors': [
+            {
+                'full_name': 'Smith, John',
+                'record': {'$ref': 'http://localhost:5000/api/authors/1'},
+            },
+        ],
+    })
+
+    assert record.get_author_signatures() == {}
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from inspirehep.modules.records.citation_graph import (
+    LOG_KEY,
+    LOG_TRIMMED_KEY,
+    _get_redis,
+    build_citation_graph,
+    log_citation_changes,
+)
+
+from factories.db.invenio_records import TestRecordMetadata
+from utils import override_config
+
+
+@pytest.fixture
+def citation_graph_log(isolated_app):
+    yield
+    # Cleanup the log after each test (as atm there is no redis isolation).
+    _get_redis().delete(LOG_KEY, LOG_TRIMMED_KEY)
+
+
+def test_build_citation_graph(citation_graph_log, tmpdir):
+    cited = TestRecordMetadata.create_from_kwargs(
+        json={'control_number': 9100001}).inspire_record
+    TestRecordMetadata.create_from_kwargs(json={
+        'control_number': 9100002,
+        'references': [{'record': {'$ref': cited._get_ref()}}],
+    })
+
+    graph = build_citation_graph(str(tmpdir))
+
+    assert graph.citers_of(9100001).tolist() == [9100002]
+    assert graph.references_of(9100002).tolist() == [9100001]
+    assert graph.citation_count(9100001) == 1
+    assert graph.citation_count(9100001, excluded=[9100002]) == 0
+
+
+def test_citation_graph_replays_the_logged_changes(citation_graph_log, tmpdir):
+    cited = TestRecordMetadata.create_from_kwargs(
+        json={'control_number': 9100001}).inspire_record
+    TestRecordMetadata.create_from_kwargs(json={
+        'control_number': 9100002,
+        'references': [{'record': {'$ref': cited._get_ref()}}],
+    })
+    graph = build_citation_graph(str(tmpdir))
+
+    with override_config(INSPIRE_CITATION_GRAPH_PATH=str(tmpdir)):
+        log_citation_changes([('-', 9100002, 9100001), ('+', 9999999, 9100001)])
+    graph.sync(force=True)
+
+    assert graph.citers_of(9100001).tolist() == [9999999]
+    assert graph.references_of(9100002).tolist() == []
+    assert graph.references_of(9999999).tolist() == [9100001]
+
+    rebuilt_graph = build_citation_graph(str(tmpdir))
+
+    assert rebuilt_graph.log_offset == graph.log_offset
+    assert _get_redis().llen(LOG_KEY) == 0
+
+
+def test_log_citation_changes_does_nothing_without_graph_path(citation_graph_log):
+    with override_config(INSPIRE_CITATION_GRAPH_PATH=None):
+        log_citation_changes([('+', 9100002, 9100001)])
+
+    assert _get_redis().llen(LOG_KEY) == 0
+
+
+def test_citation_graph_is_not_used_after_too_many_changes(citation_graph_log, tmpdir):
+    TestRecordMetadata.create_from_kwargs(json={'control_number': 9100001})
+    graph = build_citation_graph(str(tmpdir))
+
+    with override_config(INSPIRE_CITATION_GRAPH_PATH=str(tmpdir),
+                         INSPIRE_CITATION_GRAPH_MAX_CHANGES=1):
+        log_citation_changes([('+', 9100002, 9100001), ('+', 9100003, 9100001)])
+        with pytest.raises(RuntimeError):
+            graph.sync(force=True)
+        with pytest.raises(RuntimeError):
+            graph.citers_of(9100001)
+
+        build_citation_graph(str(tmpdir))
+        graph.sync(force=True)
+
+    assert graph.citers_of(9100001).tolist() == []
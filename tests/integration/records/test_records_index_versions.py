@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+from __future__ import absolute_import, division, print_function
+
+import pytest
+from mock import patch
+
+from inspirehep.modules.records.errors import IncompleteIndexSwapError
+from inspirehep.modules.records.index_versions import (
+    IndexBuilds,
+    skip_paused_index_ops,
+    swap_index_version,
+    track_index_ops,
+)
+
+
+@pytest.mark.usefixtures('isolated_app')
+class TestIndexBuilds(object):
+    def setup(self):
+        self.index_builds = IndexBuilds()
+
+    def teardown(self):
+        """
+        Cleanup the builds after each test (as atm there is no redis isolation).
+        """
+        self.index_builds.finish('records-hep')
+
+    def test_track_ignores_indices_not_being_built(self):
+        self.index_builds.track({'records-hep': ['a']})
+
+        assert self.index_builds.pop_pending('records-hep') == []
+
+    def test_pop_pending_returns_tracked_uuids(self):
+        self.index_builds.start('records-hep', 'records-hep-20180101000000')
+        self.index_builds.track({'records-hep': ['a', 'b'], 'records-authors': ['c']})
+        self.index_builds.track({'records-hep': ['b']})
+
+        expected = ['a', 'b']
+        result = sorted(self.index_builds.pop_pending('records-hep'))
+
+        assert expected == result
+        assert self.index_builds.pop_pending('records-hep') == []
+
+    def test_finish_stops_tracking(self):
+        self.index_builds.start('records-hep', 'records-hep-20180101000000')
+        self.index_builds.finish('records-hep')
+        self.index_builds.track({'records-hep': ['a']})
+
+        assert self.index_builds.pop_pending('records-hep') == []
+
+    def test_resume_unpauses_index(self):
+        self.index_builds.pause('records-hep')
+        assert self.index_builds.paused() == {'records-hep'}
+
+        self.index_builds.resume('records-hep')
+        assert self.index_builds.paused() == set()
+
+    def test_finish_unpauses_index(self):
+        self.index_builds.start('records-hep', 'records-hep-20180101000000')
+        self.index_builds.pause('records-hep')
+        self.index_builds.finish('records-hep')
+
+        assert self.index_builds.paused() == set()
+
+    def test_skip_paused_index_ops_tracks_skipped_uuids(self):
+        self.index_builds.start('records-hep', 'records-hep-20180101000000')
+        self.index_builds.pause('records-hep')
+        ops = [
+            {'_index': 'records-hep', '_id': 'a'},
+            {'_index': 'records-authors', '_id': 'b'},
+        ]
+
+        expected = [{'_index': 'records-authors', '_id': 'b'}]
+        result = skip_paused_index_ops(ops)
+
+        assert expected == result
+        assert self.index_builds.pop_pending('records-hep') == ['a']
+
+    def test_track_index_ops_tracks_the_written_uuids(self):
+        self.index_builds.start('records-hep', 'records-hep-20180101000000')
+        track_index_ops([
+            {'_index': 'records-hep', '_id': 'a'},
+            {'_index': 'records-authors', '_id': 'b'},
+        ])
+
+        assert self.index_builds.pop_pending('records-hep') == ['a']
+
+
+@pytest.mark.usefixtures('isolated_app')
+@patch('inspirehep.modules.records.index_versions.es')
+def test_swap_index_version_keeps_the_index_paused_if_the_alias_cannot_be_created(mock_es):
+    mock_es.indices.get_alias.return_value = {'records-hep': {'aliases': {}}}
+    mock_es.indices.update_aliases.side_effect = Exception
+    mock_es.indices.exists.return_value = False
+    index_builds = IndexBuilds()
+
+    try:
+        with pytest.raises(IncompleteIndexSwapError):
+            swap_index_version('records-hep', 'records-hep-20180101000000')
+
+        assert index_builds.paused() == {'records-hep'}
+    finally:
+        index_builds.finish('records-hep')
@@ -151,8 +151,8 @@ def raw_record(app):
 
 @pytest.fixture(scope='function')
 def record(raw_record):
-    with mock.patch('inspirehep.modules.orcid.tasks.orcid_push') as mock_orcid_push:
-        mock_orcid_push.return_value = mock_orcid_push
+    with mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push') as mock_schedule_orcid_push:
+        mock_schedule_orcid_push.return_value = mock_schedule_orcid_push
         _record = migrate_and_insert_record(raw_record, skip_files=True)
 
     return _record
@@ -215,81 +215,69 @@ def assert_db_has_no_author_record(author_recid):
     assert InspireRecord.query.filter_by().count() == 0
 
 
-@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
-def test_orcid_push_not_trigger_for_author_records(mock_orcid_push_task, user_with_permission):
-    mock_orcid_push_task.assert_not_called()
+@mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
+def test_orcid_push_not_trigger_for_author_records(mock_schedule_orcid_push, user_with_permission):
+    mock_schedule_orcid_push.assert_not_called()
 
 
-@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
-def test_orcid_push_not_triggered_on_create_record_without_allow_push(mock_orcid_push_task, app, raw_record, user_without_permission):
+@mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
+def test_orcid_push_not_triggered_on_create_record_without_allow_push(mock_schedule_orcid_push, app, raw_record, user_without_permission):
     migrate_and_insert_record(raw_record, skip_files=True)
 
-    mock_orcid_push_task.assert_not_called()
+    mock_schedule_orcid_push.assert_not_called()
 
 
-@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
-def test_orcid_push_not_triggered_on_create_record_without_token(mock_orcid_push_task, app, raw_record, user_without_token):
+@mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
+def test_orcid_push_not_triggered_on_create_record_without_token(mock_schedule_orcid_push, app, raw_record, user_without_token):
     migrate_and_insert_record(raw_record, skip_files=True)
 
-    mock_orcid_push_task.assert_not_called()
+    mock_schedule_orcid_push.assert_not_called()
 
 
-@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
-def test_orcid_push_triggered_on_create_record_with_allow_push(mock_orcid_push_task, app, raw_record, user_with_permission, enable_orcid_push_feature):
+@mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
+def test_orcid_push_triggered_on_create_record_with_allow_push(mock_schedule_orcid_push, app, raw_record, user_with_permission, enable_orcid_push_feature):
     migrate_and_insert_record(raw_record, skip_files=True)
 
-    expected_kwargs = {
-        'kwargs': {
-            'orcid': user_with_permission['orcid'],
-            'rec_id': 1608652,
-            'oauth_token': user_with_permission['token'],
-        },
-        'queue': 'orcid_push',
-    }
+    expected_args = (
+        user_with_permission['orcid'],
+        [1608652],
+        user_with_permission['token'],
+    )
 
-    mock_orcid_push_task.apply_async.assert_called_once_with(**expected_kwargs)
+    mock_schedule_orcid_push.assert_called_once_with(*expected_args)
 
 
-@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
-def test_orcid_push_triggered_on_record_update_with_allow_push(mock_orcid_push_task, app, record, user_with_permission, enable_orcid_push_feature):
-    expected_kwargs = {
-        'kwargs': {
-            'orcid': user_with_permission['orcid'],
-            'rec_id': 1608652,
-            'oauth_token': user_with_permission['token'],
-        },
-        'queue': 'orcid_push',
-    }
+@mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
+def test_orcid_push_triggered_on_record_update_with_allow_push(mock_schedule_orcid_push, app, record, user_with_permission, enable_orcid_push_feature):
+    expected_args = (
+        user_with_permission['orcid'],
+        [1608652],
+        user_with_permission['token'],
+    )
 
     record.commit()
 
-    mock_orcid_push_task.apply_async.assert_called_once_with(**expected_kwargs)
+    mock_schedule_orcid_push.assert_called_once_with(*expected_args)
 
 
-@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
-def test_orcid_push_triggered_on_create_record_with_multiple_authors_with_allow_push(mock_orcid_push_task, app, raw_record, two_users_with_permission, enable_orcid_push_feature):
+@mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
+def test_orcid_push_triggered_on_create_record_with_multiple_authors_with_allow_push(mock_schedule_orcid_push, app, raw_record, two_users_with_permission, enable_orcid_push_feature):
     migrate_and_insert_record(raw_record, skip_files=True)
 
-    expected_kwargs_user1 = {
-        'kwargs': {
-            'orcid': two_users_with_permission[0]['orcid'],
-            'rec_id': 1608652,
-            'oauth_token': two_users_with_permission[0]['token'],
-        },
-        'queue': 'orcid_push',
-    }
-    expected_kwargs_user2 = {
-        'kwargs': {
-            'orcid': two_users_with_permission[1]['orcid'],
-            'rec_id': 1608652,
-            'oauth_token': two_users_with_permission[1]['token'],
-        },
-        'queue': 'orcid_push',
-    }
+    expected_args_user1 = (
+        two_users_with_permission[0]['orcid'],
+        [1608652],
+        two_users_with_permission[0]['token'],
+    )
+    expected_args_user2 = (
+        two_users_with_permission[1]['orcid'],
+        [1608652],
+        two_users_with_permission[1]['token'],
+    )
 
-    mock_orcid_push_task.apply_async.assert_any_call(**expected_kwargs_user1)
-    mock_orcid_push_task.apply_async.assert_any_call(**expected_kwargs_user2)
-    assert mock_orcid_push_task.apply_async.call_count == 2
+    mock_schedule_orcid_push.assert_any_call(*expected_args_user1)
+    mock_schedule_orcid_push.assert_any_call(*expected_args_user2)
+    assert mock_schedule_orcid_push.call_count == 2
 
 
 def test_creating_deleted_record_and_undeleting_created_record_in_es(app):
@@ -390,7 +378,7 @@ def test_deleting_record_triggers_delete_in_es(app):
         search.get_source(record.id)
 
 
-@mock.patch('inspirehep.modules.orcid.tasks.orcid_push')
+@mock.patch('inspirehep.modules.orcid.tasks.schedule_orcid_push')
 def test_orcid_push_not_triggered_on_create_record_no_feat_flag(mocked_Task, app, raw_record, user_with_permission):
     migrate_and_insert_record(raw_record, skip_files=True)
 
@@ -483,7 +471,7 @@ def test_index_after_commit_indexes_also_cites_record_when_new_citation_is_added
     es.indices.refresh('records-hep')
 
     expected_args = 'lit', cited['control_number'], 1
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -507,7 +495,7 @@ def test_index_after_commit_indexes_also_cites_record_when_new_citation_is_added
     es.indices.refresh('records-hep')
 
     expected_args = 'lit', record['control_number'], 1
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -575,7 +563,7 @@ def test_index_after_commit_indexes_also_cites_record_when_citation_is_deleted(
     es.indices.refresh('records-hep')
 
     expected_args = ('lit', cited['control_number'], 2)
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -661,7 +649,7 @@ def test_index_after_commit_indexes_also_cites_two_records(
     es.indices.refresh('records-hep')
 
     expected_args = ('lit', cited1['control_number'], 2)
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -679,7 +667,7 @@ def test_index_after_commit_indexes_also_cites_two_records(
     es.indices.refresh('records-hep')
 
     expected_args = ('lit', cited2['control_number'], 2)
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -711,7 +699,7 @@ def test_index_after_commit_indexes_also_cites_two_records(
     es.indices.refresh('records-hep')
 
     expected_args = ('lit', record['control_number'], 2)
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -788,7 +776,7 @@ def test_index_after_commit_indexes_also_cites_record_when_citer_is_deleted(
     es.indices.refresh('records-hep')
 
     expected_args = ('lit', 9999, 2)
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -873,7 +861,7 @@ def test_regression_index_after_commit_retries_for_new_record_not_yet_in_db(
     es.indices.refresh('records-hep')
 
     expected_args = ('lit', 9999, 2)
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
 
@@ -946,7 +934,7 @@ def test_index_after_commit_indexes_raises_if_cited_records_are_not_in_db(
     es.indices.refresh('records-hep')
 
     expected_args = 'lit', record['control_number'], 2
-    mocked_indexing_task.assert_called_with(*expected_args)
+    assert mock.call(*expected_args) not in mocked_indexing_task.call_args_list
 
     # execute mocked task
     index_modified_citations_from_record(*expected_args)
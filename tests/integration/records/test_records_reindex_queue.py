@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+from mock import patch
+
+from inspirehep.modules.records.reindex_queue import CitationsReindexQueue
+from inspirehep.modules.records.tasks import flush_citations_reindex_queue
+
+
+@pytest.mark.usefixtures('isolated_app')
+class TestCitationsReindexQueue(object):
+    def setup(self):
+        self.queue = CitationsReindexQueue()
+
+    def teardown(self):
+        """
+        Cleanup the queue after each test (as atm there is no redis isolation).
+        """
+        self.queue.redis.delete(
+            self.queue.key,
+            self.queue.scheduled_key,
+            self.queue.pushed_key,
+            self.queue.flushed_key,
+        )
+
+    def test_push_asks_to_schedule_a_flush_once_per_window(self):
+        assert self.queue.push(['a', 'b'], 10)
+        assert not self.queue.push(['b', 'c'], 10)
+
+    def test_pop_all_returns_deduplicated_uuids(self):
+        self.queue.push(['a', 'b'], 10)
+        self.queue.push(['b', 'c'], 10)
+
+        expected = ['a', 'b', 'c']
+        result = sorted(self.queue.pop_all())
+
+        assert expected == result
+        assert self.queue.pop_all() == []
+
+    def test_pop_all_opens_a_new_window(self):
+        self.queue.push(['a'], 10)
+        self.queue.pop_all()
+
+        assert self.queue.push(['a'], 10)
+
+    def test_metrics(self):
+        self.queue.push(['a', 'b'], 10)
+        self.queue.push(['b', 'c'], 10)
+        self.queue.pop_all()
+        self.queue.push(['a'], 10)
+
+        expected = {
+            'queue_depth': 1,
+            'pushed': 5,
+            'coalescing_ratio': 5 / 4,
+        }
+        result = self.queue.metrics()
+
+        assert expected == result
+
+    @patch('inspirehep.modules.records.tasks.batch_reindex')
+    def test_flush_queues_again_the_records_which_failed(self, mock_batch_reindex):
+        self.queue.push(['a', 'b'], 10)
+        mock_batch_reindex.return_value = {
+            'success': 1,
+            'failures': [{'index': {'_id': 'b', 'error': 'error'}}],
+        }
+
+        with patch.object(flush_citations_reindex_queue, 'retry', side_effect=RuntimeError) as mock_retry, \
+                pytest.raises(RuntimeError):
+            flush_citations_reindex_queue()
+
+        mock_retry.assert_called_once()
+        assert self.queue.pop_all() == ['b']
+
+    @patch('inspirehep.modules.records.tasks.batch_reindex')
+    def test_flush_queues_again_all_the_records_if_the_reindex_raises(self, mock_batch_reindex):
+        self.queue.push(['a', 'b'], 10)
+        mock_batch_reindex.side_effect = Exception
+
+        with patch.object(flush_citations_reindex_queue, 'retry', side_effect=RuntimeError), \
+                pytest.raises(RuntimeError):
+            flush_citations_reindex_queue()
+
+        assert sorted(self.queue.pop_all()) == ['a', 'b']
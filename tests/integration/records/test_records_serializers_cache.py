@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from invenio_db import db
+
+from inspirehep.modules.records.api import InspireRecord
+from inspirehep.modules.records.serializers.cache import SerializedRecordCache
+from inspirehep.utils.record_getter import get_db_record
+
+
+@pytest.fixture(autouse=True)
+def serialized_record_cache(isolated_app):
+    yield
+    # Cleanup the cache after each test (as atm there is no redis isolation).
+    cache = SerializedRecordCache()
+    keys = list(cache.redis.scan_iter(cache.key.format('*')))
+    cache.redis.delete(cache.hits_key, cache.misses_key, *keys)
+
+
+def test_serialized_record_is_cached_with_an_etag(isolated_api_client):
+    response = isolated_api_client.get(
+        '/literature/701585',
+        headers={'Accept': 'application/marcxml+xml'},
+    )
+
+    assert response.status_code == 200
+    etag, _ = response.get_etag()
+    assert etag
+
+    response = isolated_api_client.get(
+        '/literature/701585',
+        headers={'Accept': 'application/marcxml+xml'},
+    )
+
+    assert response.status_code == 200
+    assert response.get_etag() == (etag, False)
+    assert b'<controlfield tag="001">701585</controlfield>' in response.data
+
+    expected = {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+    result = SerializedRecordCache().metrics()
+
+    assert expected == result
+
+
+def test_serialized_record_not_modified_if_etag_matches(isolated_api_client):
+    response = isolated_api_client.get(
+        '/literature/701585',
+        headers={'Accept': 'application/x-bibtex'},
+    )
+    etag, _ = response.get_etag()
+
+    response = isolated_api_client.get(
+        '/literature/701585',
+        headers={
+            'Accept': 'application/x-bibtex',
+            'If-None-Match': '"{}"'.format(etag),
+        },
+    )
+
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_serialized_record_etag_changes_when_record_is_committed(isolated_api_client):
+    response = isolated_api_client.get(
+        '/literature/701585',
+        headers={'Accept': 'application/x-bibtex'},
+    )
+    etag, _ = response.get_etag()
+
+    record = get_db_record('lit', 701585)
+    record['titles'] = [{'title': 'A new title'}]
+    record = InspireRecord.create_or_update(record)
+    record.commit()
+    db.session.commit()
+
+    response = isolated_api_client.get(
+        '/literature/701585',
+        headers={
+            'Accept': 'application/x-bibtex',
+            'If-None-Match': '"{}"'.format(etag),
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+    assert b'A new title' in response.data
+
+
+def test_serialized_record_cache_keeps_the_type_of_the_output():
+    cache = SerializedRecordCache()
+    cache.set('uuid', 'text', u'Jürgen')
+    cache.set('uuid', 'bytes', u'Jürgen'.encode('utf-8'))
+
+    assert cache.get('uuid', 'text') == u'Jürgen'
+    assert cache.get('uuid', 'bytes') == u'Jürgen'.encode('utf-8')
+
+
+def test_serialized_record_with_non_ascii_metadata_is_cached(isolated_api_client):
+    record = get_db_record('lit', 701585)
+    record['titles'] = [{'title': u'Théorie des cordes'}]
+    record = InspireRecord.create_or_update(record)
+    record.commit()
+    db.session.commit()
+
+    for _ in range(2):
+        response = isolated_api_client.get(
+            '/literature/701585',
+            headers={'Accept': 'application/marcxml+xml'},
+        )
+
+        assert response.status_code == 200
+        assert u'Théorie des cordes'.encode('utf-8') in response.data
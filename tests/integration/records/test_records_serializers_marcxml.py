@@ -22,6 +22,8 @@
 
 from __future__ import absolute_import, division, print_function
 
+from factories.db.invenio_records import TestRecordMetadata
+
 
 def test_marcxml_serializer_serialize(api_client):
     response = api_client.get(
@@ -51,3 +53,44 @@ def test_marcxml_serializer_serialize_results(api_client):
 
     assert expected_701585 in result
     assert expected_1373790 in result
+
+
+def test_marcxml_serializer_serialize_export(api_client):
+    response = api_client.get(
+        '/literature/export?q=title collider',
+        headers={'Accept': 'application/marcxml+xml'},
+    )
+
+    assert response.status_code == 200
+
+    expected_701585 = b'<controlfield tag="001">701585</controlfield>'
+    expected_1373790 = b'<controlfield tag="001">1373790</controlfield>'
+    result = response.data
+
+    assert result.startswith(b'<?xml version="1.0" encoding="UTF-8" ?>')
+    assert result.endswith(b'</collection>\n')
+    assert expected_701585 in result
+    assert expected_1373790 in result
+
+
+def test_marcxml_serializer_serialize_export_with_non_ascii_metadata(isolated_api_client):
+    record_json = {
+        'control_number': 111,
+        'titles': [{'title': u'Théorie des cordes'}],
+        'authors': [{'full_name': u'Müller, Jürgen'}],
+    }
+    TestRecordMetadata.create_from_kwargs(json=record_json, index_name='records-hep')
+
+    response = isolated_api_client.get(
+        '/literature/export?q=control_number:111',
+        headers={'Accept': 'application/marcxml+xml'},
+    )
+
+    assert response.status_code == 200
+
+    result = response.data
+
+    assert b'<controlfield tag="001">111</controlfield>' in result
+    assert u'Théorie des cordes'.encode('utf-8') in result
+    assert u'Müller, Jürgen'.encode('utf-8') in result
+    assert result.endswith(b'</collection>\n')
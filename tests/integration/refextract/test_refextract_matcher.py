@@ -22,11 +22,17 @@
 
 from __future__ import absolute_import, division, print_function
 
+import pytest
 from mock import patch
 
 from inspire_schemas.api import load_schema, validate
 from inspire_utils.record import get_value
+from inspirehep.modules.refextract import config, matcher
+from inspirehep.modules.refextract.cache import ReferenceMatchCache
 from inspirehep.modules.refextract.matcher import (
+    _compile_queries,
+    _get_query_key,
+    get_reference_match_queries,
     match_reference,
     match_references,
 )
@@ -34,6 +40,16 @@ from inspirehep.modules.refextract.matcher import (
 from factories.db.invenio_records import TestRecordMetadata
 
 
+@pytest.fixture(autouse=True)
+def reference_match_cache(isolated_app):
+    yield
+    # Cleanup the cache after each test (as atm there is no redis isolation).
+    cache = ReferenceMatchCache()
+    keys = list(cache.redis.scan_iter(cache.key.format('*')))
+    if keys:
+        cache.redis.delete(*keys)
+
+
 def test_match_reference_for_jcap_and_jhep_config(isolated_app):
     """Test reference matcher for the JCAP and JHEP configuration"""
 
@@ -452,3 +468,137 @@ def test_match_references_finds_match_when_repeated_record_with_different_scores
     assert len(references) == 1
     assert references[0]['record']['$ref'] == 'http://localhost:5000/api/literature/1'
     assert validate(references, subschema) is None
+
+
+def test_match_references_sends_identical_queries_once(isolated_app):
+    cited_record_json = {
+        '$schema': 'http://localhost:5000/schemas/records/hep.json',
+        '_collections': ['Literature'],
+        'control_number': 1,
+        'document_type': ['article'],
+        'texkeys': [
+            'Giudice:2007fh',
+        ],
+        'titles': [
+            {
+                'title': 'The Strongly-Interacting Light Higgs'
+            }
+        ],
+    }
+
+    TestRecordMetadata.create_from_kwargs(
+        json=cited_record_json, index_name='records-hep')
+
+    references = [
+        {'reference': {'texkey': 'Giudice:2007fh'}},
+        {'reference': {'texkey': 'Unknown:2018abc'}},
+        {'reference': {'texkey': 'Giudice:2007fh'}},
+    ]
+
+    with patch.object(matcher, '_multi_search', wraps=matcher._multi_search) as mock_multi_search:
+        references = match_references(references)
+
+    assert references[0]['record']['$ref'] == 'http://localhost:5000/api/literature/1'
+    assert 'record' not in references[1]
+    assert references[2]['record']['$ref'] == 'http://localhost:5000/api/literature/1'
+
+    unique_identifiers_queries = mock_multi_search.call_args_list[0][0][0]
+    assert len(unique_identifiers_queries) == 2
+
+
+def test_match_references_caches_the_matched_records(isolated_app):
+    cited_record_json = {
+        '$schema': 'http://localhost:5000/schemas/records/hep.json',
+        '_collections': ['Literature'],
+        'control_number': 1,
+        'document_type': ['article'],
+        'texkeys': [
+            'Giudice:2007fh',
+        ],
+        'titles': [
+            {
+                'title': 'The Strongly-Interacting Light Higgs'
+            }
+        ],
+    }
+
+    TestRecordMetadata.create_from_kwargs(
+        json=cited_record_json, index_name='records-hep')
+
+    match_references([{'reference': {'texkey': 'Giudice:2007fh'}}])
+
+    with patch.object(matcher, '_multi_search', wraps=matcher._multi_search) as mock_multi_search, \
+            patch.object(matcher, 'write_metric') as mock_write_metric:
+        references = match_references([{'reference': {'texkey': 'Giudice:2007fh'}}])
+
+    assert references[0]['record']['$ref'] == 'http://localhost:5000/api/literature/1'
+    assert not mock_multi_search.called
+    assert mock_write_metric.call_args[1]['hits'] == 1
+
+    ReferenceMatchCache().invalidate(get_reference_match_queries(cited_record_json))
+
+    with patch.object(matcher, '_multi_search', wraps=matcher._multi_search) as mock_multi_search:
+        references = match_references([{'reference': {'texkey': 'Giudice:2007fh'}}])
+
+    assert references[0]['record']['$ref'] == 'http://localhost:5000/api/literature/1'
+    assert mock_multi_search.call_count == 1
+
+
+def test_get_reference_match_queries_contains_the_queries_of_citing_references():
+    record = {
+        '$schema': 'http://localhost:5000/schemas/records/hep.json',
+        'arxiv_eprints': [
+            {'value': '0704.3586'},
+        ],
+        'dois': [
+            {'value': '10.1088/1126-6708/2007/06/045'},
+        ],
+        'publication_info': [
+            {
+                'journal_title': 'Phys.Rev.',
+                'journal_volume': 'D76',
+                'page_start': '1',
+                'year': 2007,
+            },
+        ],
+    }
+    references = [
+        {'reference': {'arxiv_eprint': '0704.3586'}},
+        {'reference': {'dois': ['10.1088/1126-6708/2007/06/045']}},
+        {
+            'reference': {
+                'publication_info': {
+                    'artid': '1',
+                    'journal_title': 'Phys.Rev.',
+                    'journal_volume': 'D76',
+                },
+            },
+        },
+    ]
+    matcher_configs = [
+        config.REFERENCE_MATCHER_UNIQUE_IDENTIFIERS_CONFIG,
+        config.REFERENCE_MATCHER_UNIQUE_IDENTIFIERS_CONFIG,
+        config.REFERENCE_MATCHER_DEFAULT_PUBLICATION_INFO_CONFIG,
+    ]
+
+    query_keys = get_reference_match_queries(record)
+
+    for reference, matcher_config in zip(references, matcher_configs):
+        reference_query_keys = set(
+            _get_query_key(query, matcher_config)
+            for query in _compile_queries(reference, matcher_config)
+        )
+        assert reference_query_keys
+        assert reference_query_keys <= query_keys
+
+
+def test_match_references_does_not_cache_unmatched_queries(isolated_app):
+    match_references([{'reference': {'texkey': 'Unknown:2018abc'}}])
+
+    with patch.object(matcher, '_multi_search', wraps=matcher._multi_search) as mock_multi_search, \
+            patch.object(matcher, 'write_metric') as mock_write_metric:
+        references = match_references([{'reference': {'texkey': 'Unknown:2018abc'}}])
+
+    assert 'record' not in references[0]
+    assert mock_multi_search.called
+    assert mock_write_metric.call_args[1]['hits'] == 0
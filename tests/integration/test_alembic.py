@@ -32,6 +32,13 @@ def test_downgrade(isolated_app):
     alembic = Alembic(isolated_app)
     alembic.upgrade()
 
+    alembic.downgrade(target='7be4c8b5c5e8')
+    assert 'records_authors' not in _get_table_names()
+
+    alembic.downgrade(target='2dd443feeb63')
+    assert 'records_citations' not in _get_table_names()
+    assert 'records_citations_count' not in _get_table_names()
+
     # downgrade 0bc0a6ee1bc0 == downgrade to 2f5368ff6d20
 
     alembic.downgrade(target='0bc0a6ee1bc0')
@@ -180,6 +187,15 @@ def test_upgrade(app):
     assert 'ix_records_metadata_json_referenced_records' not in _get_indexes(
         'records_metadata')
 
+    alembic.upgrade(target='7be4c8b5c5e8')
+    assert 'records_citations' in _get_table_names()
+    assert 'records_citations_count' in _get_table_names()
+    assert 'ix_records_citations_cited' in _get_indexes('records_citations')
+
+    alembic.upgrade(target='5c3a2e7f9d41')
+    assert 'records_authors' in _get_table_names()
+    assert 'ix_records_authors_author_recid' in _get_indexes('records_authors')
+
 
 def _get_indexes(tablename):
     query = text('''
@@ -27,10 +27,14 @@ import pkg_resources
 import zlib
 
 import pytest
+from mock import patch
 from flask import current_app
 from redis import StrictRedis
 
+from invenio_db import db
+
 from inspirehep.modules.migrator.models import LegacyRecordsMirror
+from inspirehep.modules.migrator.queue import LegacyRecordsQueue
 from inspirehep.modules.migrator.tasks import continuous_migration
 from inspirehep.utils.record_getter import get_db_record
 
@@ -52,6 +56,16 @@ def flush_redis():
     redis_url = current_app.config.get('CACHE_REDIS_URL')
     r = StrictRedis.from_url(redis_url)
     r.delete('legacy_records')
+    for batch_key in r.zrange('legacy_records:batches', 0, -1):
+        r.delete(batch_key)
+    for batch_key in r.lrange('legacy_records:retry', 0, -1):
+        r.delete(batch_key)
+    r.delete(
+        'legacy_records:batches',
+        'legacy_records:retry',
+        'legacy_records:attempts',
+        'legacy_records:dead',
+    )
 
 
 @pytest.fixture(scope='function')
@@ -64,6 +78,17 @@ def record_1502656():
     _delete_record('lit', 1502656)
 
 
+@pytest.fixture(scope='function')
+def unmigrated_record_1502656():
+    record = push_to_redis('1502656.xml')
+
+    yield record
+
+    flush_redis()
+    LegacyRecordsMirror.query.filter_by(recid=1502656).delete()
+    db.session.commit()
+
+
 @pytest.fixture(scope='function')
 def record_1502655_and_1502656():
     record1 = push_to_redis('1502655.xml')
@@ -148,3 +173,100 @@ def test_continuous_migration_handles_record_updates(app, record_1502656_and_upd
     result = LegacyRecordsMirror.query.get(1502656).marcxml
 
     assert expected == result
+
+
+def test_continuous_migration_requeues_expired_batches(app, record_1502656):
+    r = StrictRedis.from_url(current_app.config.get('CACHE_REDIS_URL'))
+
+    batch_key, raw_records = LegacyRecordsQueue(visibility_timeout=-1).claim(10)
+
+    assert len(raw_records) == 1
+    assert r.llen('legacy_records') == 0
+
+    continuous_migration()
+
+    assert r.llen('legacy_records') == 0
+    assert not r.exists(batch_key)
+    assert r.zcard('legacy_records:batches') == 0
+
+    get_db_record('lit', 1502656)  # Does not raise.
+
+
+def test_legacy_records_queue_does_not_requeue_batches_being_processed(app, record_1502656):
+    r = StrictRedis.from_url(current_app.config.get('CACHE_REDIS_URL'))
+    queue = LegacyRecordsQueue()
+
+    batch_key, raw_records = queue.claim(10)
+
+    assert queue.requeue_expired() == 0
+    assert r.llen('legacy_records') == 0
+
+    queue.ack(batch_key)
+
+    assert not r.exists(batch_key)
+    assert r.zcard('legacy_records:batches') == 0
+
+
+def test_legacy_records_queue_extends_batches_being_processed(app, record_1502656):
+    queue = LegacyRecordsQueue(visibility_timeout=-1)
+
+    batch_key, raw_records = queue.claim(10)
+
+    assert LegacyRecordsQueue(visibility_timeout=600).extend(batch_key)
+    assert queue.requeue_expired() == 0
+
+    queue.ack(batch_key)
+
+    assert not queue.extend(batch_key)
+
+
+def test_legacy_records_queue_retries_failed_batches_before_new_records(app, unmigrated_record_1502656):
+    r = StrictRedis.from_url(current_app.config.get('CACHE_REDIS_URL'))
+    queue = LegacyRecordsQueue(max_attempts=2)
+
+    batch_key, raw_records = queue.claim(10)
+    push_to_redis('1502655.xml')
+
+    assert not queue.fail(batch_key)
+    assert queue.claim(10) == (batch_key, raw_records)
+
+    assert queue.fail(batch_key)
+    assert not r.exists(batch_key)
+    assert r.lrange('legacy_records:dead', 0, -1) == raw_records
+    assert r.zcard('legacy_records:batches') == 0
+    assert r.llen('legacy_records') == 1
+
+
+@patch('inspirehep.modules.migrator.tasks.migrate_and_insert_records')
+def test_continuous_migration_stores_the_error_of_dead_batches(mock_migrate, app, unmigrated_record_1502656):
+    mock_migrate.side_effect = ValueError('migration failed')
+    r = StrictRedis.from_url(current_app.config.get('CACHE_REDIS_URL'))
+
+    for _ in range(5):
+        continuous_migration()
+
+    assert r.llen('legacy_records') == 0
+    assert r.llen('legacy_records:retry') == 0
+    assert r.llen('legacy_records:dead') == 1
+
+    prod_record = LegacyRecordsMirror.query.get(1502656)
+
+    assert prod_record.valid is False
+    assert prod_record.error == 'ValueError: migration failed'
+
+
+def test_continuous_migration_skips_revisions_older_than_the_mirror(app, record_1502656):
+    newer = record_1502656.replace(b'20161212102059.0', b'20171212102059.0')
+    LegacyRecordsMirror.query.filter_by(recid=1502656).delete()
+    db.session.add(LegacyRecordsMirror.from_marcxml(newer))
+    db.session.commit()
+
+    continuous_migration()
+
+    expected = newer
+    result = LegacyRecordsMirror.query.get(1502656).marcxml
+
+    assert expected == result
+
+    LegacyRecordsMirror.query.filter_by(recid=1502656).delete()
+    db.session.commit()
@@ -22,11 +22,33 @@
 
 from __future__ import absolute_import, division, print_function
 
+import uuid
+
 import mock
+import pytest
 import requests_mock
 from flask import current_app
 
-from inspirehep.modules.pidstore.providers.recid import InspireRecordIdProvider
+from invenio_pidstore.models import RecordIdentifier
+
+from inspirehep.modules.pidstore.minters import inspire_recid_minter_many
+from inspirehep.modules.pidstore.pool import RecidPool
+from inspirehep.modules.pidstore.providers.recid import (
+    InspireRecordIdProvider,
+    take_recids,
+)
+from inspirehep.modules.pidstore.tasks import refill_recid_pool
+
+
+@pytest.fixture
+def recid_pool(isolated_app):
+    pool = RecidPool()
+    yield pool
+    # Cleanup the pool after each test (as atm there is no redis isolation).
+    pool.redis.delete(
+        pool.key.format(pool.source),
+        pool.refilling_key.format(pool.source),
+    )
 
 
 def test_getting_next_recid_from_legacy(app):
@@ -51,3 +73,63 @@ def test_getting_next_recid_from_legacy(app):
             provider = InspireRecordIdProvider.create(**args)
 
             assert str(provider.pid.pid_value) == '3141592'
+
+
+def test_take_recids_from_the_recid_pool(recid_pool):
+    extra_config = {
+        'INSPIRE_RECID_POOL_SIZE': 10,
+        'INSPIRE_RECID_POOL_BLOCK_SIZE': 4,
+    }
+
+    with mock.patch.dict(current_app.config, extra_config):
+        refill_recid_pool()
+        assert recid_pool.size() == 10
+
+        pooled, _ = recid_pool.pop(10)
+        recid_pool.push(pooled)
+
+        with mock.patch('inspirehep.modules.pidstore.providers.recid.refill_recid_pool') as refill:
+            recids = take_recids(3)
+            refill.delay.assert_not_called()
+
+            recids.extend(take_recids(3))
+            refill.delay.assert_called_once_with()
+
+    assert recids == pooled[:6]
+    assert RecordIdentifier.query.filter(RecordIdentifier.recid.in_(pooled)).count() == 10
+
+
+def test_take_recids_reserves_the_recids_missing_from_the_pool(recid_pool):
+    extra_config = {
+        'INSPIRE_RECID_POOL_SIZE': 10,
+    }
+
+    with mock.patch.dict(current_app.config, extra_config):
+        recid_pool.push([RecordIdentifier.next()])
+
+        with mock.patch('inspirehep.modules.pidstore.providers.recid.refill_recid_pool') as refill:
+            recids = take_recids(3)
+            refill.delay.assert_called_once_with()
+
+    assert len(set(recids)) == 3
+    assert recid_pool.size() == 0
+
+
+def test_inspire_recid_minter_many(isolated_app):
+    records = [
+        (uuid.uuid4(), {'$schema': 'http://localhost:5000/schemas/records/hep.json'}),
+        (uuid.uuid4(), {'$schema': 'http://localhost:5000/schemas/records/authors.json'}),
+        (uuid.uuid4(), {
+            '$schema': 'http://localhost:5000/schemas/records/hep.json',
+            'control_number': 3141592,
+        }),
+        (uuid.uuid4(), {'$schema': 'http://localhost:5000/schemas/records/hep.json'}),
+    ]
+
+    pids = inspire_recid_minter_many(records)
+
+    assert [pid.pid_type for pid in pids] == ['lit', 'aut', 'lit', 'lit']
+    assert [pid.object_uuid for pid in pids] == [record_uuid for record_uuid, _ in records]
+    assert [data['control_number'] for _, data in records] == [pid.pid_value for pid in pids]
+    assert records[2][1]['control_number'] == 3141592
+    assert len(set(pid.pid_value for pid in pids)) == 4
@@ -22,7 +22,12 @@
 
 from __future__ import absolute_import, division, print_function
 
-from inspirehep.utils.record_getter import get_db_records, get_es_records
+from inspirehep.modules.records.api import InspireRecord
+from inspirehep.utils.record_getter import (
+    get_db_record_instances,
+    get_db_records,
+    get_es_records,
+)
 
 
 def test_get_es_records_handles_empty_lists(app):
@@ -74,3 +79,11 @@ def test_get_db_records_accept_multiple_pid_types(app):
     results = list(get_db_records(records))
 
     assert len(results) == 3
+
+
+def test_get_db_record_instances_returns_inspire_records_by_pid(app):
+    results = get_db_record_instances([('lit', 4328), ('aut', 983059), ('lit', 1)])
+
+    assert sorted(results) == [('aut', '983059'), ('lit', '4328')]
+    assert all(isinstance(record, InspireRecord) for record in results.values())
+    assert results[('lit', '4328')]['control_number'] == 4328
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+
+from __future__ import absolute_import, division, print_function
+
+import json
+
+from elasticsearch_dsl import Q
+from mock import Mock, patch
+
+from inspirehep.modules.authors.rest.citations import AuthorAPICitations
+
+
+@patch('inspirehep.modules.authors.rest.citations.CITEES_BATCH_SIZE', 2)
+@patch.object(AuthorAPICitations, '_get_citers')
+def test_get_citations_fetches_the_citers_by_batches(mock_get_citers):
+    citers = {
+        1: [
+            {
+                'authors': [{'recid': 10}],
+                'control_number': 4,
+                'self': {'$ref': 'http://localhost:5000/api/literature/4'},
+            },
+        ],
+        3: [
+            {
+                'authors': [{'recid': 11}],
+                'collections': [{'primary': 'Published'}],
+                'control_number': 5,
+                'earliest_date': '2018-01-01',
+                'self': {'$ref': 'http://localhost:5000/api/literature/5'},
+            },
+        ],
+    }
+    mock_get_citers.side_effect = lambda recids: {
+        recid: citers[recid] for recid in recids if recid in citers
+    }
+    citees = iter([
+        {
+            'authors': [{'recid': 10}],
+            'control_number': recid,
+            'self': {'$ref': 'http://localhost:5000/api/literature/{}'.format(recid)},
+        } for recid in (1, 2, 3)
+    ])
+
+    result = list(AuthorAPICitations()._get_citations(citees))
+
+    assert [call[0][0] for call in mock_get_citers.call_args_list] == [[1, 2], [3]]
+    assert [citation['citee']['id'] for citation in result] == [1, 2, 3]
+    assert result[0]['citers'] == [
+        {
+            'citer': {
+                'id': 4,
+                'record': {'$ref': 'http://localhost:5000/api/literature/4'},
+            },
+            'self_citation': True,
+            'published_paper': False,
+        },
+    ]
+    assert result[1]['citers'] == []
+    assert result[2]['citers'] == [
+        {
+            'citer': {
+                'id': 5,
+                'record': {'$ref': 'http://localhost:5000/api/literature/5'},
+            },
+            'self_citation': False,
+            'date': '2018-01-01',
+            'published_paper': True,
+        },
+    ]
+
+
+@patch.object(AuthorAPICitations, '_get_citations')
+def test_serialize_citations_streams_a_json_list(mock_get_citations):
+    mock_get_citations.return_value = iter([{'citee': {'id': 1}}, {'citee': {'id': 2}}])
+
+    result = ''.join(AuthorAPICitations()._serialize_citations(iter([])))
+
+    assert json.loads(result) == [{'citee': {'id': 1}}, {'citee': {'id': 2}}]
+
+
+@patch('inspirehep.modules.authors.rest.citations.LiteratureSearch')
+@patch('inspirehep.modules.authors.rest.citations.get_citation_graph')
+def test_get_citers_falls_back_to_es_when_the_graph_is_unusable(mock_get_citation_graph, mock_literature_search):
+    mock_get_citation_graph.return_value = Mock(citers_of=Mock(
+        side_effect=RuntimeError('Changes of the citation graph were lost.')))
+    citer = {'control_number': 2, 'references': [{'recid': 1}]}
+    mock_search = mock_literature_search.return_value.query
+    mock_search.return_value.params.return_value.scan.return_value = [
+        Mock(to_dict=Mock(return_value=citer)),
+    ]
+
+    result = AuthorAPICitations._get_citers([1])
+
+    assert result == {1: [citer]}
+    mock_search.assert_called_once_with(Q('terms', references__recid=[1]))
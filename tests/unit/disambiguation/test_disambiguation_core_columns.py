@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+from inspirehep.modules.disambiguation.core.columns import (
+    PUBLICATION_COLUMNS,
+    Columns,
+    ColumnsRow,
+    ColumnsWriter,
+)
+
+
+def test_columns_round_trip(tmpdir):
+    publications = [
+        {
+            'abstract': u'Sur la théorie des quanta',
+            'authors': [u'de Broglie, Louis'],
+            'collaborations': [],
+            'keywords': [u'quanta', u'waves'],
+            'publication_id': 1,
+            'title': None,
+            'topics': [u'Theory-HEP'],
+        },
+        {
+            'abstract': u'',
+            'authors': [u'Ellis, John R.', u'de Broglie, Louis'],
+            'collaborations': [u'CMS'],
+            'keywords': [],
+            'publication_id': 2,
+            'title': u'The quest for elementary particles',
+            'topics': [],
+        },
+    ]
+
+    with ColumnsWriter(str(tmpdir), PUBLICATION_COLUMNS) as writer:
+        for publication in publications:
+            writer.append(publication)
+
+    columns = Columns(str(tmpdir))
+
+    assert len(columns) == 2
+    assert [columns.row(row) for row in range(2)] == publications
+    assert columns['authors'][0] == columns['authors'][2]
+
+
+def test_columns_row_reads_like_a_dict(tmpdir):
+    with ColumnsWriter(str(tmpdir), {'publication_id': 'int'}) as writer:
+        writer.append({'publication_id': None})
+
+    row = ColumnsRow(Columns(str(tmpdir)), 0)
+
+    assert row['publication_id'] is None
+    assert row.get('title', '') == ''
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+from collections import Counter
+
+from inspirehep.modules.disambiguation.core.columns import (
+    SIGNATURE_COLUMNS,
+    ColumnsWriter,
+)
+from inspirehep.modules.disambiguation.core.ml.sampling import sample_signature_pairs
+
+
+def test_sample_signature_pairs(tmpdir):
+    signatures = [
+        (1, 'Smith, J.', 'SNATHj'),
+        (1, 'Smith, John', 'SNATHj'),
+        (2, 'Smith, J.', 'SNATHj'),
+        (3, 'Doe, J.', 'Dj'),
+        (3, 'Doe, J.', 'Dj'),
+        (4, 'Ellis, J.', 'ELj'),
+    ]
+
+    with ColumnsWriter(str(tmpdir), SIGNATURE_COLUMNS) as writer:
+        for row, (author_id, author_name, signature_block) in enumerate(signatures):
+            writer.append({
+                'author_affiliation': '',
+                'author_id': author_id,
+                'author_name': author_name,
+                'publication_id': row,
+                'signature_block': signature_block,
+                'signature_uuid': str(row),
+            })
+
+    sampled_pairs = Counter(sample_signature_pairs(str(tmpdir), 12))
+
+    assert sampled_pairs == {
+        (3, 4, True): 3,
+        (0, 1, True): 3,
+        (0, 2, False): 3,
+        (1, 2, False): 3,
+    }
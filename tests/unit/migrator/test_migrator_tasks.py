@@ -24,8 +24,13 @@ from __future__ import absolute_import, division, print_function
 
 import os
 import pkg_resources
+from io import BytesIO
 
-from inspirehep.modules.migrator.tasks import read_file
+from inspirehep.modules.migrator.tasks import (
+    iter_marcxml_records,
+    open_streams,
+    read_file,
+)
 
 
 def test_read_file_reads_xml_file_correctly():
@@ -64,3 +69,36 @@ def test_read_file_reads_prodsync_file_correctly():
     result = list(read_file(prodsync_file))
 
     assert expected == result
+
+
+def test_iter_marcxml_records_splits_prodsync_file_into_records():
+    prodsync_file = pkg_resources.resource_filename(__name__, os.path.join('fixtures', 'micro-prodsync.tar'))
+
+    result = [
+        record
+        for stream in open_streams(prodsync_file)
+        for record in iter_marcxml_records(stream)
+    ]
+
+    assert len(result) == 2
+    assert result[0].startswith(b'<record>')
+    assert b'<controlfield tag="001">1663923</controlfield>' in result[0]
+    assert result[1].endswith(b'</record>')
+    assert b'<controlfield tag="001">1663924</controlfield>' in result[1]
+
+
+def test_iter_marcxml_records_splits_the_rest_of_a_malformed_stream():
+    stream = BytesIO(
+        b'<collection xmlns="http://www.loc.gov/MARC21/slim">\n'
+        b'<record>\n<controlfield tag="001">1</controlfield>\n</record>\n'
+        b'<record>\n<controlfield tag="001">2</controlfield>\n<datafield>\n</record>\n'
+        b'<record>\n<controlfield tag="001">3</controlfield>\n</record>\n'
+        b'</collection>\n'
+    )
+
+    result = list(iter_marcxml_records(stream))
+
+    assert len(result) == 3
+    assert b'<controlfield tag="001">1</controlfield>' in result[0]
+    assert b'<controlfield tag="001">2</controlfield>' in result[1]
+    assert b'<controlfield tag="001">3</controlfield>' in result[2]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2018 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+from inspirehep.modules.records.cli import (
+    _read_checkpoint,
+    _write_checkpoint,
+)
+
+
+def test_read_checkpoint_without_checkpoint_file(tmpdir):
+    checkpoint_path = os.path.join(str(tmpdir), 'checkpoint.json')
+
+    expected = {'last_uuids': {}, 'finished': []}
+    result = _read_checkpoint(checkpoint_path)
+
+    assert expected == result
+
+
+def test_write_checkpoint_then_read_checkpoint(tmpdir):
+    checkpoint_path = os.path.join(str(tmpdir), 'logs', 'checkpoint.json')
+    checkpoint = {
+        'last_uuids': {'lit': 'f7d5ca4c-8f5f-4f6e-9d9e-8c8c5f1d5e3a'},
+        'finished': ['aut'],
+    }
+
+    _write_checkpoint(checkpoint, checkpoint_path)
+    result = _read_checkpoint(checkpoint_path)
+
+    assert checkpoint == result
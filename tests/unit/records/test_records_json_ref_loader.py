@@ -28,7 +28,8 @@ from mock import patch
 from jsonref import JsonRef
 
 from inspirehep.modules.records.json_ref_loader import (
-    AbstractRecordLoader, DatabaseJsonLoader, ESJsonLoader, replace_refs)
+    AbstractRecordLoader, DatabaseJsonLoader, ESJsonLoader,
+    db_record_loader, es_record_loader, replace_refs)
 from inspirehep.utils.record_getter import RecordGetterError
 
 
@@ -39,15 +40,17 @@ def _build_url(endpoint='literature', recid='42'):
     return '{}/api/{}/{}'.format(server, endpoint, recid)
 
 
-@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_es_record')
-@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_db_record')
-def test_replace_refs_correct_sources(get_db_rec, get_es_rec):
-    with_es_record = {'ES': 'ES'}
-    with_db_record = {'DB': 'DB'}
+@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_es_records')
+@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_db_record_instances')
+def test_replace_refs_correct_sources(get_db_recs, get_es_recs):
+    with_es_record = {'$schema': 'hep.json', 'control_number': 42, 'ES': 'ES'}
+    with_db_record = {'$schema': 'hep.json', 'control_number': 42, 'DB': 'DB'}
 
-    get_es_rec.return_value = with_es_record
-    get_db_rec.return_value = with_db_record
+    get_es_recs.return_value = [with_es_record]
+    get_db_recs.return_value = {('lit', '42'): with_db_record}
 
+    db_record_loader.clear_cache()
+    es_record_loader.clear_cache()
     db_rec = replace_refs({'$ref': _build_url()}, 'db')
     es_rec = replace_refs({'$ref': _build_url()}, 'es')
 
@@ -55,6 +58,48 @@ def test_replace_refs_correct_sources(get_db_rec, get_es_rec):
     assert es_rec == with_es_record
 
 
+@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_db_record')
+@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_db_record_instances')
+def test_replace_refs_loads_all_refs_at_once_and_caches_them(get_db_recs, get_db_rec):
+    records = [
+        {'$schema': 'hep.json', 'control_number': 1},
+        {'$schema': 'hep.json', 'control_number': 2},
+    ]
+    get_db_recs.return_value = {('lit', '1'): records[0], ('lit', '2'): records[1]}
+
+    db_record_loader.clear_cache()
+    obj = {
+        'references': [
+            {'record': {'$ref': _build_url(recid='1')}},
+            {'record': {'$ref': _build_url(recid='2')}},
+            {'record': {'$ref': _build_url(recid='1')}},
+        ],
+    }
+    result = replace_refs(obj, 'db')
+    assert [ref['record'] for ref in result['references']] == [
+        records[0], records[1], records[0],
+    ]
+
+    replace_refs({'$ref': _build_url(recid='2')}, 'db')
+
+    get_db_recs.assert_called_once_with([('lit', '1'), ('lit', '2')])
+    assert get_db_rec.call_count == 0
+
+
+@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_db_record')
+@patch('inspirehep.modules.records.json_ref_loader.record_getter.get_db_record_instances')
+def test_replace_refs_does_not_cache_missing_records(get_db_recs, get_db_rec):
+    record = {'$schema': 'hep.json', 'control_number': 1}
+    get_db_recs.return_value = {}
+    get_db_rec.side_effect = [None, record]
+
+    db_record_loader.clear_cache()
+
+    assert replace_refs({'$ref': _build_url(recid='1')}, 'db') == None  # noqa: E711
+    assert replace_refs({'$ref': _build_url(recid='1')}, 'db') == record
+    assert get_db_rec.call_count == 2
+
+
 @patch('inspirehep.modules.records.json_ref_loader.get_pid_type_from_endpoint')
 @patch('inspirehep.modules.records.json_ref_loader.JsonLoader.get_remote_json')
 @patch('inspirehep.modules.records.json_ref_loader.AbstractRecordLoader.get_record')
@@ -25,6 +25,7 @@ from __future__ import absolute_import, division, print_function
 from flask import current_app
 from mock import patch
 
+from inspirehep.modules.records.api import InspireRecord
 from inspirehep.modules.records.tasks import update_links, batch_reindex
 
 
@@ -157,6 +158,14 @@ def record_generator(uuid):
     return record
 
 
+def records_generator(uuids):
+    return [InspireRecord(record_generator(uuid)) for uuid in uuids]
+
+
+def index_ops_generator(records, **kwargs):
+    return [{'_source': record} for record in records]
+
+
 def mocked_bulk(es, records, **kwargs):
     count = 0
     for record in records:
@@ -164,45 +173,45 @@ def mocked_bulk(es, records, **kwargs):
     return (count, 0)
 
 
-@patch('inspirehep.modules.records.tasks.InspireRecord.get_record', side_effect=record_generator)
-@patch('inspirehep.modules.records.tasks.create_index_op', side_effect=None)
+@patch('inspirehep.modules.records.tasks.InspireRecord.get_records', side_effect=records_generator)
+@patch('inspirehep.modules.records.tasks.create_index_ops', side_effect=index_ops_generator)
 @patch('inspirehep.modules.records.tasks.bulk', side_effect=mocked_bulk)
-def test_record_task_batch_logic_check_reindex_records_count(get_record, create_index_op, mocked_bulk):
+def test_record_task_batch_logic_check_reindex_records_count(mocked_bulk, create_index_ops, get_records):
     records = ['000', 'aaa', 'bbb', 'ccc']
     output = batch_reindex(uuids=records)
-    assert create_index_op.call_count == 4
+    assert len(create_index_ops.call_args[0][0]) == 4
     assert output['success'] == 4
     assert output['failures'] == []
 
 
-@patch('inspirehep.modules.records.tasks.InspireRecord.get_record', side_effect=record_generator)
-@patch('inspirehep.modules.records.tasks.create_index_op', side_effect=None)
+@patch('inspirehep.modules.records.tasks.InspireRecord.get_records', side_effect=records_generator)
+@patch('inspirehep.modules.records.tasks.create_index_ops', side_effect=index_ops_generator)
 @patch('inspirehep.modules.records.tasks.bulk', side_effect=mocked_bulk)
-def test_record_task_batch_logic_reindex_skips_deleted_records(get_record, create_index_op, mocked_bulk):
+def test_record_task_batch_logic_reindex_skips_deleted_records(mocked_bulk, create_index_ops, get_records):
     records = ['000', 'aaa_deleted', 'bbb', 'ccc']
     output = batch_reindex(uuids=records)
-    assert create_index_op.call_count == 3
+    assert len(create_index_ops.call_args[0][0]) == 3
     assert output['success'] == 3
     assert output['failures'] == []
 
 
-@patch('inspirehep.modules.records.tasks.InspireRecord.get_record', side_effect=record_generator)
-@patch('inspirehep.modules.records.tasks.create_index_op', side_effect=None)
+@patch('inspirehep.modules.records.tasks.InspireRecord.get_records', side_effect=records_generator)
+@patch('inspirehep.modules.records.tasks.create_index_ops', side_effect=index_ops_generator)
 @patch('inspirehep.modules.records.tasks.bulk', side_effect=mocked_bulk)
-def test_record_task_batch_logic_reindex_only_deleted_records(get_record, create_index_op, mocked_bulk):
+def test_record_task_batch_logic_reindex_only_deleted_records(mocked_bulk, create_index_ops, get_records):
     records = ['000_deleted', 'aaa_deleted', 'bbb_deleted', 'ccc_deleted']
     output = batch_reindex(uuids=records)
-    assert create_index_op.call_count == 0
+    assert len(create_index_ops.call_args[0][0]) == 0
     assert output['success'] == 0
     assert output['failures'] == []
 
 
-@patch('inspirehep.modules.records.tasks.InspireRecord.get_record', side_effect=record_generator)
-@patch('inspirehep.modules.records.tasks.create_index_op', side_effect=None)
+@patch('inspirehep.modules.records.tasks.InspireRecord.get_records', side_effect=records_generator)
+@patch('inspirehep.modules.records.tasks.create_index_ops', side_effect=index_ops_generator)
 @patch('inspirehep.modules.records.tasks.bulk', side_effect=mocked_bulk)
-def test_record_task_batch_logic_nothing_to_reindex(get_record, create_index_op, mocked_bulk):
+def test_record_task_batch_logic_nothing_to_reindex(mocked_bulk, create_index_ops, get_records):
     records = []
     output = batch_reindex(uuids=records)
-    assert create_index_op.call_count == 0
+    assert len(create_index_ops.call_args[0][0]) == 0
     assert output['success'] == 0
     assert output['failures'] == []
@@ -38,13 +38,16 @@ from inspirehep.modules.records.utils import (
     populate_authors_full_name_unicode_normalized,
     populate_authors_name_variations,
     populate_bookautocomplete,
+    populate_citations_count,
     populate_earliest_date,
     populate_experiment_suggest,
     populate_inspire_document_type,
+    populate_name_variations,
     populate_recid_from_ref,
     populate_title_suggest,
     populate_number_of_references,
     populate_facet_author_name,
+    populate_publication_info_linked_titles,
     get_author_with_record_facet_author_name,
 )
 
@@ -1048,3 +1051,121 @@ def test_get_author_with_record_facet_author_name():
     author2_facet_author_name = 'John.Doe.1_John Doe'
     result = get_author_with_record_facet_author_name(author2)
     assert result == author2_facet_author_name
+
+
+def test_populate_facet_author_name_with_linked_authors():
+    linked_authors = {
+        ('aut', '111'): {
+            '$schema': 'http://localhost:5000/records/schemas/authors.json',
+            'name': {'value': 'Silk, James Brian'},
+            'ids': [{'schema': 'INSPIRE BAI', 'value': 'James.Brian.1'}],
+            'control_number': 111,
+        },
+    }
+    record = {
+        '$schema': 'http://localhost:5000/records/schemas/hep.json',
+        'authors': [
+            {
+                'full_name': 'Silk, James Brian',
+                'record': {'$ref': 'https://labs.inspirehep.net/api/authors/111'}
+            },
+            {
+                'full_name': 'Rohan, George',
+            },
+        ],
+    }
+    populate_facet_author_name(record, linked_authors=linked_authors)
+
+    expected = [u'James.Brian.1_James Brian Silk', u'BAI_George Rohan']
+    result = record['facet_author_name']
+
+    assert expected == result
+
+
+def test_populate_publication_info_linked_titles_with_linked_records():
+    linked_records = {
+        ('con', '1'): {
+            '$schema': 'http://localhost:5000/records/schemas/conferences.json',
+            'titles': [{'title': 'Lattice 2017'}],
+        },
+        ('lit', '2'): {
+            '$schema': 'http://localhost:5000/records/schemas/hep.json',
+            'titles': [{'title': 'Proceedings, Lattice 2017'}],
+        },
+    }
+    record = {
+        '$schema': 'http://localhost:5000/records/schemas/hep.json',
+        'publication_info': [
+            {
+                'conference_record': {'$ref': 'https://labs.inspirehep.net/api/conferences/1'},
+                'parent_record': {'$ref': 'https://labs.inspirehep.net/api/literature/2'},
+            },
+            {
+                'conference_record': {'$ref': 'https://labs.inspirehep.net/api/conferences/3'},
+            },
+            {
+                'journal_title': 'Phys.Rev.D',
+            },
+        ],
+    }
+    populate_publication_info_linked_titles(record, linked_records=linked_records)
+
+    expected = [
+        {
+            'conference_record': {'$ref': 'https://labs.inspirehep.net/api/conferences/1'},
+            'conference_title': 'Lattice 2017',
+            'parent_record': {'$ref': 'https://labs.inspirehep.net/api/literature/2'},
+            'parent_title': 'Proceedings, Lattice 2017',
+        },
+        {
+            'conference_record': {'$ref': 'https://labs.inspirehep.net/api/conferences/3'},
+        },
+        {
+            'journal_title': 'Phys.Rev.D',
+        },
+    ]
+    result = record['publication_info']
+
+    assert expected == result
+
+
+def test_populate_name_variations_with_cache():
+    record = {
+        '$schema': 'http://localhost:5000/records/schemas/hep.json',
+        'authors': [
+            {'full_name': 'Silk, James Brian'},
+        ],
+    }
+    cache = {}
+    populate_name_variations(record, cache=cache)
+
+    expected = generate_name_variations('Silk, James Brian')
+
+    assert expected == record['authors'][0]['name_variations']
+    assert expected == cache['Silk, James Brian']
+
+
+def test_populate_citations_count_with_citations_counts():
+    record = {
+        '$schema': 'http://localhost:5000/records/schemas/hep.json',
+        'control_number': 1,
+    }
+    populate_citations_count(record, citations_counts={('lit', '1'): 3})
+
+    expected = 3
+    result = record['citation_count']
+
+    assert expected == result
+
+
+def test_populate_citations_count_with_citations_counts_defaults_to_zero():
+    record = {
+        '$schema': 'http://localhost:5000/records/schemas/hep.json',
+        'control_number': 1,
+    }
+    populate_citations_count(record, citations_counts={})
+
+    expected = 0
+    result = record['citation_count']
+
+    assert expected == result
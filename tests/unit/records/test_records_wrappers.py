@@ -216,3 +216,34 @@ def test_literature_record_publication_information_no_publication_info():
     record = LiteratureRecord({})
 
     assert not record.publication_information
+
+
+def test_literature_record_conference_information_uses_denormalized_titles():
+    record = LiteratureRecord({
+        'publication_info': [
+            {
+                'artid': '123',
+                'conference_recid': 1,
+                'conference_record': {'$ref': 'http://localhost:5000/api/conferences/1'},
+                'conference_title': 'Lattice 2017',
+                'parent_recid': 2,
+                'parent_record': {'$ref': 'http://localhost:5000/api/literature/2'},
+                'parent_title': 'Proceedings, Lattice 2017',
+            },
+        ],
+    })
+
+    expected = [
+        {
+            'conference_recid': 1,
+            'conference_title': 'Lattice 2017',
+            'parent_recid': 2,
+            'parent_title': 'Lattice 2017',
+            'page_start': None,
+            'page_end': None,
+            'artid': '123',
+        },
+    ]
+    result = record.conference_information
+
+    assert expected == result
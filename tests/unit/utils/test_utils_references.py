@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of INSPIRE.
+# Copyright (C) 2014-2017 CERN.
+#
+# INSPIRE is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# INSPIRE is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with INSPIRE. If not, see <http://www.gnu.org/licenses/>.
+#
+# In applying this license, CERN does not waive the privileges and immunities
+# granted to it by virtue of its status as an Intergovernmental Organization
+# or submit itself to any jurisdiction.
+
+from __future__ import absolute_import, division, print_function
+
+from flask import current_app
+from mock import patch
+
+from inspirehep.utils.references import local_refextract_kbs_path
+
+
+def test_local_refextract_kbs_path_changes_only_with_the_kb(tmpdir):
+    kb_file = tmpdir.join('journal-titles.kb')
+    kb_file.write('JOURNAL OF HIGH ENERGY PHYSICS---JHEP\n')
+
+    config = {
+        'REFEXTRACT_JOURNAL_KB_PATH': str(kb_file),
+        'REFEXTRACT_KB_CHECK_INTERVAL': 0,
+    }
+
+    with patch.dict(current_app.config, config):
+        with local_refextract_kbs_path() as kbs_path:
+            first_path = kbs_path['journals']
+        with local_refextract_kbs_path() as kbs_path:
+            second_path = kbs_path['journals']
+
+        kb_file.write('PHYSICAL REVIEW D---Phys.Rev.D\n')
+        with local_refextract_kbs_path() as kbs_path:
+            third_path = kbs_path['journals']
+
+    assert first_path == second_path
+    assert third_path != first_path
+    with open(third_path) as local_kb_file:
+        assert local_kb_file.read() == 'PHYSICAL REVIEW D---Phys.Rev.D\n'
@@ -26,7 +26,12 @@ from __future__ import absolute_import, division, print_function
 
 import pytest
 
-from inspirehep.utils.stats import calculate_h_index, calculate_i10_index
+from inspirehep.utils.stats import (
+    calculate_h_index,
+    calculate_h_index_from_histogram,
+    calculate_i10_index,
+    calculate_i10_index_from_histogram,
+)
 
 
 @pytest.fixture
@@ -101,3 +106,37 @@ def test_calculate_i10_index_ignores_none_values(citations_with_none_values):
     result = calculate_i10_index(citations_with_none_values)
 
     assert expected == result
+
+
+def test_calculate_h_index_from_histogram():
+    histogram_with_h_index_5 = [(2, 1), (3, 1), (5, 1), (7, 1), (8, 1), (12, 1), (34, 1)]
+
+    expected = 5
+    result = calculate_h_index_from_histogram(histogram_with_h_index_5)
+
+    assert expected == result
+
+
+def test_calculate_h_index_from_histogram_with_several_papers_per_bucket():
+    histogram_with_h_index_4 = [(1, 10), (4, 3), (100, 1)]
+
+    expected = 4
+    result = calculate_h_index_from_histogram(histogram_with_h_index_4)
+
+    assert expected == result
+
+
+def test_calculate_h_index_from_histogram_without_papers():
+    expected = 0
+    result = calculate_h_index_from_histogram([])
+
+    assert expected == result
+
+
+def test_calculate_i10_index_from_histogram():
+    histogram_with_i10_index_6 = [(3, 4), (10, 2), (11, 3), (400, 1)]
+
+    expected = 6
+    result = calculate_i10_index_from_histogram(histogram_with_i10_index_6)
+
+    assert expected == result